@@ -0,0 +1,136 @@
+"""Run the asv style benchmarks without asv installed.
+
+    python -m benchmarks                          # print timings
+    python -m benchmarks --output base.json       # save timings for this commit
+    python -m benchmarks --compare base.json      # flag regressions against a saved run
+
+asv (see asv.conf.json) runs the same classes with its own environment
+management and history when more rigour is needed.
+"""
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import pkgutil
+import platform
+import subprocess
+import sys
+import timeit
+
+import benchmarks
+
+
+def discover():
+    for module_info in pkgutil.iter_modules(benchmarks.__path__):
+        if module_info.name.startswith('_'):
+            continue
+        module = importlib.import_module('benchmarks.%s' % module_info.name)
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            methods = [name for name in dir(cls) if name.startswith(('time_', 'timeraw_'))]
+            if methods:
+                yield module_info.name, cls, methods
+
+
+def param_sets(cls):
+    params = getattr(cls, 'params', None)
+    if params is None:
+        return [()]
+    if len(getattr(cls, 'param_names', ())) > 1:
+        return list(itertools.product(*params))
+    return [(param,) for param in params]
+
+
+def time_call(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def time_raw(code, repeat):
+    """Time code returned by an asv ``timeraw_`` method, run in a fresh interpreter each time."""
+    script = 'import time\nstart = time.perf_counter()\nexec(%r)\nprint(time.perf_counter() - start)' % code
+    return min(float(subprocess.check_output([sys.executable, '-c', script])) for _ in range(repeat))
+
+
+def run(pattern, repeat):
+    results = {}
+    for module_name, cls, methods in discover():
+        for params in param_sets(cls):
+            instance = cls()
+            try:
+                if hasattr(instance, 'setup'):
+                    instance.setup(*params)
+            except NotImplementedError:
+                continue
+            try:
+                for method in methods:
+                    key = '%s.%s.%s' % (module_name, cls.__name__, method)
+                    if params:
+                        key = '%s(%s)' % (key, ', '.join(repr(param) for param in params))
+                    if pattern and pattern not in key:
+                        continue
+                    bound = getattr(instance, method)
+                    if method.startswith('timeraw_'):
+                        results[key] = time_raw(bound(*params), repeat)
+                    else:
+                        results[key] = time_call(lambda: bound(*params), repeat)
+                    print('%-75s %12.3f us' % (key, results[key] * 1e6))
+            finally:
+                if hasattr(instance, 'teardown'):
+                    instance.teardown(*params)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    regressions = []
+    print('\nCompared with %s:' % baseline_path)
+    for key, seconds in sorted(results.items()):
+        if key not in baseline:
+            continue
+        ratio = seconds / baseline[key]
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        print('%-75s %6.2fx%s' % (key, ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n')[0])
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this string')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repeats; the fastest is reported')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results from a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Benchmarks for Client hot paths, run against pycronofy.fake_server (asv style)."""
+import base64
+import hashlib
+import hmac
+import json
+
+from pycronofy import Client
+from pycronofy.availability import build_availability, freeze
+from pycronofy.batch import BatchBuilder
+from pycronofy.fake_server import FakeCronofyServer
+
+AUTH_ARGS = {
+    'client_id': 'cats',
+    'client_secret': 'opposable thumbs',
+    'access_token': 'paw',
+    'refresh_token': 'teeth',
+}
+
+
+def start_server(events=0):
+    server = FakeCronofyServer(page_size=100).start()
+    server.populate(calendars=10, events=events)
+    return server
+
+
+class ReadEvents(object):
+    """read_events pagination over many pages."""
+    params = [1, 20]
+    param_names = ['pages']
+
+    def setup(self, pages):
+        self.server = start_server(events=pages * 100)
+        self.client = Client(api_base_url=self.server.url, **AUTH_ARGS)
+
+    def teardown(self, pages):
+        self.server.stop()
+
+    def time_read_events_all(self, pages):
+        self.client.read_events(from_date='2024-01-01', to_date='2025-01-01').all()
+
+    def time_read_events_records(self, pages):
+        self.client.read_events(from_date='2024-01-01', to_date='2025-01-01', records=True).all()
+
+
+class Batch(object):
+    """Client.batch with large builders."""
+    params = [10, 500]
+    param_names = ['entries']
+
+    def setup(self, entries):
+        self.server = start_server()
+        self.client = Client(api_base_url=self.server.url, **AUTH_ARGS)
+        self.events = [
+            {
+                'event_id': 'evt_%d' % i,
+                'summary': 'Event %d' % i,
+                'start': '2024-01-01T09:00:00Z',
+                'end': '2024-01-01T10:00:00Z',
+            }
+            for i in range(entries)
+        ]
+
+    def teardown(self, entries):
+        self.server.stop()
+
+    def time_build(self, entries):
+        builder = BatchBuilder()
+        for event in self.events:
+            builder.upsert_event('cal_1', event)
+        builder.build()
+
+    def time_batch(self, entries):
+        builder = BatchBuilder()
+        for event in self.events:
+            builder.upsert_event('cal_1', event)
+        self.client.batch(builder)
+
+
+class Availability(object):
+    """availability request mapping, with and without the round trip."""
+    params = [5, 100]
+    param_names = ['members']
+
+    def setup(self, members):
+        self.server = start_server()
+        self.client = Client(api_base_url=self.server.url, **AUTH_ARGS)
+        self.members = members
+        self.participants, self.periods = self._query()
+        self.prepared = self.client.prepare_availability(participants=self.participants, required_duration=60)
+        self.frozen = freeze(self.participants)
+
+    def teardown(self, members):
+        self.server.stop()
+
+    def _query(self):
+        participants = [
+            {'members': ['acc_%d_%d' % (group, i) for i in range(self.members)], 'required': 'all'}
+            for group in range(3)
+        ]
+        periods = [
+            {'start': '2024-01-%02dT09:00:00Z' % day, 'end': '2024-01-%02dT17:00:00Z' % day}
+            for day in range(1, 29)
+        ]
+        return participants, periods
+
+    def time_map_availability_participants(self, members):
+        participants, periods = self._query()
+        self.client.map_availability_participants(participants)
+        self.client.translate_available_periods(periods)
+
+    def time_build_availability_reused_template(self, members):
+        build_availability(participants=self.participants, required_duration=60, available_periods=self.periods)
+
+    def time_build_availability_frozen_template(self, members):
+        build_availability(participants=self.frozen, required_duration=60, available_periods=self.periods)
+
+    def time_encode_availability(self, members):
+        json.dumps(build_availability(participants=self.participants, required_duration=60, available_periods=self.periods))
+
+    def time_encode_prepared_availability(self, members):
+        self.prepared.body(self.periods)
+
+    def time_availability(self, members):
+        participants, periods = self._query()
+        self.client.availability(participants=participants, required_duration=60, available_periods=periods)
+
+
+class Validate(object):
+    """Client.validate for a datetime heavy method."""
+
+    def setup(self):
+        self.client = Client(**AUTH_ARGS)
+
+    def time_validate_read_events(self):
+        self.client.validate('read_events', from_date='2024-01-01', to_date='2024-02-01T00:00:00Z')
+
+
+class HmacValid(object):
+    """Client.hmac_valid for a typical push notification body."""
+
+    def setup(self):
+        self.client = Client(**AUTH_ARGS)
+        self.body = '{"notification":{"type":"change","changes_since":"2024-01-01T00:00:00Z"},"channel":{}}'
+        digest = hmac.new(AUTH_ARGS['client_secret'].encode(), self.body.encode(), hashlib.sha256).digest()
+        self.header = 'invalid,%s' % base64.b64encode(digest).decode()
+
+    def time_hmac_valid(self):
+        self.client.hmac_valid(self.header, self.body)
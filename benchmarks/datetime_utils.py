@@ -0,0 +1,44 @@
+"""Benchmarks for pycronofy.datetime_utils (asv style, see asv.conf.json)."""
+import datetime
+
+from pycronofy import settings
+from pycronofy import timezones
+from pycronofy.datetime_utils import _format_datetime, format_event_time, format_event_times
+from pycronofy.exceptions import PyCronofyDateTimeError
+
+
+class FormatEventTime(object):
+    """format_event_time throughput for aware datetimes under each timezone backend."""
+    params = list(timezones.BACKENDS)
+    param_names = ['backend']
+
+    def setup(self, backend):
+        settings.TIMEZONE_BACKEND = backend
+        try:
+            tz = timezones.get_timezone('America/New_York')
+        except PyCronofyDateTimeError:
+            raise NotImplementedError('%s is not available' % backend)
+        start = datetime.datetime(2024, 1, 1, tzinfo=timezones.UTC)
+        self.values = [timezones.localize(start + datetime.timedelta(minutes=15 * i), 'America/New_York')
+                       for i in range(2000)]
+        self.tz = tz
+
+    def teardown(self, backend):
+        settings.TIMEZONE_BACKEND = None
+
+    def time_format_event_time_uncached(self, backend):
+        _format_datetime.cache_clear()
+        for value in self.values:
+            format_event_time(value)
+
+    def time_format_event_time_cached(self, backend):
+        for value in self.values:
+            format_event_time(value)
+
+    def time_format_event_times(self, backend):
+        _format_datetime.cache_clear()
+        format_event_times(self.values)
+
+    def time_astimezone(self, backend):
+        for value in self.values:
+            value.astimezone(self.tz)
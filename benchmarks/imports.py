@@ -0,0 +1,27 @@
+"""Import time benchmarks (asv style, see asv.conf.json).
+
+Each ``timeraw_`` method returns code that is timed in a fresh interpreter,
+as cold start matters for short-lived processes such as webhook handlers.
+"""
+
+
+class Import(object):
+    """Time to import pycronofy and load the parts commonly used on their own."""
+
+    def timeraw_import_pycronofy(self):
+        return 'import pycronofy'
+
+    def timeraw_import_client(self):
+        return 'from pycronofy import Client'
+
+    def timeraw_verify_webhook(self):
+        return '\n'.join((
+            'from pycronofy import Client',
+            "Client(client_id='id', client_secret='secret').hmac_valid('x', '{}')",
+        ))
+
+    def timeraw_build_batch(self):
+        return '\n'.join((
+            'from pycronofy.batch import BatchBuilder',
+            "BatchBuilder().delete_event('cal_1', 'evt_1').build()",
+        ))
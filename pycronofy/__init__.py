@@ -1,4 +1,5 @@
-from pycronofy.client import Client  # noqa: F401
+import importlib
+
 from pycronofy import settings
 __version__ = '2.0.7'
 __name__ = 'PyCronofy'
@@ -12,6 +13,34 @@ https://www.cronofy.com/developers/
 https://github.com/venuebook/pycronofy
 """
 
+# Names importable from pycronofy, loaded on first access so `import pycronofy`
+# stays cheap for processes that only need part of the library.
+LAZY_ATTRIBUTES = {
+    'Client': 'pycronofy.client',
+}
+
+SUBMODULES = frozenset((
+    'auth', 'availability', 'batch', 'calendars', 'cassette', 'client', 'columnar', 'concurrency', 'config',
+    'datetime_utils', 'exceptions', 'fake_server', 'instrumentation', 'pagination', 'records',
+    'request_handler', 'timezones', 'transport', 'validation',
+))
+
+
+def __getattr__(name):
+    if name in LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(LAZY_ATTRIBUTES[name]), name)
+    elif name in SUBMODULES:
+        # Imported by full name: the package's __name__ is overridden above.
+        value = importlib.import_module('pycronofy.%s' % name)
+    else:
+        raise AttributeError("module 'pycronofy' has no attribute %r" % name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_ATTRIBUTES) | SUBMODULES)
+
 
 def set_request_hook(func):
     """Sets a function to execute on requests made by pycronofy
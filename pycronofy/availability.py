@@ -0,0 +1,506 @@
+"""Build availability request payloads without modifying the caller's data.
+
+The ``Client.map_availability_*`` helpers delegate to these, while
+``Client.translate_*`` still convert times in place. Values that need no
+conversion are shared with the input rather than copied: a participants
+template whose members are already dicts, or periods whose times are
+already strings, are reused as is, so one template can be passed to
+thousands of queries without a ``deepcopy`` before each.
+
+Participants and buffers passed through ``freeze`` go further: being
+immutable they can be hashed, and their mapped form is remembered, so
+repeated queries with the same groups skip mapping them altogether.
+"""
+import collections.abc
+import functools
+import json
+
+from pycronofy import settings
+from pycronofy.datetime_utils import format_event_epoch, format_event_time, parse_event_epoch
+
+# Number of distinct frozen participants and buffers whose mapping is remembered.
+MAPPING_CACHE_SIZE = 1024
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified, and so can be hashed. Built by freeze.
+
+    It stays a dict so it can be json encoded as is, but every method that
+    would change its contents raises TypeError. Its hash is worked out when it
+    is built, which raises TypeError if any value cannot be hashed.
+    """
+    __slots__ = ('_hash',)
+
+    def __new__(cls, *args, **kwargs):
+        self = dict.__new__(cls)
+        dict.update(self, *args, **kwargs)
+        self._hash = hash(frozenset(self.items()))
+        return self
+
+    def __init__(self, *args, **kwargs):
+        # Filled in by __new__, so calling __init__ again cannot change the contents.
+        pass
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    @classmethod
+    def fromkeys(cls, keys, value=None):
+        return cls(dict.fromkeys(keys, value))
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('FrozenDict cannot be modified')
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _immutable
+
+
+class FrozenList(tuple):
+    """A tuple whose items can all be hashed, and whose hash is worked out once. Built by freeze.
+
+    Building one raises TypeError if any item cannot be hashed, so a FrozenList
+    can always be used as a cache key, at the cost of a single lookup.
+    """
+
+    def __new__(cls, items=()):
+        self = tuple.__new__(cls, items)
+        self._hash = tuple.__hash__(self)
+        return self
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (FrozenList, (tuple(self),))
+
+
+def freeze(value):
+    """An immutable, hashable copy of participants, a buffer or other availability options.
+
+    Dicts become FrozenDicts and lists and tuples FrozenLists, all the way down.
+    Mapping a frozen value is cached, so freeze a participants template once and
+    pass it to every query built from it.
+
+    Example Usage:
+
+    panel = freeze([{'members': subs, 'required': 'all'}])
+    for periods in candidate_periods:
+        client.availability(participants=panel, required_duration=60, available_periods=periods)
+
+    :param value: Value to freeze, eg participant groups.
+    :rtype: ``FrozenDict``, ``FrozenList`` or the value itself if it is already immutable.
+    """
+    value_type = type(value)
+    if value_type is FrozenDict or value_type is FrozenList:
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def translate_available_periods(periods):
+    """Format the start and end of each period for the API.
+
+    :param list periods: Period dicts with 'start' and 'end' datetimes or strings.
+    :return: Periods, new dicts only for those whose times were converted.
+    :rtype: ``list``
+    """
+    return [_translate_times(period, ('start', 'end')) for period in periods]
+
+
+def translate_query_slots(query_slots):
+    """Format the start of each query slot for the API.
+
+    :param list query_slots: Slot dicts with a 'start' datetime or string.
+    :rtype: ``list``
+    """
+    return [_translate_times(slot, ('start',)) for slot in query_slots]
+
+
+def map_duration(duration):
+    """Map minutes to a duration dict, as Client.map_availability_duration.
+
+    :param dict or int duration: Minutes or a duration dict.
+    :rtype: ``dict``
+    """
+    if type(duration) is int:
+        return {'minutes': duration}
+    return duration
+
+
+def map_buffer(buffer):
+    """Map a buffer's before/after durations, as Client.map_availability_buffer.
+
+    :param dict buffer: Buffer dict. The mapping of a frozen buffer is cached.
+    :rtype: ``dict``
+    """
+    if type(buffer) is FrozenDict:
+        return _map_frozen_buffer(buffer)
+    return _map_buffer(buffer)
+
+
+def _map_buffer(buffer):
+    result = {}
+    if not isinstance(buffer, dict):
+        return result
+    if 'before' in buffer:
+        result['before'] = map_buffer_details(buffer['before'])
+    if 'after' in buffer:
+        result['after'] = map_buffer_details(buffer['after'])
+    return result
+
+
+def map_buffer_details(details):
+    """Map one side of a buffer, including its minimum and maximum.
+
+    :param dict or int details: Minutes or a buffer details dict.
+    :rtype: ``dict``
+    """
+    if not isinstance(details, dict):
+        return map_duration(details)
+    result = details
+    for field in ('minimum', 'maximum'):
+        if field in details and type(details[field]) is int:
+            if result is details:
+                result = dict(details)
+            result[field] = map_duration(details[field])
+    return result
+
+
+def map_member(member):
+    """Map a participant group member, as Client.map_availability_member.
+
+    :param string or dict member: A sub, or a member dict.
+    :rtype: ``dict``
+    """
+    if type(member) is str:
+        return {'sub': member}
+    if isinstance(member, dict) and member.get('available_periods'):
+        periods = member['available_periods']
+        translated = translate_available_periods(periods)
+        if any(new is not old for new, old in zip(translated, periods)):
+            return dict(member, available_periods=translated)
+    return member
+
+
+def map_participants_group(group):
+    """Map a participant group, as Client.map_availability_participants_group.
+
+    :param dict group: Group dict with 'members' and optionally 'required'.
+    :return: The group itself if no member needed mapping and 'required' was set, otherwise a new dict.
+    :rtype: ``dict``
+    """
+    if isinstance(group, dict):
+        members = group.get('members', ())
+        mapped = [map_member(member) for member in members]
+        unchanged = all(new is old for new, old in zip(mapped, members))
+        if unchanged and isinstance(members, (list, tuple)) and group.get('required') is not None:
+            return group
+        result = dict(group, members=mapped)
+        if result.get('required') is None:
+            result['required'] = 'all'
+        return result
+    elif isinstance(group, collections.abc.Iterable):
+        return [map_participants(item) for item in group]
+    return None
+
+
+def map_participants(participants):
+    """Map participant groups, as Client.map_availability_participants.
+
+    :param list or dict participants: A list of groups or a single group. The mapping of
+        frozen participants is cached.
+    :return: Mapped groups, frozen if participants were.
+    :rtype: ``list`` or ``tuple``
+    """
+    participants_type = type(participants)
+    if participants_type is FrozenList or participants_type is FrozenDict:
+        return _map_frozen_participants(participants)
+    return _map_participants(participants)
+
+
+@functools.lru_cache(maxsize=MAPPING_CACHE_SIZE)
+def _map_frozen_participants(participants):
+    return freeze(_map_participants(participants))
+
+
+@functools.lru_cache(maxsize=MAPPING_CACHE_SIZE)
+def _map_frozen_buffer(buffer):
+    return freeze(_map_buffer(buffer))
+
+
+def _map_participants(participants):
+    if isinstance(participants, dict):
+        return [map_participants_group(participants)]
+    elif isinstance(participants, collections.abc.Iterable):
+        return [map_participants_group(group) for group in participants]
+    return participants
+
+
+def map_sequence_item(item):
+    """Map one step of a sequence, as Client.map_sequence_item.
+
+    :param dict item: Sequence step.
+    :rtype: ``dict``
+    """
+    result = dict(item)
+    result['participants'] = map_participants(item.get('participants'))
+    result['required_duration'] = map_duration(item.get('required_duration'))
+    result['start_interval'] = map_duration(item.get('start_interval'))
+    result['buffer'] = map_buffer(item.get('buffer'))
+    if item.get('available_periods'):
+        result['available_periods'] = translate_available_periods(item['available_periods'])
+    return result
+
+
+def map_sequence(sequence):
+    """Map the steps of a sequence, as Client.map_availability_sequence.
+
+    :param list sequence: Sequence steps.
+    :rtype: ``list``
+    """
+    if isinstance(sequence, collections.abc.Iterable):
+        return [map_sequence_item(item) for item in sequence]
+    return sequence
+
+
+def build_availability(participants=(), required_duration=(), available_periods=None, start_interval=None,
+                       buffer=(), response_format=None, query_slots=None, max_results=None):
+    """Build the body of an availability query. Arguments are as for Client.availability.
+
+    :rtype: ``dict``
+    """
+    options = {
+        'participants': map_participants(participants),
+        'required_duration': map_duration(required_duration),
+        'buffer': map_buffer(buffer),
+    }
+    if start_interval:
+        options['start_interval'] = map_duration(start_interval)
+    if available_periods:
+        options['available_periods'] = translate_available_periods(available_periods)
+    if query_slots:
+        options['query_slots'] = translate_query_slots(query_slots)
+    if response_format:
+        options['response_format'] = response_format
+    if max_results:
+        options['max_results'] = max_results
+    return options
+
+
+def build_sequenced_availability(sequence=(), available_periods=()):
+    """Build the body of a sequenced availability query. Arguments are as for Client.sequenced_availability.
+
+    :rtype: ``dict``
+    """
+    return {
+        'sequence': map_sequence(sequence),
+        'available_periods': translate_available_periods(available_periods),
+    }
+
+
+def build_real_time_availability(availability):
+    """Build the 'availability' of a real time scheduling request.
+
+    :param dict availability: As for Client.real_time_scheduling.
+    :rtype: ``dict``
+    """
+    options = {
+        'participants': map_participants(availability.get('participants')),
+        'required_duration': map_duration(availability.get('required_duration')),
+        'start_interval': map_duration(availability.get('start_interval')),
+        'buffer': map_buffer(availability.get('buffer')),
+        'available_periods': translate_available_periods(availability['available_periods']),
+    }
+    if availability.get('max_results'):
+        options['max_results'] = availability['max_results']
+    if availability.get('response_format'):
+        options['response_format'] = availability['response_format']
+    return options
+
+
+def build_real_time_sequencing_availability(availability):
+    """Build the 'availability' of a real time sequencing request.
+
+    :param dict availability: As for Client.real_time_sequencing.
+    :rtype: ``dict``
+    """
+    options = {'sequence': map_sequence(availability.get('sequence'))}
+    if availability.get('available_periods'):
+        options['available_periods'] = translate_available_periods(availability['available_periods'])
+    return options
+
+
+def plan_availability(options, max_periods=None, max_span_days=None):
+    """Split an availability query into queries the API accepts.
+
+    Periods are sorted and grouped so each query has at most ``max_periods``
+    of them, spanning at most ``max_span_days``. Periods longer than that are
+    cut into pieces that overlap by the required duration, so availability
+    across a cut is still found, with cuts on the start interval so slots line
+    up with those of the whole period. Participants are never split: every
+    query asks about every group, as 'required: all' groups must be.
+
+    :param dict options: Query body, as from build_availability.
+    :param int max_periods: Most periods per query. (Optional, default settings.MAX_AVAILABLE_PERIODS)
+    :param int max_span_days: Most days from the first start to the last end of a query. (Optional, default settings.MAX_AVAILABILITY_SPAN_DAYS)
+    :return: Query bodies, in order of their periods. Just options if it needs no splitting.
+    :rtype: ``list``
+    """
+    max_periods = max_periods or settings.MAX_AVAILABLE_PERIODS
+    max_span = 86400 * (max_span_days or settings.MAX_AVAILABILITY_SPAN_DAYS)
+    periods = options.get('available_periods')
+    if not periods:
+        return [options]
+
+    duration = 60 * _minutes(options.get('required_duration'))
+    step = 60 * _minutes(options.get('start_interval')) or duration or 60
+    piece = max(step, max_span - max_span % step)
+    overlap = -(-duration // step) * step
+
+    pieces = []
+    for start, end in sorted((parse_event_epoch(period['start']), parse_event_epoch(period['end'])) for period in periods):
+        while end - start > max_span and piece > overlap:
+            pieces.append((start, start + piece))
+            start += piece - overlap
+        pieces.append((start, end))
+    # Pieces of a long period can start after shorter periods it overlaps.
+    pieces.sort()
+
+    if len(pieces) == len(periods) and len(pieces) <= max_periods and max(end for _, end in pieces) - pieces[0][0] <= max_span:
+        return [options]
+
+    queries = []
+    chunk = []
+    chunk_end = None
+    for start, end in pieces:
+        if chunk and (len(chunk) >= max_periods or max(chunk_end, end) - chunk[0][0] > max_span):
+            queries.append(chunk)
+            chunk = []
+        if not chunk:
+            chunk_end = end
+        chunk.append((start, end))
+        chunk_end = max(chunk_end, end)
+    queries.append(chunk)
+    return [
+        dict(options, available_periods=[{'start': format_event_epoch(start), 'end': format_event_epoch(end)} for start, end in chunk])
+        for chunk in queries
+    ]
+
+
+def merge_availability(results, response_format=None, max_results=None):
+    """Merge the results of the queries from plan_availability into those of a single query.
+
+    Periods that overlap or meet, for the same participants, are joined, and
+    repeated slots are dropped.
+
+    :param list results: Each query's available_periods or available_slots, in the order of the queries.
+    :param string response_format: The queries' response_format. (Optional, default periods)
+    :param int max_results: Most periods or slots to return. (Optional, default all)
+    :rtype: ``list``
+    """
+    items = sorted(
+        (item for result in results for item in result),
+        key=lambda item: (parse_event_epoch(item['start']), parse_event_epoch(item['end'])),
+    )
+    merged = []
+    if response_format in ('slots', 'overlapping_slots'):
+        seen = set()
+        for item in items:
+            key = (item['start'], item['end'], _participants_key(item))
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+    else:
+        # The last period for each set of participants, which the next may extend.
+        open_periods = {}
+        for item in items:
+            key = _participants_key(item)
+            last = open_periods.get(key)
+            if last is not None and parse_event_epoch(item['start']) <= parse_event_epoch(last['end']):
+                if parse_event_epoch(item['end']) > parse_event_epoch(last['end']):
+                    last['end'] = item['end']
+                continue
+            period = dict(item)
+            open_periods[key] = period
+            merged.append(period)
+    if max_results:
+        merged = merged[:max_results]
+    return merged
+
+
+class PreparedAvailability(object):
+    """An availability query with everything but available_periods mapped and encoded once.
+
+    Created by ``Client.prepare_availability``. Calling it with periods splices
+    them into the cached json, so repeated queries of the same shape skip
+    mapping participants and encoding everything else.
+    """
+
+    def __init__(self, request_handler, options):
+        """
+        :param RequestHandler request_handler: Handler to post queries with.
+        :param dict options: Query body without available_periods, as from build_availability.
+        """
+        self.request_handler = request_handler
+        self.options = options
+        self.response_element = 'available_periods'
+        if options.get('response_format') in ('slots', 'overlapping_slots'):
+            self.response_element = 'available_slots'
+        encoded = json.dumps(options, separators=(',', ':')).encode('utf-8')
+        # Everything up to the closing brace, ready for the periods to be appended.
+        self._prefix = encoded[:-1] + (b',"available_periods":' if options else b'"available_periods":')
+
+    def body(self, available_periods):
+        """The encoded request body for the given periods.
+
+        :param list available_periods: Period dicts with 'start' and 'end' datetimes or strings.
+        :rtype: ``bytes``
+        """
+        periods = json.dumps(translate_available_periods(available_periods), separators=(',', ':'))
+        return b''.join((self._prefix, periods.encode('utf-8'), b'}'))
+
+    def __call__(self, available_periods):
+        """Perform the query for the given periods.
+
+        :param list available_periods: Period dicts with 'start' and 'end' datetimes or strings.
+        :rtype: ``list``
+        """
+        response = self.request_handler.post(endpoint='availability', body=self.body(available_periods))
+        return response.json()[self.response_element]
+
+
+def _translate_times(item, fields):
+    changed = None
+    for field in fields:
+        value = item[field]
+        formatted = _format_time(value)
+        if formatted is not value:
+            if changed is None:
+                changed = dict(item)
+            changed[field] = formatted
+    return item if changed is None else changed
+
+
+def _format_time(value):
+    # format_event_time, without updating {'time': ..., 'tzid': ...} dicts in place.
+    if isinstance(value, dict):
+        time = value.get('time')
+        if time and type(time) is not str:
+            return dict(value, time=format_event_time(time))
+        return value
+    return format_event_time(value)
+
+
+def _minutes(duration):
+    if type(duration) is dict:
+        return duration.get('minutes') or 0
+    return duration or 0
+
+
+def _participants_key(item):
+    return tuple(sorted(participant.get('sub', '') for participant in item.get('participants', ())))
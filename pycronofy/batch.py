@@ -24,6 +24,11 @@ class BatchBuilder(object):
                     calendar_id, data={'event_uid': event_uid})
         return self
 
+    def change_participation_status(self, calendar_id, event_uid, status):
+        self.post("/v1/calendars/%s/events/%s/participation_status" %
+                  (calendar_id, event_uid), data={'status': status})
+        return self
+
     def add_entry(self, method, relative_url, data):
         self.entries.append(BatchEntryRequest(method, relative_url, data))
 
@@ -0,0 +1,90 @@
+import threading
+import time
+
+
+class CalendarIndex(object):
+    """Calendars of an account, indexed by calendar_id and by (profile_id, calendar_name).
+
+    Filled from list_calendars results and kept up to date as calendars are
+    created, so finding a calendar (eg the existing one after a duplicate name
+    error) is a dict lookup rather than a new listing and a scan.
+
+    Example Usage:
+
+    index = CalendarIndex(ttl=300)
+    index.update(client.list_calendars())
+    index.find(profile_id, 'Interviews')
+    """
+
+    def __init__(self, ttl=None):
+        """
+        :param float ttl: Seconds a listing is trusted for. (Optional, default None never expires)
+        """
+        self.ttl = ttl
+        self.by_id = {}
+        self.by_name = {}
+        self.updated = None
+        self._lock = threading.Lock()
+
+    @property
+    def stale(self):
+        """Whether the index needs listing again: it was never filled, or was filled more than ttl seconds ago.
+
+        :rtype: ``bool``
+        """
+        if self.updated is None:
+            return True
+        return self.ttl is not None and time.monotonic() - self.updated > self.ttl
+
+    def update(self, calendars):
+        """Replace the index with a full listing.
+
+        :param list calendars: Calendar dicts, as from Client.list_calendars.
+        """
+        by_id = {}
+        by_name = {}
+        for calendar in calendars:
+            by_id[calendar['calendar_id']] = calendar
+            by_name[(calendar['profile_id'], calendar['calendar_name'])] = calendar
+        with self._lock:
+            self.by_id = by_id
+            self.by_name = by_name
+            self.updated = time.monotonic()
+
+    def add(self, calendar):
+        """Add or replace a single calendar, eg one just created.
+
+        :param dict calendar: Calendar dict.
+        """
+        with self._lock:
+            self.by_id[calendar['calendar_id']] = calendar
+            self.by_name[(calendar['profile_id'], calendar['calendar_name'])] = calendar
+
+    def get(self, calendar_id):
+        """The calendar with an id.
+
+        :param string calendar_id: Calendar ID.
+        :return: Calendar dict, or None if not indexed.
+        :rtype: ``dict``
+        """
+        return self.by_id.get(calendar_id)
+
+    def find(self, profile_id, calendar_name):
+        """The calendar of a profile with a name.
+
+        :param string profile_id: Profile ID.
+        :param string calendar_name: Calendar name.
+        :return: Calendar dict, or None if not indexed.
+        :rtype: ``dict``
+        """
+        return self.by_name.get((profile_id, calendar_name))
+
+    def clear(self):
+        """Forget every calendar, so the next lookup lists them again."""
+        with self._lock:
+            self.by_id = {}
+            self.by_name = {}
+            self.updated = None
+
+    def __len__(self):
+        return len(self.by_id)
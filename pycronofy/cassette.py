@@ -0,0 +1,227 @@
+import gzip
+import json
+import threading
+
+from requests.structures import CaseInsensitiveDict
+
+from pycronofy.exceptions import PyCronofyCassetteError
+from pycronofy.transport import Transport, TransportRequest, TransportResponse, dispatch_hooks, prepare_request
+
+# Response headers worth keeping. Everything else (dates, request ids, cookies)
+# varies between recordings and only bloats the cassette.
+RECORDED_HEADERS = frozenset(('content-type', 'retry-after', 'location'))
+
+# JSON fields holding credentials, eg in oauth/token requests and responses.
+# Their values are replaced with REDACTED wherever they appear in a body.
+REDACTED_FIELDS = frozenset(('access_token', 'refresh_token', 'id_token', 'client_secret', 'code', 'token'))
+REDACTED = 'REDACTED'
+
+
+class Cassette(object):
+    """Recorded API traffic, stored as gzipped JSON lines.
+
+    Each interaction holds the request method, URL and body and the response
+    status, headers and body. Authorization headers are never recorded, and
+    credentials in request and response bodies (see REDACTED_FIELDS) are
+    redacted. Event details, email addresses and other account data are kept
+    as recorded, so review a cassette before sharing or committing it.
+
+    Example Usage:
+
+    cassette = Cassette()
+    cassette.record(client)
+    ... run the pipeline against the real API ...
+    cassette.save('events.jsonl.gz')
+
+    Cassette.load('events.jsonl.gz').replay(client)
+    ... the same calls are now answered from the cassette ...
+    """
+
+    def __init__(self, interactions=None):
+        """
+        :param list interactions: Interaction dicts, as saved. (Optional, default empty)
+        """
+        self.interactions = list(interactions or ())
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Load a cassette saved with ``save``.
+
+        :param string path: File to read.
+        :rtype: ``Cassette``
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def save(self, path):
+        """Write the cassette to a file.
+
+        :param string path: File to write.
+        """
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, separators=(',', ':')))
+                f.write('\n')
+
+    def append(self, request, response):
+        """Record an interaction, redacting credentials.
+
+        :param request: The request sent, with ``method``, ``url`` and ``body``.
+        :param Response response: The response received.
+        """
+        interaction = {
+            'method': request.method,
+            'url': request.url,
+            'body': redact(request.body),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {key: value for key, value in response.headers.items() if key.lower() in RECORDED_HEADERS},
+            'response': redact(response.text),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def record(self, client):
+        """Record every request the client makes from now on.
+
+        Requests are still sent through the client's own transport.
+
+        :param Client client: Client (or RequestHandler) to record.
+        :return: self
+        """
+        request_handler = _request_handler(client)
+        request_handler.transport = RecordingTransport(self, request_handler.transport)
+        return self
+
+    def replay(self, client, repeat=False):
+        """Answer every request the client makes from the cassette, without using the network.
+
+        :param Client client: Client (or RequestHandler) to replay to.
+        :param bool repeat: Start from the first matching interaction again once
+            all have been used, eg to replay in a benchmark loop. (Optional, default False)
+        :return: The ReplayTransport, to check ``unused()`` interactions.
+        :rtype: ``ReplayTransport``
+        """
+        transport = ReplayTransport(self, repeat)
+        _request_handler(client).transport = transport
+        return transport
+
+    def __len__(self):
+        return len(self.interactions)
+
+
+class RecordingTransport(Transport):
+    """Sends requests through another transport, adding each request and response to a cassette."""
+
+    def __init__(self, cassette, transport):
+        """
+        :param Cassette cassette: Cassette to record to.
+        :param Transport transport: Transport that sends the requests.
+        """
+        self.cassette = cassette
+        self.transport = transport
+
+    def send(self, method, url, headers=None, params=None, json=None, hooks=None, timeout=None, body=None):
+        response = self.transport.send(method, url, headers=headers, params=params, json=json, hooks=hooks,
+                                       timeout=timeout, body=body)
+        self.cassette.append(response.request, response)
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Answers requests from a cassette.
+
+    Interactions are matched on method and URL. Requests for the same method
+    and URL get the recorded responses in the order they were recorded.
+    """
+
+    def __init__(self, cassette, repeat=False):
+        """
+        :param Cassette cassette: Cassette to replay.
+        :param bool repeat: Cycle through matching interactions rather than failing once they are used up. (Optional, default False)
+        """
+        self.repeat = repeat
+        self._queues = {}
+        for interaction in cassette.interactions:
+            self._queues.setdefault((interaction['method'], interaction['url']), []).append(interaction)
+        self._positions = dict.fromkeys(self._queues, 0)
+        self._lock = threading.Lock()
+
+    def send(self, method, url, headers=None, params=None, json=None, hooks=None, timeout=None, body=None):
+        url, body, headers = prepare_request(url, headers, params, json, body)
+        request = TransportRequest(method.upper(), url, headers, body)
+        key = (request.method, request.url)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise PyCronofyCassetteError('No recorded interaction for %s %s' % key, request)
+            position = self._positions[key]
+            if position >= len(queue):
+                if not self.repeat:
+                    raise PyCronofyCassetteError('Recorded interactions for %s %s used up' % key, request)
+                position = 0
+            self._positions[key] = position + 1
+        return dispatch_hooks(hooks, self.build_response(request, queue[position]))
+
+    def build_response(self, request, interaction):
+        """Create a response from a recorded interaction.
+
+        :param TransportRequest request: The request being answered.
+        :param dict interaction: The recorded interaction.
+        :rtype: ``TransportResponse``
+        """
+        return TransportResponse(request, interaction['status'], CaseInsensitiveDict(interaction['headers']),
+                                 interaction['response'].encode('utf-8'), interaction.get('reason'))
+
+    def unused(self):
+        """Interactions that have not been replayed yet.
+
+        :rtype: ``list``
+        """
+        with self._lock:
+            return [interaction for key, queue in self._queues.items() for interaction in queue[self._positions[key]:]]
+
+
+def redact(body):
+    """Replace the values of REDACTED_FIELDS in a JSON body.
+
+    Bodies that are not JSON, or hold no credentials, are returned unchanged.
+
+    :param body: Request or response body.
+    :rtype: ``string``
+    """
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+    if not body:
+        return body
+    try:
+        value = json.loads(body)
+    except ValueError:
+        return body
+    redacted = _redact(value)
+    if redacted is value:
+        return body
+    return json.dumps(redacted)
+
+
+def _redact(value):
+    # Returns value itself when nothing in it needed redacting.
+    if isinstance(value, dict):
+        items = {key: REDACTED if key in REDACTED_FIELDS and item is not None else _redact(item) for key, item in value.items()}
+        if all(items[key] is item for key, item in value.items()):
+            return value
+        return items
+    if isinstance(value, list):
+        items = [_redact(item) for item in value]
+        if all(new is old for new, old in zip(items, value)):
+            return value
+        return items
+    return value
+
+
+def _request_handler(client):
+    return getattr(client, 'request_handler', client)
@@ -1,31 +1,36 @@
 import datetime
 import collections.abc
 
-import hashlib
-import base64
-import hmac
-
-import pytz
-
 from pycronofy import settings
+from pycronofy import timezones
 from pycronofy.auth import Auth
+from pycronofy.availability import PreparedAvailability, build_availability, build_real_time_availability, merge_availability
+from pycronofy.availability import map_buffer, map_buffer_details, map_duration, map_member, map_participants
+from pycronofy.availability import map_participants_group, map_sequence, map_sequence_item, plan_availability
+from pycronofy.availability import translate_available_periods
+from pycronofy.availability import build_real_time_sequencing_availability, build_sequenced_availability
+from pycronofy.batch import BatchBuilder
 from pycronofy.batch import BatchEntry
 from pycronofy.batch import BatchResponse
-from pycronofy.datetime_utils import format_event_time
+from pycronofy.calendars import CalendarIndex
+from pycronofy.columnar import FreeBusyColumns
+from pycronofy.concurrency import BulkReport, chunked, run_concurrently, run_pipelined
+from pycronofy.config import Configuration
+from pycronofy.datetime_utils import format_event_time, parse_event_epoch, split_time_range
 from pycronofy.exceptions import PyCronofyPartialSuccessError, PyCronofyRequestError, PyCronofyValidationError
-from pycronofy.pagination import Pages
+from pycronofy.pagination import Pages, ShardedPages
+from pycronofy.records import RECORD_CLASSES
 from pycronofy.request_handler import RequestHandler
 from pycronofy.validation import validate
 
-from urllib.parse import urlencode
-
 
 class Client(object):
     """Client for cronofy web service.
     Performs authentication, and wraps API: https://docs.cronofy.com/developers/api/authorization/
     """
 
-    def __init__(self, client_id=None, client_secret=None, access_token=None, refresh_token=None, token_expiration=None, data_center=None):
+    def __init__(self, client_id=None, client_secret=None, access_token=None, refresh_token=None, token_expiration=None, data_center=None,
+                 api_base_url=None, instrumentation=(), config=None):
         """
         Example Usage:
 
@@ -38,15 +43,22 @@ class Client(object):
         :param string refresh_token: Existing Refresh Token for User's Account. (Optional, default None)
         :param datetime.datetime token_expiration: Datetime token expires. (Optional, default None)
         :param string data_center: The name of the data_center to use. (Optional, default None)
+        :param string api_base_url: Base URL of the API, overriding data_center. For example a
+            pycronofy.fake_server.FakeCronofyServer's url. (Optional, default None)
+        :param tuple instrumentation: Sinks notified of every request, such as a
+            pycronofy.instrumentation.MetricsRegistry. (Optional)
+        :param Configuration config: Per-client settings such as hooks, timeouts, pool sizes and retries,
+            see pycronofy.config.Configuration. When given, data_center, api_base_url and instrumentation
+            are taken from it instead. (Optional, default None)
         """
+        if config is None:
+            config = Configuration(data_center=data_center, api_base_url=api_base_url, instrumentation=instrumentation)
+        self.config = config
         self.auth = Auth(client_id, client_secret, access_token,
                          refresh_token, token_expiration)
-        self.request_handler = RequestHandler(self.auth, data_center)
-
-        if data_center is None or data_center == 'us':
-            self.app_base_url = settings.APP_BASE_URL
-        else:
-            self.app_base_url = settings.APP_REGION_FORMAT % data_center
+        self.request_handler = RequestHandler(self.auth, config=config)
+        self.app_base_url = config.app_base_url
+        self.calendar_index = CalendarIndex(ttl=config.calendar_index_ttl)
 
     def account(self):
         """Get identifying information for the active account.
@@ -136,6 +148,36 @@ class Client(object):
         """
         self.request_handler.delete(endpoint='calendars/%s/events' % calendar_id, data={'event_uid': event_uid})
 
+    def delete_events(self, calendar_id, event_ids, batch_size=None, max_workers=2):
+        """Delete many events from the specified calendar through the batch endpoint.
+
+        Returns a generator: batches are only sent as it is iterated, see upsert_events.
+
+        :param string calendar_id: ID of calendar to delete from.
+        :param iterable event_ids: IDs of events to delete. May be a generator.
+        :param int batch_size: Deletions per batch request, at most 50. (Optional, default 50)
+        :param int max_workers: Batch requests in flight at once. (Optional, default 2)
+        :return: A BatchEntry per event, in order.
+        :rtype: ``generator``
+        """
+        return self._stream_batches(
+            event_ids, lambda builder, event_id: builder.delete_event(calendar_id, event_id), batch_size, max_workers)
+
+    def delete_external_events(self, calendar_id, event_uids, batch_size=None, max_workers=2):
+        """Delete many external events from the specified calendar through the batch endpoint.
+
+        Returns a generator: batches are only sent as it is iterated, see upsert_events.
+
+        :param string calendar_id: ID of calendar to delete from.
+        :param iterable event_uids: IDs of events to delete. May be a generator.
+        :param int batch_size: Deletions per batch request, at most 50. (Optional, default 50)
+        :param int max_workers: Batch requests in flight at once. (Optional, default 2)
+        :return: A BatchEntry per event, in order.
+        :rtype: ``generator``
+        """
+        return self._stream_batches(
+            event_uids, lambda builder, event_uid: builder.delete_external_event(calendar_id, event_uid), batch_size, max_workers)
+
     def elevated_permissions(self, permissions, redirect_uri=None):
         """Requests elevated permissions for a set of calendars.
 
@@ -206,8 +248,7 @@ class Client(object):
         :param dict organizer - A Dict containing the organzier of the invite
              :name      - A String for the name of the organizer.
         """
-        event['start'] = format_event_time(event['start'])
-        event['end'] = format_event_time(event['end'])
+        event = dict(event, start=format_event_time(event['start']), end=format_event_time(event['end']))
 
         body = {
             'smart_invite_id': smart_invite_id,
@@ -226,6 +267,35 @@ class Client(object):
 
         return self.request_handler.post('smart_invites', data=body, use_api_key=True).json()
 
+    def bulk_upsert_smart_invites(self, invites, max_workers=None, rate_limit=None):
+        """Creates or updates many smart invites, several at a time.
+
+        Example Usage:
+
+        report = client.bulk_upsert_smart_invites(
+            ((invite_id, {'email': email}, event) for invite_id, email in attendees),
+            rate_limit=20,
+        )
+        for invite, error in report.failures:
+            ...
+
+        :param iterable invites: (smart_invite_id, recipient, event) tuples, optionally followed by callback_url
+            and organizer, or dicts of upsert_smart_invite's arguments. May be a generator.
+        :param int max_workers: Most invites submitted at once. (Optional, default the configured pool_maxsize)
+        :param rate_limit: Most invites submitted per second, or a RateLimiter shared with other work. (Optional, default unlimited)
+        :return: Report whose results are (invite, response) pairs and failures (invite, exception) pairs.
+        :rtype: ``BulkReport``
+        """
+        def upsert(invite):
+            if type(invite) is dict:
+                return self.upsert_smart_invite(**invite)
+            return self.upsert_smart_invite(*invite)
+
+        report = BulkReport()
+        for invite, result, error in run_concurrently(upsert, invites, max_workers or self.config.pool_maxsize, rate_limit):
+            report.add(invite, result, error)
+        return report
+
     def get_smart_invite(self, smart_invite_id, recipient_email):
         """Gets the details for a smart invite.
 
@@ -281,7 +351,7 @@ class Client(object):
                 'redirect_uri': redirect_uri if redirect_uri else self.auth.redirect_uri,
             })
         data = response.json()
-        token_expiration = (datetime.datetime.now(tz=pytz.utc) + datetime.timedelta(seconds=data['expires_in']))
+        token_expiration = (timezones.now() + datetime.timedelta(seconds=data['expires_in']))
         self.auth.update(
             token_expiration=token_expiration,
             access_token=data['access_token'],
@@ -308,7 +378,7 @@ class Client(object):
                 'application_calendar_id': application_calendar_id,
             })
         data = response.json()
-        token_expiration = (datetime.datetime.now(tz=pytz.utc) + datetime.timedelta(seconds=data['expires_in']))
+        token_expiration = (timezones.now() + datetime.timedelta(seconds=data['expires_in']))
         self.auth.update(
             token_expiration=token_expiration,
             access_token=data['access_token'],
@@ -330,15 +400,43 @@ class Client(object):
         """
         if not self.auth.token_expiration:
             return True
-        return datetime.datetime.now(tz=pytz.utc) > self.auth.token_expiration
+        return timezones.now() > self.auth.token_expiration
 
     def list_calendars(self):
         """Return a list of calendars available for the active account.
 
+        Also refreshes calendar_index.
+
         :return: List of calendars (dictionaries).
         :rtype: ``list``
         """
-        return self.request_handler.get(endpoint='calendars').json()['calendars']
+        calendars = self.request_handler.get(endpoint='calendars').json()['calendars']
+        self.calendar_index.update(calendars)
+        return calendars
+
+    def find_calendar(self, profile_id=None, calendar_name=None, calendar_id=None):
+        """Find a calendar by id, or by profile and name, listing calendars only when
+        the cached listing is stale or does not contain it.
+
+        :param string profile_id: Profile ID, with calendar_name. (Optional, default None)
+        :param string calendar_name: Calendar name, with profile_id. (Optional, default None)
+        :param string calendar_id: Calendar ID, instead of profile_id and calendar_name. (Optional, default None)
+        :return: Calendar (dictionary), or None if there is no such calendar.
+        :rtype: ``dict``
+        """
+        index = self.calendar_index
+        if calendar_id is not None:
+            def lookup():
+                return index.get(calendar_id)
+        else:
+            def lookup():
+                return index.find(profile_id, calendar_name)
+
+        calendar = None if index.stale else lookup()
+        if calendar is None:
+            self.list_calendars()
+            calendar = lookup()
+        return calendar
 
     def list_profiles(self):
         """Get list of active user's calendar profiles.
@@ -369,21 +467,26 @@ class Client(object):
                     from_date=None,
                     to_date=None,
                     last_modified=None,
-                    tzid=settings.DEFAULT_TIMEZONE_ID,
+                    tzid=None,
                     only_managed=False,
                     include_managed=True,
                     include_deleted=False,
                     include_moved=False,
                     include_geo=False,
                     localized_times=False,
-                    automatic_pagination=True):
+                    automatic_pagination=True,
+                    parse_times=None,
+                    records=False,
+                    prefetch=False,
+                    shards=None,
+                    max_workers=None):
         """Read events for linked account (optionally for the specified calendars).
 
         :param tuple calendar_ids: Tuple or list of calendar ids to pass to cronofy. (Optional).
         :param datetime.date from_date: Start datetime (or ISO8601 string) for query. (Optional).
         :param datetime.date to_date: End datetime (or ISO8601 string) for query. (Optional).
         :param datetime.datetime last_modified: Return items modified on or after last_modified. Datetime or ISO8601 string. (Optional).
-        :param string tzid: Timezone ID for query. (Optional, default settings.DEFAULT_TIMEZONE_ID). Should match tzinfo on datetime objects.
+        :param string tzid: Timezone ID for query. (Optional, default the config's default_tzid). Should match tzinfo on datetime objects.
         :param bool only_managed: Only include events created through the API. (Optional, default False)
         :param bool include_managed: Include events created through the API. (Optional, default True)
         :param bool include_deleted: Include deleted events. (Optional, default False)
@@ -391,11 +494,30 @@ class Client(object):
         :param bool include_geo: Include any geo location information for events when available (Optional, default False)
         :param bool localized_times: Return time values for event start/end with localization information. This varies across providers. (Optional, default False).
         :param bool automatic_pagination: Autonatically fetch next page when iterating through results (Optional, default True)
-        :return: Wrapped results (Containing first page of events).
+        :param string parse_times: 'datetime' or 'epoch' to lazily convert start, end, created and updated
+            on each event when accessed. (Optional, default None)
+        :param bool records: Return compact ``pycronofy.records.Event`` objects instead of dicts. (Optional, default False)
+        :param bool prefetch: Fetch each next page in the background while the current one is processed. (Optional, default False)
+        :param int shards: Split from_date to to_date into this many windows and read them all at once, eg for
+            multi-year exports. Events spanning windows are returned once. Requires from_date and to_date. (Optional, default None)
+        :param int max_workers: Most windows read at once when sharded. (Optional, default the configured pool_maxsize)
+        :return: Wrapped results (Containing first page of events), or ShardedPages when sharded.
         :rtype: ``Pages``
         """
+        if shards and shards > 1:
+            if from_date is None or to_date is None:
+                raise ValueError('shards requires from_date and to_date')
+
+            def read_shard(shard_from, shard_to):
+                return self.read_events(calendar_ids, shard_from, shard_to, last_modified, tzid, only_managed, include_managed,
+                                        include_deleted, include_moved, include_geo, localized_times, True, parse_times,
+                                        records, prefetch)
+
+            return ShardedPages(read_shard, split_time_range(from_date, to_date, shards), _event_key,
+                                max_workers or self.config.pool_maxsize)
+
         results = self.request_handler.get(endpoint='events', params={
-            'tzid': tzid,
+            'tzid': tzid or self.config.default_tzid,
             'calendar_ids[]': calendar_ids,
             'from': format_event_time(from_date),
             'to': format_event_time(to_date),
@@ -408,31 +530,54 @@ class Client(object):
             'localized_times': localized_times,
         }).json()
 
-        return Pages(self.request_handler, results, 'events', automatic_pagination)
+        record_class = RECORD_CLASSES['events'] if records else None
+        return Pages(self.request_handler, results, 'events', automatic_pagination, parse_times, record_class, prefetch)
 
     def read_free_busy(self,
                        calendar_ids=(),
                        from_date=None,
                        to_date=None,
                        last_modified=None,
-                       tzid=settings.DEFAULT_TIMEZONE_ID,
+                       tzid=None,
                        include_managed=True,
                        localized_times=False,
-                       automatic_pagination=True):
+                       automatic_pagination=True,
+                       parse_times=None,
+                       records=False,
+                       prefetch=False,
+                       shards=None,
+                       max_workers=None):
         """Read free/busy blocks for linked account (optionally for the specified calendars).
 
         :param tuple calendar_ids: Tuple or list of calendar ids to pass to cronofy. (Optional).
         :param datetime.date from_date: Start datetime (or ISO8601 string) for query. (Optional).
         :param datetime.date to_date: End datetime (or ISO8601 string) for query. (Optional).
-        :param string tzid: Timezone ID for query. (Optional, default settings.DEFAULT_TIMEZONE_ID). Should match tzinfo on datetime objects.
+        :param string tzid: Timezone ID for query. (Optional, default the config's default_tzid). Should match tzinfo on datetime objects.
         :param bool include_managed: Include pages created through the API. (Optional, default True)
         :param bool localized_times: Return time values for event start/end with localization information. This varies across providers. (Optional, default False).
         :param bool automatic_pagination: Automatically fetch next page when iterating through results (Optional, default True)
-        :return: Wrapped results (Containing first page of free/busy blocks).
+        :param string parse_times: 'datetime' or 'epoch' to lazily convert start and end on each block when accessed. (Optional, default None)
+        :param bool records: Return compact ``pycronofy.records.FreeBusyBlock`` objects instead of dicts. (Optional, default False)
+        :param bool prefetch: Fetch each next page in the background while the current one is processed. (Optional, default False)
+        :param int shards: Split from_date to to_date into this many windows and read them all at once, eg for
+            multi-year exports. Blocks spanning windows are returned once. Requires from_date and to_date. (Optional, default None)
+        :param int max_workers: Most windows read at once when sharded. (Optional, default the configured pool_maxsize)
+        :return: Wrapped results (Containing first page of free/busy blocks), or ShardedPages when sharded.
         :rtype: ``Pages``
         """
+        if shards and shards > 1:
+            if from_date is None or to_date is None:
+                raise ValueError('shards requires from_date and to_date')
+
+            def read_shard(shard_from, shard_to):
+                return self.read_free_busy(calendar_ids, shard_from, shard_to, last_modified, tzid, include_managed,
+                                           localized_times, True, parse_times, records, prefetch)
+
+            return ShardedPages(read_shard, split_time_range(from_date, to_date, shards), _free_busy_key,
+                                max_workers or self.config.pool_maxsize)
+
         results = self.request_handler.get(endpoint='free_busy', params={
-            'tzid': tzid,
+            'tzid': tzid or self.config.default_tzid,
             'calendar_ids[]': calendar_ids,
             'from': format_event_time(from_date),
             'to': format_event_time(to_date),
@@ -440,7 +585,33 @@ class Client(object):
             'localized_times': localized_times,
         }).json()
 
-        return Pages(self.request_handler, results, 'free_busy', automatic_pagination)
+        record_class = RECORD_CLASSES['free_busy'] if records else None
+        return Pages(self.request_handler, results, 'free_busy', automatic_pagination, parse_times, record_class, prefetch)
+
+    def read_free_busy_columns(self,
+                               calendar_ids=(),
+                               from_date=None,
+                               to_date=None,
+                               tzid=None,
+                               include_managed=True,
+                               localized_times=False):
+        """Read all free/busy blocks for linked account into typed columns.
+
+        Every page is fetched and appended to the columns as it arrives, without building
+        a dict per block. Suited to loading large result sets into NumPy or Arrow.
+
+        :param tuple calendar_ids: Tuple or list of calendar ids to pass to cronofy. (Optional).
+        :param datetime.date from_date: Start datetime (or ISO8601 string) for query. (Optional).
+        :param datetime.date to_date: End datetime (or ISO8601 string) for query. (Optional).
+        :param string tzid: Timezone ID for query. (Optional, default the config's default_tzid). Should match tzinfo on datetime objects.
+        :param bool include_managed: Include pages created through the API. (Optional, default True)
+        :param bool localized_times: Return time values for event start/end with localization information. This varies across providers. (Optional, default False).
+        :return: Columns of calendar ids, start/end epoch seconds and statuses.
+        :rtype: ``FreeBusyColumns``
+        """
+        pages = self.read_free_busy(calendar_ids, from_date, to_date, tzid=tzid,
+                                    include_managed=include_managed, localized_times=localized_times)
+        return FreeBusyColumns.from_pages(pages)
 
     def availability(
         self,
@@ -451,7 +622,9 @@ class Client(object):
         buffer=(),
         response_format=None,
         query_slots=None,
-        max_results=None
+        max_results=None,
+        split=False,
+        max_workers=None
     ):
         """ Performs an availability query.
         :param list participants: An Array of participant groups or a dict for a single participant group.
@@ -462,38 +635,79 @@ class Client(object):
         :param string response_format - periods, slots or overlapping_slots (Optional, default periods)
         :param list query_slots - An Array of query slots, each much specify a start Time.
         :param int max_results - An Integer describing the maximum number of available periods or slots to return from the query.
+        :param bool split - Split available_periods the API would reject, by number or span, into several queries that are
+            performed at once, and merge their results. (Optional, default False)
+        :param int max_workers - Most split queries in flight at once. (Optional, default the configured pool_maxsize)
 
         :rtype: ``list``
         """
-        options = {}
-        options['participants'] = self.map_availability_participants(
-            participants)
-        options['required_duration'] = self.map_availability_duration(
-            required_duration)
-        options['buffer'] = self.map_availability_buffer(buffer)
+        options = build_availability(participants, required_duration, available_periods, start_interval,
+                                     buffer, response_format, query_slots, max_results)
+        response_element = 'available_periods'
+        if response_format in ['slots', 'overlapping_slots']:
+            response_element = 'available_slots'
 
-        if start_interval:
-            options['start_interval'] = self.map_availability_duration(start_interval)
+        if split:
+            queries = plan_availability(options)
+            if len(queries) > 1:
+                return self._split_availability(queries, response_element, response_format, max_results, max_workers)
 
-        response_element = 'available_periods'
+        return self.request_handler.post(endpoint='availability', data=options).json()[response_element]
 
-        if available_periods:
-            self.translate_available_periods(available_periods)
-            options['available_periods'] = available_periods
+    def _split_availability(self, queries, response_element, response_format, max_results, max_workers):
+        """Perform the queries from plan_availability at once and merge their results.
 
-        if query_slots:
-            self.translate_query_slots(query_slots)
-            options['query_slots'] = query_slots
+        Once max_results periods or slots that end before the remaining queries start
+        have been found, the remaining queries are not sent.
 
-        if response_format:
-            options['response_format'] = response_format
-            if response_format in ['slots', 'overlapping_slots']:
-                response_element = 'available_slots'
+        :rtype: ``list``
+        """
+        def query(options):
+            return self.request_handler.post(endpoint='availability', data=options).json()[response_element]
+
+        # The earliest start among the queries after each one.
+        starts = [None]
+        for options in reversed(queries[1:]):
+            start = min(parse_event_epoch(period['start']) for period in options['available_periods'])
+            starts.append(start if starts[-1] is None else min(start, starts[-1]))
+        starts.reverse()
+        results = []
+        outcomes = run_pipelined(query, queries, max_workers or self.config.pool_maxsize)
+        for (_, result, error), next_start in zip(outcomes, starts):
+            if error is not None:
+                raise error
+            results.append(result)
+            if max_results and next_start is not None:
+                merged = merge_availability(results, response_format, max_results)
+                if len(merged) >= max_results and parse_event_epoch(merged[-1]['end']) < next_start:
+                    outcomes.close()
+                    break
+        return merge_availability(results, response_format, max_results)
+
+    def prepare_availability(
+        self,
+        participants=(),
+        required_duration=(),
+        start_interval=None,
+        buffer=(),
+        response_format=None,
+        max_results=None
+    ):
+        """ Prepares an availability query to be performed repeatedly with different available periods.
 
-        if max_results:
-            options['max_results'] = max_results
+        The participants, durations and buffer are mapped and json encoded once. Arguments are as for availability.
 
-        return self.request_handler.post(endpoint='availability', data=options).json()[response_element]
+        Example Usage:
+
+        query = client.prepare_availability(participants=participants, required_duration=60)
+        for periods in candidate_periods:
+            available = query(periods)
+
+        :rtype: ``PreparedAvailability``
+        """
+        options = build_availability(participants, required_duration, None, start_interval,
+                                     buffer, response_format, None, max_results)
+        return PreparedAvailability(self.request_handler, options)
 
     def sequenced_availability(self, sequence=(), available_periods=()):
         """ Performs an availability query.
@@ -513,14 +727,55 @@ class Client(object):
 
         :rtype: ``list``
         """
-        options = {}
-        options['sequence'] = self.map_availability_sequence(sequence)
-
-        self.translate_available_periods(available_periods)
-        options['available_periods'] = available_periods
+        options = build_sequenced_availability(sequence, available_periods)
 
         return self.request_handler.post(endpoint='sequenced_availability', data=options).json()['sequences']
 
+    def sequenced_availabilities(self, sequences, available_periods=(), max_workers=None, rate_limit=None, enough=None):
+        """ Performs many sequenced availability queries at once, eg one per candidate panel.
+
+        Every sequence is mapped up front and the available periods are translated once
+        and shared by all the queries, which are then sent several at a time.
+
+        Example Usage:
+
+        report = client.sequenced_availabilities(
+            {panel.id: panel.sequence for panel in panels},
+            available_periods=periods,
+            enough=3,
+        )
+        viable = [panel_id for panel_id, found in report.results if found]
+
+        :param sequences: A dict of sequences (as for sequenced_availability) keyed by your own identifiers,
+            or an iterable of (identifier, sequence) pairs.
+        :param list available_periods - An Array of available time periods dicts, each must specify a start and end Time.
+        :param int max_workers: Most queries in flight at once. (Optional, default the configured pool_maxsize)
+        :param rate_limit: Most queries started per second, or a RateLimiter shared with other work. (Optional, default unlimited)
+        :param int enough: Stop once this many queries have found available sequences. Queries not yet
+            sent are skipped and are missing from the report. (Optional, default run every query)
+        :return: Report whose results are (identifier, sequences found) pairs and failures (identifier, exception) pairs.
+        :rtype: ``BulkReport``
+        """
+        if isinstance(sequences, collections.abc.Mapping):
+            sequences = sequences.items()
+        periods = translate_available_periods(available_periods)
+        queries = [(key, {'sequence': map_sequence(sequence), 'available_periods': periods}) for key, sequence in sequences]
+
+        def query(item):
+            return self.request_handler.post(endpoint='sequenced_availability', data=item[1]).json()['sequences']
+
+        report = BulkReport()
+        viable = 0
+        outcomes = run_concurrently(query, queries, max_workers or self.config.pool_maxsize, rate_limit)
+        for (key, _), result, error in outcomes:
+            report.add(key, result, error)
+            if result:
+                viable += 1
+                if enough and viable >= enough:
+                    outcomes.close()
+                    break
+        return report
+
     def refresh_authorization(self):
         """Refreshes the authorization tokens.
 
@@ -538,7 +793,7 @@ class Client(object):
             }
         )
         data = response.json()
-        token_expiration = (datetime.datetime.now(tz=pytz.utc) + datetime.timedelta(seconds=data['expires_in']))
+        token_expiration = (timezones.now() + datetime.timedelta(seconds=data['expires_in']))
         self.auth.update(
             token_expiration=token_expiration,
             access_token=data['access_token'],
@@ -588,6 +843,30 @@ class Client(object):
         self.request_handler.post(
             endpoint='calendars/%s/events' % calendar_id, data=event)
 
+    def upsert_events(self, calendar_id, events, batch_size=None, max_workers=2):
+        """Inserts or updates many events for the specified calendar through the batch endpoint.
+
+        Returns a generator. Events are read from the iterable a batch at a time,
+        and the next batch is built and sent while the previous one is in flight,
+        so memory use stays flat however many events there are. Nothing is sent
+        until the generator is iterated.
+
+        Example Usage:
+
+        for entry in client.upsert_events(calendar_id, (to_event(row) for row in rows)):
+            if entry.status() >= 400:
+                print(entry.request['data']['event_id'], entry.response.get('data'))
+
+        :param string calendar_id: ID of calendar to insert/update events into.
+        :param iterable events: Dictionaries of event data, as for upsert_event. May be a generator.
+        :param int batch_size: Events per batch request, at most 50. (Optional, default 50)
+        :param int max_workers: Batch requests in flight at once. (Optional, default 2)
+        :return: A BatchEntry per event, in order. Failed events have an error status rather than raising.
+        :rtype: ``generator``
+        """
+        return self._stream_batches(
+            events, lambda builder, event: builder.upsert_event(calendar_id, event), batch_size, max_workers)
+
     def authorize_with_service_account(self, email, scope, callback_url, state=None):
         """ Attempts to authorize the email with impersonation from a service account
 
@@ -628,6 +907,65 @@ class Client(object):
             endpoint="service_account_authorizations", data=params)
         None
 
+    def bulk_authorize_via_service_account(self, service_account_authorizations, state=None, chunk_size=None,
+                                           max_workers=None, rate_limit=None, checkpoint=None, progress=None):
+        """Authorizes any number of emails with impersonation from a service account, in chunks sent several at a time.
+
+        Example Usage:
+
+        checkpoint = pycronofy.concurrency.Checkpoint.load('onboarding.checkpoint')
+        report = client.bulk_authorize_via_service_account(
+            ({'email': email, 'scope': scope, 'callback_url': callback_url} for email in mailboxes),
+            checkpoint=checkpoint,
+            progress=lambda submitted, failed: print(submitted, failed),
+        )
+        for chunk, error in report.failures:
+            ...
+
+        :param iterable service_account_authorizations: Authorization dicts with 'email', 'scope' and 'callback_url',
+            as for authorize_multiple_accounts_via_service_account. May be a generator.
+        :param string state: A value that will be returned to you unaltered along with the authorization request decision.
+            (Optional, default None)
+        :param int chunk_size: Authorizations per request, at most 50. (Optional, default 50)
+        :param int max_workers: Most requests in flight at once. (Optional, default the configured pool_maxsize)
+        :param rate_limit: Most requests started per second, or a shared RateLimiter. (Optional, default unlimited)
+        :param Checkpoint checkpoint: Emails already submitted, which are skipped. Emails are added to it as
+            their chunk is accepted, so an interrupted run can be resumed with the same checkpoint. (Optional, default None)
+        :param function progress: Called with the number of authorizations submitted and failed so far
+            after each chunk completes. (Optional, default None)
+        :return: Report whose results are (chunk, None) pairs and failures (chunk, exception) pairs.
+        :rtype: ``BulkReport``
+        """
+        limit = settings.MAX_SERVICE_ACCOUNT_AUTHORIZATIONS
+        if chunk_size is None:
+            chunk_size = limit
+        if not 0 < chunk_size <= limit:
+            raise ValueError('chunk_size must be between 1 and %d' % limit)
+
+        if checkpoint is not None:
+            service_account_authorizations = (
+                authorization for authorization in service_account_authorizations
+                if authorization['email'] not in checkpoint
+            )
+
+        def submit(chunk):
+            self.authorize_multiple_accounts_via_service_account(chunk, state=state)
+
+        report = BulkReport()
+        submitted = failed = 0
+        chunks = chunked(service_account_authorizations, chunk_size)
+        for chunk, result, error in run_concurrently(submit, chunks, max_workers or self.config.pool_maxsize, rate_limit):
+            report.add(chunk, result, error)
+            if error is None:
+                submitted += len(chunk)
+                if checkpoint is not None:
+                    checkpoint.add(authorization['email'] for authorization in chunk)
+            else:
+                failed += len(chunk)
+            if progress is not None:
+                progress(submitted, failed)
+        return report
+
     def real_time_scheduling(self,
                              availability,
                              oauth,
@@ -688,19 +1026,7 @@ class Client(object):
         }
 
         if availability:
-            options = {}
-            options['participants'] = self.map_availability_participants(availability.get('participants', None))
-            options['required_duration'] = self.map_availability_duration(availability.get('required_duration', None))
-            options['start_interval'] = self.map_availability_duration(availability.get('start_interval', None))
-            options['buffer'] = self.map_availability_buffer(availability.get('buffer', None))
-            self.translate_available_periods(availability['available_periods'])
-            options['available_periods'] = availability['available_periods']
-            if availability.get('max_results'):
-                options['max_results'] = availability['max_results']
-            if availability.get('response_format'):
-                options['response_format'] = availability['response_format']
-
-            args['availability'] = options
+            args['availability'] = build_real_time_availability(availability)
 
         if minimum_notice:
             args['minimum_notice'] = self.map_availability_duration(minimum_notice)
@@ -799,14 +1125,7 @@ class Client(object):
         }
 
         if availability:
-            options = {}
-            options['sequence'] = self.map_availability_sequence(availability.get('sequence', None))
-
-            if availability.get('available_periods', None):
-                self.translate_available_periods(availability['available_periods'])
-                options['available_periods'] = availability['available_periods']
-
-        args['availability'] = options
+            args['availability'] = build_real_time_sequencing_availability(availability)
 
         if minimum_notice:
             args['minimum_notice'] = self.map_availability_duration(minimum_notice)
@@ -840,6 +1159,8 @@ class Client(object):
             'provider_name': provider_name,
             'avoid_linking': avoid_linking,
         }
+        from urllib.parse import urlencode
+
         urlencoded_params = urlencode(params)
         return "{url}?{params}".format(url=url, params=urlencoded_params)
 
@@ -854,22 +1175,107 @@ class Client(object):
         validate(method, self.auth, *args, **kwargs)
 
     def batch(self, builder):
-        requests = builder.build()
+        result = BatchResponse(self._send_batch(builder.build()))
 
+        if result.has_errors():
+            msg = "Batch contains %i errors" % len(result.errors())
+            raise PyCronofyPartialSuccessError(msg, result)
+
+        return result
+
+    def change_participation_statuses(self, changes, batch_size=None, max_workers=2):
+        """Changes the participation status of many events through the batch endpoint.
+
+        Example Usage:
+
+        report = client.change_participation_statuses(
+            (calendar_id, rsvp.event_uid, rsvp.status) for rsvp in rsvps
+        )
+        for changes, error in report.failures:
+            ...
+
+        :param iterable changes: (calendar_id, event_uid, status) tuples, as for change_participation_status.
+            May be a generator.
+        :param int batch_size: Changes per batch request, at most 50. (Optional, default 50)
+        :param int max_workers: Batches in flight at once. (Optional, default 2)
+        :return: Report whose results are (changes, BatchResponse) pairs for batches where every change was
+            applied, and failures (changes, exception) pairs for the rest. A batch whose request failed has
+            a PyCronofyRequestError; one where only some changes failed has a PyCronofyPartialSuccessError
+            whose batch_response holds every entry.
+        :rtype: ``BulkReport``
+        """
+        batches = self._build_batches(
+            changes, lambda builder, change: builder.change_participation_status(*change), batch_size)
+
+        def send(batch):
+            result = BatchResponse(self._send_batch(batch[1]))
+            if result.has_errors():
+                msg = "Batch contains %i errors" % len(result.errors())
+                raise PyCronofyPartialSuccessError(msg, result)
+            return result
+
+        report = BulkReport()
+        for (chunk, _), result, error in run_pipelined(send, batches, max_workers):
+            report.add(chunk, result, error)
+        return report
+
+    def _send_batch(self, requests):
+        """Post a list of batch requests.
+
+        :param list requests: Batch request dicts, as from BatchBuilder.build.
+        :return: A BatchEntry per request.
+        :rtype: ``list``
+        """
         data = {"batch": requests}
         responses = self.request_handler.post(endpoint="batch", data=data).json().get('batch', [])
 
         entries = list()
         for (request, response) in zip(requests, responses):
             entries.append(BatchEntry(request, response))
+        return entries
 
-        result = BatchResponse(entries)
+    def _stream_batches(self, items, add, batch_size=None, max_workers=2):
+        """Send items through the batch endpoint in batches, building each batch while the previous ones are in flight.
 
-        if result.has_errors():
-            msg = "Batch contains %i errors" % len(result.errors())
-            raise PyCronofyPartialSuccessError(msg, result)
+        :param iterable items: Items to send. May be a generator.
+        :param function add: Called with a BatchBuilder and an item to add the item's request.
+        :param int batch_size: Requests per batch, at most 50. (Optional, default 50)
+        :param int max_workers: Batches in flight at once. (Optional, default 2)
+        :return: A BatchEntry per item, in order.
+        :rtype: ``generator``
+        """
+        batches = self._build_batches(items, add, batch_size)
+        return self._send_batches((requests for _, requests in batches), max_workers)
 
-        return result
+    def _build_batches(self, items, add, batch_size=None):
+        """Group items into batch requests, lazily.
+
+        :param iterable items: Items to send. May be a generator.
+        :param function add: Called with a BatchBuilder and an item to add the item's request.
+        :param int batch_size: Requests per batch, at most 50. (Optional, default 50)
+        :return: (items, batch requests) pairs.
+        :rtype: ``generator``
+        """
+        limit = settings.MAX_BATCH_SIZE
+        if batch_size is None:
+            batch_size = limit
+        if not 0 < batch_size <= limit:
+            raise ValueError('batch_size must be between 1 and %d' % limit)
+
+        def build(chunk):
+            builder = BatchBuilder()
+            for item in chunk:
+                add(builder, item)
+            return chunk, builder.build()
+
+        return (build(chunk) for chunk in chunked(items, batch_size))
+
+    def _send_batches(self, batches, max_workers):
+        for _, entries, error in run_pipelined(self._send_batch, batches, max_workers):
+            if error is not None:
+                raise error
+            for entry in entries:
+                yield entry
 
     def translate_available_periods(self, periods):
         for params in periods:
@@ -883,89 +1289,28 @@ class Client(object):
                 params['start'] = format_event_time(params['start'])
 
     def map_availability_sequence(self, sequence):
-        if isinstance(sequence, collections.abc.Iterable):
-            return list(map(lambda item: self.map_sequence_item(item), sequence))
-        else:
-            return sequence
+        return map_sequence(sequence)
 
     def map_availability_buffer(self, buffer):
-        result = {}
-
-        if type(buffer) is not dict:
-            return result
-
-        if 'before' in buffer:
-            result['before'] = self.map_buffer_details(buffer['before'])
-
-        if 'after' in buffer:
-            result['after'] = self.map_buffer_details(buffer['after'])
-
-        return result
+        return map_buffer(buffer)
 
     def map_buffer_details(self, buffer):
-        if type(buffer) is not dict:
-            return self.map_availability_duration(buffer)
-
-        result = self.map_availability_duration(buffer)
-
-        if 'minimum' in buffer:
-            result['minimum'] = self.map_availability_duration(buffer['minimum'])
-
-        if 'maximum' in buffer:
-            result['maximum'] = self.map_availability_duration(buffer['maximum'])
-
-        return result
+        return map_buffer_details(buffer)
 
     def map_sequence_item(self, sequence_item):
-        sequence_item['participants'] = self.map_availability_participants(sequence_item.get('participants', None))
-        sequence_item['required_duration'] = self.map_availability_duration(sequence_item.get('required_duration', None))
-        sequence_item['start_interval'] = self.map_availability_duration(sequence_item.get('start_interval', None))
-        sequence_item['buffer'] = self.map_availability_buffer(sequence_item.get('buffer', None))
-
-        if sequence_item.get('available_periods', None):
-            self.translate_available_periods(sequence_item['available_periods'])
-
-        return sequence_item
+        return map_sequence_item(sequence_item)
 
     def map_availability_participants(self, participants):
-        if type(participants) is dict:
-            # Allow one group to be specified without being nested
-            return [self.map_availability_participants_group(participants)]
-        elif isinstance(participants, collections.abc.Iterable):
-            return list(map(lambda group: self.map_availability_participants_group(group), participants))
-        else:
-            return participants
+        return map_participants(participants)
 
     def map_availability_participants_group(self, participants):
-        if type(participants) is dict:
-            mapped_participants = list(map(lambda member: self.map_availability_member(member), participants.get('members', ())))
-            participants['members'] = mapped_participants
-
-            if participants.get('required', None) is None:
-                participants['required'] = 'all'
-
-            return participants
-        elif isinstance(participants, collections.abc.Iterable):
-            return list(map(lambda group: self.map_availability_participants(group), participants))
-        else:
-            participants
+        return map_participants_group(participants)
 
     def map_availability_member(self, member):
-        member_type = type(member)
-
-        if member_type in (type(''), type(u'')):
-            return {'sub': member}
-        elif member_type is dict:
-            if member.get('available_periods', None):
-                self.translate_available_periods(member['available_periods'])
-
-        return member
+        return map_member(member)
 
     def map_availability_duration(self, required_duration):
-        if type(required_duration) is int:
-            return {'minutes': required_duration}
-        else:
-            return required_duration
+        return map_duration(required_duration)
 
     def create_calendar(self, profile_id, calendar_name, error_on_duplicate=True):
         try:
@@ -973,6 +1318,8 @@ class Client(object):
                 'profile_id': profile_id,
                 'name': calendar_name,
             }).json()
+            if 'calendar' in results:
+                self.calendar_index.add(results['calendar'])
             return results
         except PyCronofyRequestError as e:
             # check for duplicate calendar errors (some providers do not allow them)
@@ -981,13 +1328,8 @@ class Client(object):
                     # throw the error by default
                     raise e
                 # ignore the error if told to, and just give back the calendar
-                calendar_list = self.list_calendars()
-                calendar_data = None
-                for calendar_item in calendar_list:
-                    if calendar_item['profile_id'] == profile_id:
-                        if calendar_item['calendar_name'] == calendar_name:
-                            calendar_data = calendar_item.copy()
-                return calendar_data
+                calendar_data = self.find_calendar(profile_id, calendar_name)
+                return calendar_data.copy() if calendar_data is not None else None
 
     def upsert_availability_rule(self, availability_rule):
         """Inserts or updates an Availability Rule for the active account.
@@ -1031,6 +1373,10 @@ class Client(object):
         if hmac_string is None or not hmac_string:
             return False
 
+        import base64
+        import hashlib
+        import hmac
+
         # In order to support Python 2.7 we generate the hmac and calculate the digest in two steps using `new` and `digest`
         generated = hmac.new(self.auth.client_secret.encode(), body.encode(), hashlib.sha256)
         digest = generated.digest()
@@ -1078,3 +1424,18 @@ class Client(object):
                 "version": version
             }
         ).json()
+
+
+def _event_key(event):
+    return (event['calendar_id'], event['event_uid'])
+
+
+def _free_busy_key(block):
+    return (block['calendar_id'], _time_key(block['start']), _time_key(block['end']))
+
+
+def _time_key(value):
+    # Localized times are dicts, which cannot be hashed; the time within identifies them.
+    if type(value) is dict:
+        return value.get('time')
+    return value
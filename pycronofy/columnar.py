@@ -0,0 +1,120 @@
+from array import array
+
+from pycronofy.datetime_utils import parse_event_epoch
+
+# free_busy_status values documented by Cronofy, given fixed codes. Any others
+# are assigned codes as they are seen.
+FREE_BUSY_STATUSES = ('tentative', 'busy', 'free', 'unavailable')
+
+
+class FreeBusyColumns(object):
+    """Free/busy blocks stored as typed columns rather than one dict per block.
+
+    Columns are ``array.array`` instances of equal length:
+
+    * ``calendar_id``: int32 codes, indexes into ``calendar_ids``
+    * ``start`` / ``end``: int64 seconds since the Unix epoch (UTC)
+    * ``status``: int8 codes, indexes into ``statuses``
+
+    Use ``to_numpy()`` or ``to_arrow()`` to hand the columns to analytics tools
+    without copying.
+    """
+
+    def __init__(self):
+        self.calendar_ids = []
+        self.statuses = list(FREE_BUSY_STATUSES)
+        self.calendar_id = array('i')
+        self.start = array('q')
+        self.end = array('q')
+        self.status = array('b')
+        self._calendar_codes = {}
+        self._status_codes = {status: code for code, status in enumerate(self.statuses)}
+
+    @classmethod
+    def from_pages(cls, pages):
+        """Build columns from every page of a free/busy response.
+
+        Pages are consumed as they are fetched, so only one page of decoded
+        json is held at a time.
+
+        :param Pages pages: Result of ``Client.read_free_busy``.
+        :rtype: ``FreeBusyColumns``
+        """
+        columns = cls()
+        columns.extend(pages.current_page())
+        while pages.current < pages.total:
+            pages.fetch_next_page()
+            columns.extend(pages.current_page())
+        return columns
+
+    def extend(self, blocks):
+        """Append free/busy blocks.
+
+        :param list blocks: Free/busy block dicts as returned by cronofy.
+        """
+        calendar_codes = self._calendar_codes
+        status_codes = self._status_codes
+        append_calendar = self.calendar_id.append
+        append_start = self.start.append
+        append_end = self.end.append
+        append_status = self.status.append
+        for block in blocks:
+            calendar_id = block['calendar_id']
+            code = calendar_codes.get(calendar_id)
+            if code is None:
+                code = calendar_codes[calendar_id] = len(self.calendar_ids)
+                self.calendar_ids.append(calendar_id)
+            append_calendar(code)
+
+            status = block.get('free_busy_status')
+            status_code = status_codes.get(status)
+            if status_code is None:
+                status_code = status_codes[status] = len(self.statuses)
+                self.statuses.append(status)
+            append_status(status_code)
+
+            append_start(parse_event_epoch(block['start']))
+            append_end(parse_event_epoch(block['end']))
+
+    def to_numpy(self):
+        """Return the columns as NumPy arrays sharing this object's memory.
+
+        Requires NumPy. The columns cannot be extended while the returned
+        arrays are alive.
+
+        :return: Dict of 'calendar_id', 'start', 'end' and 'status' arrays.
+        :rtype: ``dict``
+        """
+        import numpy
+
+        return {
+            'calendar_id': numpy.frombuffer(self.calendar_id, dtype=numpy.int32),
+            'start': numpy.frombuffer(self.start, dtype=numpy.int64),
+            'end': numpy.frombuffer(self.end, dtype=numpy.int64),
+            'status': numpy.frombuffer(self.status, dtype=numpy.int8),
+        }
+
+    def to_arrow(self):
+        """Return the columns as a pyarrow Table.
+
+        calendar_id and status are dictionary encoded and start/end are UTC
+        second timestamps. Requires pyarrow.
+
+        :rtype: ``pyarrow.Table``
+        """
+        import pyarrow
+
+        def column(arrow_type, values):
+            return pyarrow.Array.from_buffers(arrow_type, len(values), [None, pyarrow.py_buffer(values)])
+
+        return pyarrow.table({
+            'calendar_id': pyarrow.DictionaryArray.from_arrays(
+                column(pyarrow.int32(), self.calendar_id), pyarrow.array(self.calendar_ids, pyarrow.string())),
+            'start': column(pyarrow.timestamp('s', tz='UTC'), self.start),
+            'end': column(pyarrow.timestamp('s', tz='UTC'), self.end),
+            'status': pyarrow.DictionaryArray.from_arrays(
+                column(pyarrow.int8(), self.status), pyarrow.array(self.statuses, pyarrow.string())),
+        })
+
+    def __len__(self):
+        return len(self.start)
@@ -0,0 +1,240 @@
+import threading
+import time
+
+
+class RateLimiter(object):
+    """Token bucket limiting how often an operation may start, shared safely between threads.
+
+    Example Usage:
+
+    limiter = RateLimiter(rate=20)  # 20 requests per second
+    limiter.acquire()               # blocks until a request may be made
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param float rate: Operations allowed per second on average.
+        :param int burst: Operations allowed at once after a quiet period. (Optional, default max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until an operation may start, then take a token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+
+def rate_limiter(rate_limit):
+    """Return a RateLimiter for a rate (per second), an existing RateLimiter, or None for no limit."""
+    if rate_limit is None or isinstance(rate_limit, RateLimiter):
+        return rate_limit
+    return RateLimiter(rate_limit)
+
+
+def chunked(items, size):
+    """Group items into lists of up to size, reading the iterable lazily.
+
+    :param iterable items: Items to group. May be a generator.
+    :param int size: Largest chunk.
+    :rtype: ``generator``
+    """
+    if size < 1:
+        raise ValueError('size must be at least 1')
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_concurrently(function, items, max_workers=8, rate_limit=None):
+    """Call function for each item in a pool of threads, yielding outcomes as they complete.
+
+    At most ``max_workers`` calls run at once, and items are taken from the
+    iterable only as workers become free, so it can be a lazy generator of
+    any length. Stop iterating to stop submitting more work.
+
+    :param function function: Called with each item.
+    :param iterable items: Items to process.
+    :param int max_workers: Most calls in flight at once. (Optional, default 8)
+    :param rate_limit: Most calls started per second, or a shared RateLimiter. (Optional, default unlimited)
+    :return: (item, result, exception) for each item, in completion order. One of result and exception is None.
+    :rtype: ``generator``
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    limiter = rate_limiter(rate_limit)
+
+    def call(item):
+        if limiter is not None:
+            limiter.acquire()
+        return function(item)
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        try:
+            for item in items:
+                pending[executor.submit(call, item)] = item
+                if len(pending) >= max_workers:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    error = future.exception()
+                    yield item, (None if error else future.result()), error
+                    for next_item in items:
+                        pending[executor.submit(call, next_item)] = next_item
+                        break
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def run_pipelined(function, items, max_workers=2):
+    """Call function for each item in a pool of threads, yielding outcomes in the order of items.
+
+    The next item is taken from the iterable (and so built, if it is a
+    generator) while earlier calls are still in flight, keeping at most
+    ``max_workers`` calls running. Stop iterating to stop submitting more work.
+
+    :param function function: Called with each item.
+    :param iterable items: Items to process.
+    :param int max_workers: Most calls in flight at once. (Optional, default 2)
+    :return: (item, result, exception) for each item, in the order of items. One of result and exception is None.
+    :rtype: ``generator``
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append((item, executor.submit(function, item)))
+                if len(pending) >= max_workers:
+                    break
+            while pending:
+                item, future = pending.popleft()
+                for next_item in items:
+                    pending.append((next_item, executor.submit(function, next_item)))
+                    break
+                error = future.exception()
+                yield item, (None if error else future.result()), error
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+class BulkReport(object):
+    """Outcome of a bulk operation: what succeeded and what failed, and why."""
+
+    def __init__(self):
+        self.results = []
+        self.failures = []
+
+    def add(self, item, result=None, error=None):
+        """Record the outcome for an item.
+
+        :param object item: The item processed.
+        :param object result: Its result, if it succeeded.
+        :param Exception error: The exception raised, if it failed.
+        """
+        if error is None:
+            self.results.append((item, result))
+        else:
+            self.failures.append((item, error))
+
+    def has_failures(self):
+        return len(self.failures) > 0
+
+    def __len__(self):
+        return len(self.results) + len(self.failures)
+
+    def __repr__(self):
+        return '<BulkReport %d succeeded, %d failed>' % (len(self.results), len(self.failures))
+
+
+class Checkpoint(object):
+    """Thread safe record of which keys (eg emails) a bulk operation has completed, so it can be resumed.
+
+    Loaded from a path, each completed key is also appended to that file as it
+    completes, so a process that stops part way through loses no progress.
+
+    Example Usage:
+
+    checkpoint = Checkpoint.load('onboarding.checkpoint')
+    client.bulk_authorize_via_service_account(authorizations, checkpoint=checkpoint)
+    """
+
+    def __init__(self, keys=(), path=None):
+        """
+        :param iterable keys: Keys already completed. (Optional)
+        :param string path: File each newly completed key is appended to. (Optional, default None)
+        """
+        self.keys = set(keys)
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Load the keys completed so far from a file, one per line, and keep appending to it.
+
+        A missing file is treated as an empty checkpoint.
+
+        :param string path: Checkpoint file.
+        :rtype: ``Checkpoint``
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                keys = [line.rstrip('\n') for line in f if line.strip()]
+        except FileNotFoundError:
+            keys = []
+        return cls(keys, path=path)
+
+    def save(self, path):
+        """Write every completed key to a file, replacing its contents.
+
+        :param string path: Checkpoint file.
+        """
+        with self._lock:
+            keys = sorted(self.keys)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines('%s\n' % key for key in keys)
+
+    def add(self, keys):
+        """Mark keys as completed.
+
+        :param iterable keys: Completed keys.
+        """
+        with self._lock:
+            new = [key for key in keys if key not in self.keys]
+            self.keys.update(new)
+            if self.path is not None and new:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.writelines('%s\n' % key for key in new)
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def __len__(self):
+        return len(self.keys)
@@ -0,0 +1,144 @@
+from pycronofy import settings
+from pycronofy.transport import TRANSPORTS, AsyncHttpxTransport, AsyncTransport, Transport
+
+# Statuses retried when max_retries is set. 429s honour the Retry-After header.
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+# Methods retried by default. POSTs are not idempotent, so retrying one could repeat its effect.
+DEFAULT_RETRY_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+
+class Configuration(object):
+    """Settings for a single Client, so clients in one process can differ.
+
+    Values not given fall back to the module level defaults in pycronofy.settings.
+    ``settings.REQUEST_HOOK`` (set via ``pycronofy.set_request_hook``) still applies
+    to clients without their own request_hook.
+    """
+
+    def __init__(self,
+                 data_center=None,
+                 api_base_url=None,
+                 app_base_url=None,
+                 request_hook=None,
+                 default_tzid=None,
+                 timeout=None,
+                 pool_connections=10,
+                 pool_maxsize=10,
+                 max_retries=0,
+                 retry_statuses=DEFAULT_RETRY_STATUSES,
+                 retry_methods=DEFAULT_RETRY_METHODS,
+                 retry_backoff=0.5,
+                 max_retry_wait=30,
+                 instrumentation=(),
+                 transport=None,
+                 max_concurrent_streams=100,
+                 http2_connections=2,
+                 calendar_index_ttl=None):
+        """
+        :param string data_center: The name of the data_center to use. (Optional, default None)
+        :param string api_base_url: Base URL of the API, overriding data_center. (Optional, default None)
+        :param string app_base_url: Base URL for authorization links, overriding data_center. (Optional, default None)
+        :param function request_hook: Called with each response, as with pycronofy.set_request_hook. (Optional, default None)
+        :param string default_tzid: Timezone ID used by read_events/read_free_busy when none is given.
+            (Optional, default settings.DEFAULT_TIMEZONE_ID)
+        :param float timeout: Seconds to wait for the server before giving up, or a (connect, read) tuple.
+            (Optional, default None waits indefinitely)
+        :param int pool_connections: Number of connection pools (hosts) to cache. (Optional, default 10)
+        :param int pool_maxsize: Connections kept open per host. Raise when sharing a client across threads. (Optional, default 10)
+        :param int max_retries: Times to retry a request answered with one of retry_statuses. (Optional, default 0)
+        :param tuple retry_statuses: Statuses that are retried. (Optional, default 429, 502, 503 and 504)
+        :param tuple retry_methods: Request methods that are retried. Add 'POST' to also retry POSTs, which
+            may then take effect twice. (Optional, default GET, HEAD, OPTIONS, PUT and DELETE)
+        :param float retry_backoff: Seconds before the first retry, doubling for each subsequent one.
+            A Retry-After header takes precedence. (Optional, default 0.5)
+        :param float max_retry_wait: Longest wait between retries, in seconds. (Optional, default 30)
+        :param tuple instrumentation: Sinks receiving a RequestEvent per request, see pycronofy.instrumentation. (Optional)
+        :param transport: 'requests', 'urllib3', 'httpx', 'http2' or a pycronofy.transport.Transport instance
+            (AsyncTransport for AsyncRequestHandler). (Optional, default 'requests')
+        :param int max_concurrent_streams: Most requests in flight at once over HTTP/2. (Optional, default 100)
+        :param int http2_connections: Most HTTP/2 connections opened per data center. (Optional, default 2)
+        :param float calendar_index_ttl: Seconds a cached calendar listing is trusted for before create_calendar
+            and find_calendar list calendars again. (Optional, default None never expires)
+        """
+        if api_base_url:
+            self.api_base_url = api_base_url.rstrip('/')
+        elif data_center is None or data_center == 'us':
+            self.api_base_url = settings.API_BASE_URL
+        else:
+            self.api_base_url = settings.API_REGION_FORMAT % data_center
+
+        if app_base_url:
+            self.app_base_url = app_base_url.rstrip('/')
+        elif data_center is None or data_center == 'us':
+            self.app_base_url = settings.APP_BASE_URL
+        else:
+            self.app_base_url = settings.APP_REGION_FORMAT % data_center
+
+        self.data_center = data_center
+        self.request_hook = request_hook
+        self.default_tzid = default_tzid or settings.DEFAULT_TIMEZONE_ID
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.retry_backoff = retry_backoff
+        self.max_retry_wait = max_retry_wait
+        self.instrumentation = tuple(instrumentation or ())
+        self.transport = transport or 'requests'
+        if not isinstance(self.transport, (Transport, AsyncTransport)) and self.transport not in TRANSPORTS:
+            raise ValueError('Unknown transport %r, expected one of %s' % (self.transport, ', '.join(TRANSPORTS)))
+        self.max_concurrent_streams = max_concurrent_streams
+        self.http2_connections = http2_connections
+        self.calendar_index_ttl = calendar_index_ttl
+
+    @property
+    def hooks(self):
+        """Hooks passed to requests for each request.
+
+        :rtype: ``dict``
+        """
+        if self.request_hook:
+            return {'response': self.request_hook}
+        return settings.REQUEST_HOOK
+
+    def retry_wait(self, attempt, response):
+        """Seconds to wait before retrying.
+
+        :param int attempt: Number of retries already made.
+        :param Response response: The response being retried.
+        :rtype: ``float``
+        """
+        wait = self.retry_backoff * (2 ** attempt)
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                wait = float(retry_after)
+            except ValueError:
+                pass
+        return min(max(wait, 0), self.max_retry_wait)
+
+    def create_transport(self):
+        """Create the Transport a RequestHandler sends requests through.
+
+        A Transport instance given as ``transport`` is shared by every handler using this configuration.
+
+        :rtype: ``pycronofy.transport.Transport``
+        """
+        if isinstance(self.transport, Transport):
+            return self.transport
+        if isinstance(self.transport, AsyncTransport):
+            raise ValueError('An AsyncTransport can only be used by an AsyncRequestHandler')
+        return TRANSPORTS[self.transport].from_config(self)
+
+    def create_async_transport(self):
+        """Create the AsyncTransport an AsyncRequestHandler sends requests through.
+
+        :rtype: ``pycronofy.transport.AsyncTransport``
+        """
+        if isinstance(self.transport, AsyncTransport):
+            return self.transport
+        if self.transport not in ('http2', 'httpx'):
+            raise ValueError('Transport %r cannot be used asynchronously, use http2, httpx or an AsyncTransport' % (self.transport,))
+        return AsyncHttpxTransport.from_config(self)
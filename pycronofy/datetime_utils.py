@@ -1,11 +1,17 @@
 import datetime
-import pytz
+import functools
 
 from pycronofy.exceptions import PyCronofyDateTimeError
+from pycronofy.timezones import UTC, localize
 
 ISO_8601_DATE_FORMAT = '%Y-%m-%d'
 ISO_8601_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'  # UTC
 
+# Number of distinct values remembered by format_event_time and parse_event_time.
+FORMAT_CACHE_SIZE = 4096
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
 
 def format_event_time(date_time):
     """
@@ -26,21 +32,207 @@ def format_event_time(date_time):
         # Return None if passed None
         return date_time
     date_time_type = type(date_time)
-    if date_time_type in (type(''), type(u'')):
+    if date_time_type is str:
         # If passed a string, return the string.
         return date_time
-    elif date_time_type == datetime.date:
+    elif date_time_type is datetime.datetime:
+        return _format_datetime(date_time, date_time.fold)
+    elif date_time_type is datetime.date:
         # If passed a date, return an iso8601 formatted date string.
-        return date_time.strftime(ISO_8601_DATE_FORMAT)
+        return _format_date(date_time)
     elif date_time_type is dict:
         if date_time.get('time'):
             date_time['time'] = format_event_time(date_time['time'])
         return date_time
-    elif date_time_type != datetime.datetime:
-        # If passed anything other than a datetime, date, string, dict, or None, raise an Exception.
-        error_message = 'Unsupported type: ``%s``.\nSupported types: ``<datetime.datetime>``, ``<datetime.date>``, ``<dict>``, or ``<str>``.'
-        raise PyCronofyDateTimeError(
-            error_message % (repr(type(date_time))), date_time)
-    if date_time.tzinfo and date_time.tzinfo != pytz.utc:
-        date_time = date_time.astimezone(pytz.utc)
-    return date_time.strftime(ISO_8601_DATETIME_FORMAT)
+    # If passed anything other than a datetime, date, string, dict, or None, raise an Exception.
+    error_message = 'Unsupported type: ``%s``.\nSupported types: ``<datetime.datetime>``, ``<datetime.date>``, ``<dict>``, or ``<str>``.'
+    raise PyCronofyDateTimeError(
+        error_message % (repr(type(date_time))), date_time)
+
+
+def format_event_times(date_times):
+    """
+        Convert a sequence of values to ISO 8601 strings in one pass.
+
+        Accepts anything format_event_time accepts, plus a NumPy ``datetime64``
+        array (treated as UTC). Arrays are formatted by NumPy in a single call;
+        the only Python level loop left is the one building the returned list
+        (and replacing NaT with None).
+
+        :param iterable date_times: Values to convert.
+        :return: ISO 8601 formatted values, in the same order.
+        :rtype: ``list``
+    """
+    dtype = getattr(date_times, 'dtype', None)
+    if dtype is not None and dtype.kind == 'M':
+        return _format_datetime64(date_times)
+    return [format_event_time(date_time) for date_time in date_times]
+
+
+def _format_datetime64(values):
+    """Format a NumPy datetime64 array as a list of UTC ISO 8601 strings.
+
+    NaT values are returned as None.
+    """
+    import numpy
+
+    seconds = values.astype('datetime64[s]')
+    formatted = numpy.char.add(numpy.datetime_as_string(seconds, unit='s'), 'Z')
+    return [None if missing else value for value, missing in zip(formatted.tolist(), numpy.isnat(seconds).tolist())]
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_date(date):
+    """Format a date, memoized as the same boundaries recur across queries."""
+    return '%04d-%02d-%02d' % (date.year, date.month, date.day)
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_datetime(date_time, fold):
+    """Format a datetime as a UTC string, memoized on the value.
+
+    Aware datetimes in different zones hash and compare by the instant they
+    represent, so equal keys always produce the same UTC string. ``fold`` is
+    part of the key because datetimes sharing a tzinfo compare by wall time,
+    which would otherwise conflate the two sides of a DST transition.
+    """
+    offset = date_time.utcoffset()
+    if offset:
+        date_time = date_time - offset
+    return '%04d-%02d-%02dT%02d:%02d:%02dZ' % (
+        date_time.year, date_time.month, date_time.day,
+        date_time.hour, date_time.minute, date_time.second)
+
+
+def parse_event_time(value):
+    """
+        Parse an ISO 8601 value returned by Cronofy, the inverse of format_event_time.
+
+        Handles the formats in ``validation.ISO_8601_FORMATS`` (and any other
+        ``+HH:MM`` offset) without going through ``strptime``:
+
+        2016-01-31
+        2016-01-31T12:33:00Z
+        2016-01-31T12:33:00UTC
+        2016-01-31T12:33:00+00:00
+
+        :param string value: ISO 8601 ``string`` or ``dict`` with a time and tzid.
+        :return: ``datetime.date`` for dates, otherwise a UTC ``datetime.datetime``.
+            Dicts are returned as a copy with the time parsed into the dict's tzid.
+        :rtype: ``datetime.datetime``, ``datetime.date`` or ``dict``
+    """
+    if type(value) is dict:
+        parsed = value.copy()
+        if value.get('time'):
+            parsed['time'] = parse_event_time(value['time'])
+            if value.get('tzid') and type(parsed['time']) is datetime.datetime:
+                parsed['time'] = localize(parsed['time'], value['tzid'])
+        return parsed
+    if not value:
+        return value
+    year, month, day, seconds = _parse_fields(value)
+    if seconds is None:
+        return datetime.date(year, month, day)
+    return datetime.datetime(year, month, day, tzinfo=UTC) + datetime.timedelta(seconds=seconds)
+
+
+def parse_event_epoch(value):
+    """
+        Parse an ISO 8601 value returned by Cronofy into seconds since the Unix epoch.
+
+        Dates are taken as midnight UTC.
+
+        :param string value: ISO 8601 ``string`` or ``dict`` with a time and tzid.
+        :return: Seconds since 1970-01-01T00:00:00Z.
+        :rtype: ``int``
+    """
+    if type(value) is dict:
+        value = value.get('time')
+    if not value:
+        return None
+    year, month, day, seconds = _parse_fields(value)
+    days = datetime.date(year, month, day).toordinal() - EPOCH_ORDINAL
+    return days * 86400 + (seconds or 0)
+
+
+def format_event_epoch(seconds):
+    """
+        Format seconds since the Unix epoch as an ISO 8601 UTC string, the inverse of parse_event_epoch.
+
+        :param int seconds: Seconds since 1970-01-01T00:00:00Z.
+        :return: ISO 8601 formatted datetime string.
+        :rtype: ``string``
+    """
+    return format_event_time(datetime.datetime.fromtimestamp(seconds, UTC))
+
+
+def split_time_range(start, end, parts):
+    """
+        Split the range from start to end into consecutive sub-ranges of (nearly) equal length.
+
+        Ranges between two dates are split on whole days, others on whole seconds,
+        so there may be fewer than ``parts`` sub-ranges. Each sub-range starts where
+        the previous one ends. Naive datetimes are taken as UTC.
+
+        :param start: Start of the range, as a ``datetime.datetime``, ``datetime.date`` or ISO 8601 ``string``.
+        :param end: End of the range, as for start.
+        :param int parts: Number of sub-ranges wanted.
+        :return: (start, end) pairs.
+        :rtype: ``list``
+    """
+    start = parse_event_time(start) if type(start) is str else start
+    end = parse_event_time(end) if type(end) is str else end
+    if type(start) is datetime.date and type(end) is datetime.date:
+        unit = datetime.timedelta(days=1)
+    else:
+        start = _as_utc_datetime(start)
+        end = _as_utc_datetime(end)
+        unit = datetime.timedelta(seconds=1)
+    units = (end - start) // unit
+    if units <= 0:
+        return [(start, end)]
+    parts = max(1, min(parts, units))
+    bounds = [start + unit * (units * i // parts) for i in range(parts)] + [end]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _as_utc_datetime(value):
+    if type(value) is datetime.date:
+        return datetime.datetime(value.year, value.month, value.day, tzinfo=UTC)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _parse_fields(value):
+    """Split an ISO 8601 string into (year, month, day, seconds into the UTC day).
+
+    Seconds is None for dates, and may fall outside 0..86399 once an offset is
+    applied; callers add it as a delta.
+    """
+    try:
+        if value[4] != '-' or value[7] != '-':
+            raise ValueError(value)
+        year, month, day = int(value[0:4]), int(value[5:7]), int(value[8:10])
+        length = len(value)
+        if length == 10:
+            return year, month, day, None
+        if value[10] != 'T' or value[13] != ':' or value[16] != ':':
+            raise ValueError(value)
+        seconds = int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+        suffix = value[19:]
+        if suffix[:1] == '.':
+            # Fractional seconds are dropped, as format_event_time does.
+            digits = 1
+            while digits < len(suffix) and suffix[digits].isdigit():
+                digits += 1
+            suffix = suffix[digits:]
+        if suffix in ('Z', 'UTC', '+00:00', ''):
+            return year, month, day, seconds
+        if len(suffix) == 6 and suffix[0] in '+-' and suffix[3] == ':':
+            offset = int(suffix[1:3]) * 3600 + int(suffix[4:6]) * 60
+            return year, month, day, seconds - offset if suffix[0] == '+' else seconds + offset
+        raise ValueError(value)
+    except (IndexError, TypeError, ValueError):
+        raise PyCronofyDateTimeError('Unsupported ISO 8601 value: ``%s``.' % (value,), value)
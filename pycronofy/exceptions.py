@@ -3,6 +3,19 @@ class PyCronofyException(Exception):
     pass
 
 
+class PyCronofyCassetteError(PyCronofyException):
+    """Exception class for requests a replayed cassette cannot answer."""
+
+    def __init__(self, message, request):
+        """
+        :param string message: Exception message.
+        :param PreparedRequest request: The unmatched request.
+        """
+        super(PyCronofyCassetteError, self).__init__(message)
+        self.message = message
+        self.request = request
+
+
 class PyCronofyDateTimeError(PyCronofyException):
     """Exception class for datetime_utils improper argument."""
 
@@ -0,0 +1,509 @@
+"""
+A local stand-in for the Cronofy API, for load and integration testing.
+
+Serves the endpoints pycronofy calls from in-memory data, with configurable
+latency, page sizes and error injection (including 429 responses with a
+Retry-After header). Point a client at it with ``api_base_url``::
+
+    with FakeCronofyServer(page_size=50, latency=0.02) as server:
+        server.add_calendar('pro_1', 'Work', calendar_id='cal_1')
+        client = pycronofy.Client(access_token='token', api_base_url=server.url)
+        client.upsert_event('cal_1', {...})
+
+Or run it standalone: ``python -m pycronofy.fake_server --port 8080 --events 10000``
+"""
+import argparse
+import base64
+import collections
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from pycronofy.datetime_utils import format_event_epoch, format_event_time, parse_event_epoch
+
+InjectedError = collections.namedtuple('InjectedError', ('status', 'path', 'retry_after'))
+
+
+class FakeCronofyServer(object):
+    """In-memory Cronofy API served over HTTP from a background thread."""
+
+    def __init__(self, host='127.0.0.1', port=0, page_size=100, latency=0, jitter=0,
+                 error_rate=0, error_status=429, retry_after=1, seed=None):
+        """
+        :param string host: Interface to listen on. (Optional, default 127.0.0.1)
+        :param int port: Port to listen on, 0 picks a free port. (Optional, default 0)
+        :param int page_size: Items per page for events and free_busy. (Optional, default 100)
+        :param float latency: Seconds to wait before answering each request. (Optional, default 0)
+        :param float jitter: Up to this many extra seconds are added at random. (Optional, default 0)
+        :param float error_rate: Fraction of requests answered with error_status. (Optional, default 0)
+        :param int error_status: Status used for random errors. (Optional, default 429)
+        :param int retry_after: Retry-After seconds sent with 429 responses. (Optional, default 1)
+        :param int seed: Seed for latency jitter and random errors. (Optional)
+        """
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.calendars = collections.OrderedDict()
+        self.events = collections.OrderedDict()
+        self.channels = collections.OrderedDict()
+        self.request_counts = collections.Counter()
+        self._injected = collections.deque()
+        self._ids = itertools.count(1)
+        self._query_cache = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self.httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.httpd.daemon_threads = True
+        self.url = 'http://%s:%d' % (host, self.httpd.server_port)
+        self._thread = None
+
+    def start(self):
+        """Start serving in a background thread.
+
+        :return: The server.
+        :rtype: ``FakeCronofyServer``
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None and self._thread.is_alive():
+            self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def add_calendar(self, profile_id, calendar_name, calendar_id=None, **attributes):
+        """Add a calendar.
+
+        :param string profile_id: Profile the calendar belongs to.
+        :param string calendar_name: Calendar name, unique per profile.
+        :param string calendar_id: Calendar ID. (Optional, generated by default)
+        :return: The calendar.
+        :rtype: ``dict``
+        """
+        with self._lock:
+            calendar = {
+                'provider_name': 'fake',
+                'profile_id': profile_id,
+                'profile_name': profile_id,
+                'calendar_id': calendar_id or 'cal_%d' % next(self._ids),
+                'calendar_name': calendar_name,
+                'calendar_readonly': False,
+                'calendar_deleted': False,
+                'calendar_primary': False,
+                'permission_level': 'unrestricted',
+            }
+            calendar.update(attributes)
+            self.calendars[calendar['calendar_id']] = calendar
+            return calendar
+
+    def add_event(self, calendar_id, event):
+        """Add or replace an event, as upsert_event would.
+
+        Events with an event_id are managed events; others need an event_uid.
+
+        :param string calendar_id: Calendar to add the event to.
+        :param dict event: Event data, start and end may be datetimes.
+        :return: The stored event.
+        :rtype: ``dict``
+        """
+        with self._lock:
+            stored = dict(event)
+            stored['calendar_id'] = calendar_id
+            stored['start'] = format_event_time(event['start'])
+            stored['end'] = format_event_time(event['end'])
+            key = (calendar_id, stored.get('event_id') or stored.get('event_uid'))
+            previous = self.events.get(key)
+            stored.setdefault('event_uid', previous['event_uid'] if previous else 'evt_fake_%d' % next(self._ids))
+            stored.setdefault('deleted', False)
+            stored.setdefault('participation_status', 'accepted')
+            stored.setdefault('transparency', 'opaque')
+            stored.setdefault('event_status', 'confirmed')
+            stored.setdefault('created', previous['created'] if previous else _now())
+            stored['updated'] = _now()
+            self.events[key] = stored
+            self._query_cache.clear()
+            return stored
+
+    def delete_event(self, calendar_id, event_id=None, event_uid=None):
+        """Delete an event by event_id or event_uid.
+
+        :return: Whether an event was deleted.
+        :rtype: ``bool``
+        """
+        with self._lock:
+            self._query_cache.clear()
+            if event_id is not None:
+                return self.events.pop((calendar_id, event_id), None) is not None
+            for key, event in list(self.events.items()):
+                if key[0] == calendar_id and event['event_uid'] == event_uid:
+                    del self.events[key]
+                    return True
+            return False
+
+    def inject_error(self, status=429, path=None, count=1, retry_after=None):
+        """Answer the next matching request(s) with an error.
+
+        :param int status: HTTP status to respond with. (Optional, default 429)
+        :param string path: Only match requests whose path starts with this. (Optional, default any)
+        :param int count: Number of requests to fail. (Optional, default 1)
+        :param int retry_after: Retry-After seconds. (Optional, default the server's retry_after for 429s)
+        """
+        with self._lock:
+            for _ in range(count):
+                self._injected.append(InjectedError(status, path, retry_after))
+
+    def populate(self, calendars=1, events=0, start='2024-01-01T00:00:00Z'):
+        """Add synthetic calendars and hour long events spread over consecutive hours.
+
+        :param int calendars: Number of calendars to add.
+        :param int events: Number of events to add across them.
+        :param string start: Start of the first event.
+        """
+        calendar_ids = [self.add_calendar('pro_fake', 'Calendar %d' % i)['calendar_id'] for i in range(calendars)]
+        first = parse_event_epoch(start)
+        for i in range(events):
+            self.add_event(calendar_ids[i % calendars], {
+                'event_id': 'evt_%d' % i,
+                'summary': 'Event %d' % i,
+                'start': format_event_epoch(first + 3600 * i),
+                'end': format_event_epoch(first + 3600 * (i + 1)),
+            })
+
+    # Request handling
+
+    def handle(self, method, path, query, body):
+        """Produce a response for a request.
+
+        :return: (status, headers, body) where body is json serializable or None.
+        :rtype: ``tuple``
+        """
+        with self._lock:
+            self.request_counts[(method, path)] += 1
+        delay = self.latency + (self.random.random() * self.jitter if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        error = self._take_error(path)
+        if error:
+            headers = {}
+            if error.status == 429:
+                headers['Retry-After'] = str(error.retry_after if error.retry_after is not None else self.retry_after)
+            return error.status, headers, {'errors': {'base': [{'key': 'errors.injected', 'description': 'Injected error'}]}}
+
+        return self._route(method, path, query, body)
+
+    def _route(self, method, path, query, body):
+        segments = path.strip('/').split('/')
+        if segments[0] == 'oauth':
+            return self._oauth(segments, body)
+        if segments[0] != 'v1':
+            return 404, {}, None
+        handler = getattr(self, '_%s_%s' % (method.lower(), segments[1] if len(segments) > 1 else ''), None)
+        if handler is None:
+            return 404, {}, None
+        with self._lock:
+            return handler(segments[2:], query, body)
+
+    def _take_error(self, path):
+        with self._lock:
+            for error in self._injected:
+                if error.path is None or path.startswith(error.path):
+                    self._injected.remove(error)
+                    return error
+        if self.error_rate and self.random.random() < self.error_rate:
+            return InjectedError(self.error_status, None, None)
+        return None
+
+    def _oauth(self, segments, body):
+        if segments[1:] == ['token', 'revoke']:
+            return 200, {}, None
+        token = next(self._ids)
+        return 200, {}, {
+            'token_type': 'bearer',
+            'access_token': 'fake_access_%d' % token,
+            'refresh_token': 'fake_refresh_%d' % token,
+            'expires_in': 3600,
+            'scope': 'read_write',
+        }
+
+    def _get_account(self, segments, query, body):
+        return 200, {}, {'account': {'account_id': 'acc_fake', 'email': 'fake@example.com', 'name': 'Fake', 'default_tzid': 'Etc/UTC'}}
+
+    def _get_userinfo(self, segments, query, body):
+        return 200, {}, {'sub': 'acc_fake', 'cronofy.type': 'account'}
+
+    def _get_profiles(self, segments, query, body):
+        profile_ids = sorted(set(calendar['profile_id'] for calendar in self.calendars.values()))
+        return 200, {}, {'profiles': [
+            {'provider_name': 'fake', 'profile_id': profile_id, 'profile_name': profile_id, 'profile_connected': True}
+            for profile_id in profile_ids
+        ]}
+
+    def _get_calendars(self, segments, query, body):
+        return 200, {}, {'calendars': list(self.calendars.values())}
+
+    def _post_calendars(self, segments, query, body):
+        if not segments:
+            for calendar in self.calendars.values():
+                if calendar['profile_id'] == body.get('profile_id') and calendar['calendar_name'] == body.get('name'):
+                    return 422, {}, {'errors': {'name': [{
+                        'key': 'errors.duplicate_calendar_name',
+                        'description': 'A calendar with this name already exists and the provider does not allow duplicates',
+                    }]}}
+            return 200, {}, {'calendar': self.add_calendar(body.get('profile_id'), body.get('name'))}
+        calendar_id = segments[0]
+        if calendar_id not in self.calendars:
+            return 404, {}, None
+        if segments[1:] == ['events']:
+            missing = [field for field in ('start', 'end') if not body.get(field)]
+            if not body.get('event_id') and not body.get('event_uid'):
+                missing.append('event_id')
+            if missing:
+                return 422, {}, {'errors': dict((field, [{'key': 'errors.required'}]) for field in missing)}
+            self.add_event(calendar_id, body)
+            return 202, {}, None
+        if len(segments) == 4 and segments[3] == 'participation_status':
+            for event in self.events.values():
+                if event['calendar_id'] == calendar_id and event['event_uid'] == segments[2]:
+                    event['participation_status'] = body['status']
+                    self._query_cache.clear()
+                    return 202, {}, None
+            return 404, {}, None
+        return 404, {}, None
+
+    def _delete_calendars(self, segments, query, body):
+        if segments[1:] != ['events']:
+            return 404, {}, None
+        self.delete_event(segments[0], event_id=body.get('event_id'), event_uid=body.get('event_uid'))
+        return 202, {}, None
+
+    def _delete_events(self, segments, query, body):
+        calendar_ids = query.get('calendar_ids[]')
+        for key, event in list(self.events.items()):
+            if 'event_id' in event and (not calendar_ids or key[0] in calendar_ids):
+                del self.events[key]
+        self._query_cache.clear()
+        return 202, {}, None
+
+    def _get_events(self, segments, query, body):
+        return self._page('events', segments, query)
+
+    def _get_free_busy(self, segments, query, body):
+        return self._page('free_busy', segments, query)
+
+    def _page(self, data_type, segments, query):
+        if segments[:1] == ['pages']:
+            state = json.loads(base64.urlsafe_b64decode(segments[1].encode()).decode())
+            query, offset = state['query'], state['offset']
+        else:
+            query, offset = dict((key, values) for key, values in query.items()), 0
+        items = self._query_events(query, data_type)
+        total = max(1, (len(items) + self.page_size - 1) // self.page_size)
+        current = offset // self.page_size + 1
+        pages = {'current': current, 'total': total}
+        if current < total:
+            token = base64.urlsafe_b64encode(json.dumps({'query': query, 'offset': offset + self.page_size}).encode()).decode()
+            pages['next_page'] = '%s/v1/%s/pages/%s' % (self.url, data_type, token)
+        return 200, {}, {'pages': pages, data_type: items[offset:offset + self.page_size]}
+
+    def _query_events(self, query, data_type):
+        # Following pages repeat the first page's query, so keep recent results
+        # until the events change.
+        key = (data_type, json.dumps(query, sort_keys=True))
+        if key not in self._query_cache:
+            items = self._filter_events(query)
+            if data_type == 'free_busy':
+                items = [_free_busy_block(event) for event in items if not event.get('deleted')]
+            self._query_cache[key] = items
+            if len(self._query_cache) > 32:
+                self._query_cache.popitem(last=False)
+        return self._query_cache[key]
+
+    def _filter_events(self, query):
+        calendar_ids = query.get('calendar_ids[]')
+        start = parse_event_epoch(query['from'][0]) if query.get('from') else None
+        end = parse_event_epoch(query['to'][0]) if query.get('to') else None
+        only_managed = query.get('only_managed', ['False'])[0] == 'True'
+        include_managed = query.get('include_managed', ['True'])[0] == 'True'
+        include_deleted = query.get('include_deleted', ['False'])[0] == 'True'
+        results = []
+        for (calendar_id, _), event in self.events.items():
+            if calendar_ids and calendar_id not in calendar_ids:
+                continue
+            managed = 'event_id' in event
+            if (only_managed and not managed) or (managed and not include_managed):
+                continue
+            if event.get('deleted') and not include_deleted:
+                continue
+            if start is not None and parse_event_epoch(event['end']) <= start:
+                continue
+            if end is not None and parse_event_epoch(event['start']) >= end:
+                continue
+            results.append(event)
+        return results
+
+    def _post_batch(self, segments, query, body):
+        responses = []
+        for entry in body.get('batch', ()):
+            path = urlsplit(entry['relative_url']).path
+            status, _, data = self._route(entry['method'], path, {}, entry.get('data') or {})
+            response = {'status': status}
+            if data is not None:
+                response['data'] = data
+            responses.append(response)
+        return 207, {}, {'batch': responses}
+
+    def _post_availability(self, segments, query, body):
+        # Every participant shares one calendar here: any busy event blocks time for
+        # all of them, and each period lists every requested sub as available.
+        duration = 60 * _minutes(body.get('required_duration'), 60)
+        interval = 60 * _minutes(body.get('start_interval'), duration // 60)
+        participants = [
+            {'sub': member['sub']}
+            for group in body.get('participants', ())
+            for member in group.get('members', ())
+            if 'sub' in member
+        ]
+        busy = sorted(
+            (parse_event_epoch(event['start']), parse_event_epoch(event['end']))
+            for event in self.events.values()
+            if not event.get('deleted') and event.get('transparency') != 'transparent'
+        )
+        periods = []
+        for period in body.get('available_periods', ()):
+            start, end = parse_event_epoch(period['start']), parse_event_epoch(period['end'])
+            for busy_start, busy_end in busy:
+                if busy_end <= start or busy_start >= end:
+                    continue
+                if busy_start - start >= duration:
+                    periods.append((start, busy_start))
+                start = max(start, busy_end)
+            if end - start >= duration:
+                periods.append((start, end))
+
+        response_format = body.get('response_format', 'periods')
+        if response_format in ('slots', 'overlapping_slots'):
+            step = interval if response_format == 'overlapping_slots' else max(interval, duration)
+            periods = [(slot, slot + duration) for start, end in periods for slot in range(start, end - duration + 1, step)]
+            element = 'available_slots'
+        else:
+            element = 'available_periods'
+        if body.get('max_results'):
+            periods = periods[:body['max_results']]
+        return 200, {}, {element: [
+            {'start': format_event_epoch(start), 'end': format_event_epoch(end), 'participants': participants}
+            for start, end in periods
+        ]}
+
+    def _get_channels(self, segments, query, body):
+        return 200, {}, {'channels': list(self.channels.values())}
+
+    def _post_channels(self, segments, query, body):
+        channel = {
+            'channel_id': 'chn_%d' % next(self._ids),
+            'callback_url': body.get('callback_url'),
+            'filters': body.get('filters', {}),
+        }
+        self.channels[channel['channel_id']] = channel
+        return 200, {}, {'channel': channel}
+
+    def _delete_channels(self, segments, query, body):
+        if self.channels.pop(segments[0] if segments else None, None) is None:
+            return 404, {}, None
+        return 202, {}, None
+
+
+def _handler_for(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _dispatch(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+            if 'Authorization' not in self.headers and not self.path.startswith('/oauth'):
+                status, headers, body = 401, {}, None
+            else:
+                parts = urlsplit(self.path)
+                try:
+                    data = json.loads(raw) if raw else {}
+                except ValueError:
+                    data = {}
+                status, headers, body = server.handle(self.command, parts.path, parse_qs(parts.query), data)
+            payload = json.dumps(body).encode() if body is not None else b''
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_DELETE = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def _free_busy_block(event):
+    status = 'free' if event.get('transparency') == 'transparent' else 'busy'
+    if event.get('participation_status') == 'tentative':
+        status = 'tentative'
+    return {'calendar_id': event['calendar_id'], 'start': event['start'], 'end': event['end'], 'free_busy_status': status}
+
+
+def _minutes(duration, default):
+    if isinstance(duration, dict):
+        return duration.get('minutes', default)
+    if isinstance(duration, int):
+        return duration
+    return default
+
+
+def _now():
+    return format_event_epoch(time.time())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycronofy.fake_server', description='Run a local stand-in for the Cronofy API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0, help='Up to this many random extra seconds per response')
+    parser.add_argument('--error-rate', type=float, default=0, help='Fraction of requests answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=429)
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--calendars', type=int, default=1, help='Synthetic calendars to create')
+    parser.add_argument('--events', type=int, default=0, help='Synthetic events to create')
+    args = parser.parse_args(argv)
+
+    server = FakeCronofyServer(args.host, args.port, page_size=args.page_size, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, error_status=args.error_status, retry_after=args.retry_after)
+    server.populate(calendars=args.calendars, events=args.events)
+    print('Serving fake Cronofy API at %s' % server.url)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
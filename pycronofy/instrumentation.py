@@ -0,0 +1,217 @@
+import bisect
+import hashlib
+import threading
+from urllib.parse import urlsplit
+
+from pycronofy import settings
+
+# Path segments that hold an ID when they follow one of these segments...
+ID_PARENTS = frozenset((
+    'availability_rules', 'calendars', 'channels', 'events', 'pages', 'profiles',
+    'real_time_scheduling', 'smart_invites',
+))
+
+# ...unless they are one of these fixed names.
+LITERAL_SEGMENTS = frozenset(('disable', 'events', 'pages', 'participation_status', 'revoke'))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def endpoint_template(endpoint='', url=''):
+    """Reduce an endpoint (or full URL) to a low-cardinality template.
+
+    eg: 'calendars/cal_123/events' -> 'calendars/{id}/events'
+
+    :param string endpoint: Endpoint as passed to RequestHandler. (Optional)
+    :param string url: Full URL, used when endpoint is empty. (Optional)
+    :rtype: ``string``
+    """
+    if not endpoint:
+        endpoint = urlsplit(url).path.strip('/')
+        prefix = settings.API_VERSION + '/'
+        if endpoint.startswith(prefix):
+            endpoint = endpoint[len(prefix):]
+    segments = endpoint.strip('/').split('/')
+    for i in range(1, len(segments)):
+        if segments[i - 1] in ID_PARENTS and segments[i] not in LITERAL_SEGMENTS:
+            segments[i] = '{id}'
+    return '/'.join(segments)
+
+
+def token_hash(authorization):
+    """Short, stable identifier for the credential used, without exposing it.
+
+    :param string authorization: Authorization header value.
+    :rtype: ``string``
+    """
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()[:12]
+
+
+class RequestEvent(object):
+    """Details of a single request, passed to each instrumentation sink."""
+    __slots__ = ('method', 'endpoint', 'url', 'status', 'started', 'latency', 'server_latency',
+                 'request_bytes', 'response_bytes', 'retries', 'token_hash', 'error')
+
+    def __init__(self, method, endpoint, url, status=None, started=None, latency=None, server_latency=None,
+                 request_bytes=0, response_bytes=0, retries=0, token_hash=None, error=None):
+        """
+        :param string method: HTTP method, upper case.
+        :param string endpoint: Endpoint template, eg 'calendars/{id}/events'.
+        :param string url: Full request URL.
+        :param int status: Response status, None if no response was received.
+        :param float started: time.time() when the request started.
+        :param float latency: Seconds from sending the request to having the full response.
+        :param float server_latency: Seconds until the response headers were received.
+        :param int request_bytes: Size of the request body.
+        :param int response_bytes: Size of the response body.
+        :param int retries: Number of times the request was retried.
+        :param string token_hash: Hash identifying the credential used.
+        :param Exception error: Exception raised, if any.
+        """
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.status = status
+        self.started = started
+        self.latency = latency
+        self.server_latency = server_latency
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.retries = retries
+        self.token_hash = token_hash
+        self.error = error
+
+    @property
+    def transfer_latency(self):
+        """Seconds spent after the headers arrived: reading the body and running hooks."""
+        if self.latency is None or self.server_latency is None:
+            return None
+        return max(0.0, self.latency - self.server_latency)
+
+    def __repr__(self):
+        return '<RequestEvent %s %s %s %.3fs>' % (self.method, self.endpoint, self.status, self.latency or 0)
+
+
+def emit(sinks, event):
+    """Pass an event to each sink. Sinks have an ``emit(event)`` method or are callables."""
+    for sink in sinks:
+        if hasattr(sink, 'emit'):
+            sink.emit(event)
+        else:
+            sink(event)
+
+
+class MetricsRegistry(object):
+    """In-process Prometheus-style counters and latency histograms.
+
+    Labelled by method, endpoint template and status. ``render()`` returns the
+    Prometheus text exposition format so it can be served from a metrics endpoint.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='cronofy'):
+        """
+        :param tuple buckets: Upper bounds, in seconds, of the latency histogram buckets.
+        :param string prefix: Metric name prefix.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self.requests = {}
+        self.request_bytes = {}
+        self.response_bytes = {}
+        self.retries = {}
+        self.latency = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        counter_labels = (event.method, event.endpoint, str(event.status) if event.status else 'error')
+        latency_labels = (event.method, event.endpoint)
+        with self._lock:
+            self.requests[counter_labels] = self.requests.get(counter_labels, 0) + 1
+            self.request_bytes[latency_labels] = self.request_bytes.get(latency_labels, 0) + event.request_bytes
+            self.response_bytes[latency_labels] = self.response_bytes.get(latency_labels, 0) + event.response_bytes
+            if event.retries:
+                self.retries[latency_labels] = self.retries.get(latency_labels, 0) + event.retries
+            if event.latency is not None:
+                histogram = self.latency.get(latency_labels)
+                if histogram is None:
+                    histogram = self.latency[latency_labels] = [[0] * (len(self.buckets) + 1), 0.0]
+                histogram[0][bisect.bisect_left(self.buckets, event.latency)] += 1
+                histogram[1] += event.latency
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format.
+
+        :rtype: ``string``
+        """
+        lines = []
+        with self._lock:
+            self._render_counter(lines, 'requests_total', 'Requests made to the Cronofy API.',
+                                 ('method', 'endpoint', 'status'), self.requests)
+            self._render_counter(lines, 'request_bytes_total', 'Bytes sent in request bodies.',
+                                 ('method', 'endpoint'), self.request_bytes)
+            self._render_counter(lines, 'response_bytes_total', 'Bytes received in response bodies.',
+                                 ('method', 'endpoint'), self.response_bytes)
+            self._render_counter(lines, 'request_retries_total', 'Requests retried.',
+                                 ('method', 'endpoint'), self.retries)
+            name = '%s_request_duration_seconds' % self.prefix
+            lines.append('# HELP %s Time taken by requests to the Cronofy API.' % name)
+            lines.append('# TYPE %s histogram' % name)
+            for labels, (counts, total) in sorted(self.latency.items()):
+                label_text = _labels(('method', 'endpoint'), labels)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append('%s_bucket{%s,le="%s"} %d' % (name, label_text, le, cumulative))
+                lines.append('%s_sum{%s} %r' % (name, label_text, total))
+                lines.append('%s_count{%s} %d' % (name, label_text, cumulative))
+        return '\n'.join(lines) + '\n'
+
+    def _render_counter(self, lines, suffix, help_text, label_names, values):
+        name = '%s_%s' % (self.prefix, suffix)
+        lines.append('# HELP %s %s' % (name, help_text))
+        lines.append('# TYPE %s counter' % name)
+        for labels, value in sorted(values.items()):
+            lines.append('%s{%s} %d' % (name, _labels(label_names, labels), value))
+
+
+class OpenTelemetrySink(object):
+    """Record each request as an OpenTelemetry client span.
+
+    Requires the ``opentelemetry-api`` package.
+    """
+
+    def __init__(self, tracer=None):
+        """
+        :param Tracer tracer: Tracer to create spans with. (Optional, default the global 'pycronofy' tracer)
+        """
+        if tracer is None:
+            from opentelemetry import trace
+            tracer = trace.get_tracer('pycronofy')
+        self.tracer = tracer
+
+    def emit(self, event):
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        start = int(event.started * 1e9)
+        span = self.tracer.start_span('%s %s' % (event.method, event.endpoint), kind=SpanKind.CLIENT, start_time=start)
+        span.set_attribute('http.request.method', event.method)
+        span.set_attribute('url.full', event.url)
+        span.set_attribute('url.template', event.endpoint)
+        span.set_attribute('http.request.body.size', event.request_bytes)
+        span.set_attribute('http.response.body.size', event.response_bytes)
+        span.set_attribute('http.request.resend_count', event.retries)
+        if event.token_hash:
+            span.set_attribute('cronofy.token_hash', event.token_hash)
+        if event.status is not None:
+            span.set_attribute('http.response.status_code', event.status)
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(Status(StatusCode.ERROR))
+        span.end(end_time=start + int((event.latency or 0) * 1e9))
+
+
+def _labels(names, values):
+    return ','.join('%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in zip(names, values))
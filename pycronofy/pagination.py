@@ -1,3 +1,17 @@
+import threading
+
+from pycronofy.concurrency import run_pipelined
+from pycronofy.datetime_utils import parse_event_epoch, parse_event_time
+
+# Fields converted when a parse_times mode is requested.
+TIME_FIELDS = ('start', 'end', 'created', 'updated')
+
+TIME_PARSERS = {
+    'datetime': parse_event_time,
+    'epoch': parse_event_epoch,
+}
+
+
 class Pages(object):
     """Get paged data from Cronofy.
     Optionally iterate through all data (automatically fetching pages) or manually list and paginate.
@@ -5,12 +19,20 @@ class Pages(object):
     Example data: {'pages': {u'current': 1, u'next_page': u'https://api.cronofy.com/v1/events/pages/[blah blah]', u'total': 2},}
     """
 
-    def __init__(self, request_handler, data, data_type, automatic_pagination=True):
+    def __init__(self, request_handler, data, data_type, automatic_pagination=True, parse_times=None, record_class=None,
+                 prefetch=False):
         """
         :param RequestHandler request_handler: RequestHandler (for fetching subsequent pages)
         :param dict data: Dictionary containing json response from cronofy.
         :param string data_type: Type of paged data being retrieved (eg: 'events')
         :param bool automatic_pagination: Default True. During iteration automatically move to the next page.
+        :param string parse_times: 'datetime' or 'epoch' to convert start, end, created and updated
+            when they are first accessed. (Optional, default None leaves the strings as returned)
+        :param class record_class: Record subclass (see pycronofy.records) to build for each item
+            instead of keeping the raw dicts. Time fields are parsed up front when combined with parse_times. (Optional)
+        :param bool prefetch: Fetch the next page in the background while this one is being iterated over
+            with automatic_pagination. Each page's URL comes from the previous page, so at most one page is
+            fetched ahead. (Optional, default False)
         """
         self.request_handler = request_handler
         self.current = data['pages']['current']
@@ -19,10 +41,21 @@ class Pages(object):
         if 'next_page' in data['pages']:
             self.next_page_url = data['pages']['next_page']
         self.data_type = data_type
+        self.parse_times = parse_times
+        self.record_class = record_class
+        if parse_times and parse_times not in TIME_PARSERS:
+            raise ValueError('Unknown parse_times %r, expected one of %s' % (parse_times, ', '.join(sorted(TIME_PARSERS))))
+        parser = TIME_PARSERS[parse_times] if parse_times else None
+        if record_class:
+            data[data_type] = [record_class(item, parser) for item in data[data_type]]
+        elif parser:
+            data[data_type] = [ParsedItem(item, parser) for item in data[data_type]]
         self.data = data
         self.index = 0
         self.length = len(self.data[data_type])
         self.automatic_pagination = automatic_pagination
+        self.prefetch = prefetch
+        self._prefetched = None
 
     def all(self):
         """Return all results as a list by automatically fetching all pages.
@@ -46,9 +79,17 @@ class Pages(object):
 
     def fetch_next_page(self):
         """Retrieves the next page of data and refreshes Pages instance."""
-        result = self.request_handler.get(url=self.next_page_url).json()
+        if self._prefetched is not None and self._prefetched.url == self.next_page_url:
+            result = self._prefetched.result()
+        else:
+            result = self.request_handler.get(url=self.next_page_url).json()
         self.__init__(self.request_handler, result,
-                      self.data_type, self.automatic_pagination)
+                      self.data_type, self.automatic_pagination, self.parse_times, self.record_class, self.prefetch)
+
+    def _start_prefetch(self):
+        """Start fetching the next page in the background, if there is one and it is not already being fetched."""
+        if self._prefetched is None and self.next_page_url and self.current < self.total:
+            self._prefetched = PageFetch(self.request_handler, self.next_page_url)
 
     def json(self):
         """Get the raw json data of the response
@@ -98,6 +139,8 @@ class Pages(object):
         :return: The next item in the data set.
         :rtype: ``dict``
         """
+        if self.index == 0 and self.prefetch and self.automatic_pagination:
+            self._start_prefetch()
         if self.index < self.length:
             self.index += 1
             return self.data[self.data_type][self.index - 1]
@@ -115,3 +158,184 @@ class Pages(object):
         :param dict value: Value to replace the item at index with.
         """
         self.data[self.data_type][idx] = value
+
+
+class ShardedPages(object):
+    """Paged data read over consecutive time windows at once, merged back into one sequence.
+
+    Every window's pages are fetched concurrently. Items are yielded window by
+    window, in order, skipping items already yielded by the previous window
+    (those spanning the boundary between them).
+    """
+
+    def __init__(self, fetch, windows, key, max_workers=None):
+        """
+        :param function fetch: Called with a window's start and end, returns its Pages.
+        :param list windows: (start, end) pairs, eg from pycronofy.datetime_utils.split_time_range.
+        :param function key: Called with an item, returns what identifies it across windows.
+        :param int max_workers: Most windows fetched at once. (Optional, default all of them)
+        """
+        self.fetch = fetch
+        self.windows = windows
+        self.key = key
+        self.max_workers = max_workers or len(windows)
+
+    def all(self):
+        """Return all results as a list by fetching every window.
+
+        :return: All results.
+        :rtype: ``list``
+        """
+        return list(self)
+
+    def __iter__(self):
+        previous = set()
+        for _, items, error in run_pipelined(self._fetch_all, self.windows, self.max_workers):
+            if error is not None:
+                raise error
+            current = set()
+            for item in items:
+                key = self.key(item)
+                current.add(key)
+                if key not in previous:
+                    yield item
+            previous = current
+
+    def _fetch_all(self, window):
+        return self.fetch(*window).all()
+
+
+class PageFetch(object):
+    """A page being fetched on a background thread."""
+
+    def __init__(self, request_handler, url):
+        """
+        :param RequestHandler request_handler: RequestHandler to fetch the page with.
+        :param string url: URL of the page.
+        """
+        self.request_handler = request_handler
+        self.url = url
+        self._data = None
+        self._error = None
+        self._thread = threading.Thread(target=self._fetch, daemon=True)
+        self._thread.start()
+
+    def result(self):
+        """Wait for the page.
+
+        :return: Response json.
+        :rtype: ``dict``
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._data
+
+    def _fetch(self):
+        try:
+            self._data = self.request_handler.get(url=self.url).json()
+        except Exception as e:
+            self._error = e
+
+
+class ParsedItem(dict):
+    """A paged item whose time fields are parsed the first time they are read.
+
+    Operations on the item as a whole (``==``, ``copy()``, ``dict(item)``,
+    ``items()``, ``values()``, ``pop()`` and so on) parse any fields not yet
+    read first, so an item behaves the same whichever of its fields have been
+    read before. A field whose value fails to parse is left pending, so every
+    read of it raises rather than returning the unparsed string.
+    """
+    __slots__ = ('_parser', '_pending')
+
+    def __init__(self, data, parser):
+        """
+        :param dict data: Item as returned by cronofy.
+        :param function parser: Converts a single time value.
+        """
+        super(ParsedItem, self).__init__(data)
+        self._parser = parser
+        self._pending = [field for field in TIME_FIELDS if field in data]
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key in self._pending:
+            value = self._parser(value)
+            dict.__setitem__(self, key, value)
+            self._pending.remove(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._pending:
+            self._pending.remove(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        if key in self._pending:
+            self._pending.remove(key)
+
+    def __reduce__(self):
+        # Rebuilt through __init__ from the raw storage, so unpickling does not set items before the slots exist,
+        # with the fields still to be parsed restored afterwards.
+        return (ParsedItem, (dict(dict.items(self)), self._parser), (None, {'_pending': list(self._pending)}))
+
+    def __iter__(self):
+        # Defined so that dict(item) reads values through __getitem__ rather than
+        # copying the raw storage.
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self._parse_pending()
+        if isinstance(other, ParsedItem):
+            other._parse_pending()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def copy(self):
+        self._parse_pending()
+        return dict(self)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            dict.__delitem__(self, key)
+            return value
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._parse_pending()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def items(self):
+        self._parse_pending()
+        return dict.items(self)
+
+    def values(self):
+        self._parse_pending()
+        return dict.values(self)
+
+    def _parse_pending(self):
+        for field in list(self._pending):
+            self[field]
@@ -0,0 +1,146 @@
+import sys
+
+
+# Returned for fields that were absent, as distinct from fields that were null.
+_MISSING = object()
+
+
+class Record(object):
+    """Compact, read-only view of an item returned by Cronofy.
+
+    Known fields are held in ``__slots__`` rather than a per-item dict, and
+    enum-like values (statuses, calendar ids) are interned so every record
+    shares the same string objects. Any fields without a slot are kept in
+    ``extra``. Records support ``record['field']``, ``record.get('field')`` and
+    ``'field' in record`` like the dicts they replace, and ``to_dict()`` returns
+    the original shape: fields returned as null are kept, absent fields are not.
+    Reading an absent field as an attribute gives None. Attributes cannot be set.
+    """
+    __slots__ = ('extra',)
+
+    fields = ()
+    interned_fields = ()
+    time_fields = ()
+    _field_set = frozenset()
+
+    def __init__(self, data, parser=None):
+        """
+        :param dict data: Item as returned by cronofy.
+        :param function parser: Converts time fields (see pagination.TIME_PARSERS). (Optional, default None)
+        """
+        set_field = object.__setattr__
+        for field in self.fields:
+            if field in data:
+                set_field(self, field, data[field])
+        for field in self.interned_fields:
+            value = data.get(field)
+            if type(value) is str:
+                set_field(self, field, sys.intern(value))
+        if parser:
+            for field in self.time_fields:
+                value = data.get(field)
+                if value is not None:
+                    set_field(self, field, parser(value))
+        field_set = self._field_set
+        set_field(self, 'extra', {key: value for key, value in data.items() if key not in field_set} or None)
+
+    def __init_subclass__(cls, **kwargs):
+        super(Record, cls).__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.fields)
+
+    def get(self, key, default=None):
+        """Get a field by name, as with ``dict.get``.
+
+        :param string key: Field name.
+        :param object default: Returned if the field is absent.
+        """
+        if key in self._field_set:
+            value = self._value(key)
+            return default if value is _MISSING else value
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def to_dict(self):
+        """Return the record as a dict in the shape returned by cronofy.
+
+        Fields that were absent are omitted; fields that were null are None.
+
+        :rtype: ``dict``
+        """
+        result = {}
+        for field in self.fields:
+            value = self._value(field)
+            if value is not _MISSING:
+                result[field] = value
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def _value(self, field):
+        # Reads the slot directly, bypassing __getattr__, so absent fields can be told apart from nulls.
+        try:
+            return object.__getattribute__(self, field)
+        except AttributeError:
+            return _MISSING
+
+    def __getattr__(self, name):
+        # Only called for unset slots, ie fields that were absent.
+        if name in self._field_set:
+            return None
+        raise AttributeError('%r object has no attribute %r' % (type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('%s records are read-only' % type(self).__name__)
+
+    def __delattr__(self, name):
+        raise AttributeError('%s records are read-only' % type(self).__name__)
+
+    def __reduce__(self):
+        # Attributes cannot be set, so copies and pickles are rebuilt from the fields.
+        return type(self), (self.to_dict(),)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.to_dict())
+
+
+class Event(Record):
+    """An event from ``Client.read_events``."""
+    fields = (
+        'calendar_id', 'event_uid', 'event_id', 'summary', 'description', 'start', 'end',
+        'deleted', 'created', 'updated', 'location', 'geo', 'participation_status',
+        'attendees', 'organizer', 'transparency', 'status', 'event_status', 'categories',
+        'recurring', 'series_identifier', 'event_private', 'options', 'meeting_url',
+        'conferencing', 'color', 'tzid',
+    )
+    interned_fields = ('calendar_id', 'participation_status', 'transparency', 'status', 'event_status', 'tzid')
+    time_fields = ('start', 'end', 'created', 'updated')
+    __slots__ = fields
+
+
+class FreeBusyBlock(Record):
+    """A free/busy block from ``Client.read_free_busy``."""
+    fields = ('calendar_id', 'start', 'end', 'free_busy_status')
+    interned_fields = ('calendar_id', 'free_busy_status')
+    time_fields = ('start', 'end')
+    __slots__ = fields
+
+
+RECORD_CLASSES = {
+    'events': Event,
+    'free_busy': FreeBusyBlock,
+}
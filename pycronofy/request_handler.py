@@ -1,22 +1,60 @@
-import requests
+import threading
+import time
+
 import pycronofy
 from pycronofy import settings
+from pycronofy.config import Configuration
 from pycronofy.exceptions import PyCronofyRequestError
 
 
 class RequestHandler(object):
     """Wrap all request handling."""
 
-    def __init__(self, auth, data_center=None):
+    def __init__(self, auth, data_center=None, api_base_url=None, instrumentation=(), config=None):
         """
         :param Auth auth: Auth instance.
+        :param string data_center: The name of the data_center to use. Ignored if config is given. (Optional, default None)
+        :param string api_base_url: Base URL of the API, overriding data_center. Ignored if config is given. (Optional, default None)
+        :param tuple instrumentation: Sinks receiving a RequestEvent per request, see pycronofy.instrumentation.
+            Ignored if config is given. (Optional)
+        :param Configuration config: Settings for this handler. (Optional, default built from the other arguments)
         """
+        if config is None:
+            config = Configuration(data_center=data_center, api_base_url=api_base_url, instrumentation=instrumentation)
         self.auth = auth
+        self.config = config
+        self.base_url = config.api_base_url
+        self.instrumentation = config.instrumentation
+        self._transport = None
+        self._transport_lock = threading.Lock()
         self.user_agent = '%s %s' % (pycronofy.__name__, pycronofy.__version__)
-        if data_center is None or data_center == 'us':
-            self.base_url = settings.API_BASE_URL
-        else:
-            self.base_url = settings.API_REGION_FORMAT % data_center
+
+    @property
+    def transport(self):
+        """The Transport requests are sent through, created on first use so that
+        clients only used for eg webhook verification never load an HTTP library.
+
+        :rtype: ``pycronofy.transport.Transport``
+        """
+        if self._transport is None:
+            with self._transport_lock:
+                if self._transport is None:
+                    self._transport = self.config.create_transport()
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport):
+        """Replace the Transport, eg to record or replay requests with pycronofy.cassette."""
+        with self._transport_lock:
+            self._transport = transport
+
+    @property
+    def session(self):
+        """The requests Session used by a RequestsTransport.
+
+        :rtype: ``requests.Session``
+        """
+        return self.transport.session
 
     def get(self, endpoint='', url='', params=None, use_api_key=False):
         """Perform a get for a json API endpoint.
@@ -41,18 +79,19 @@ class RequestHandler(object):
         """
         return self._request('delete', endpoint, url, params=params, data=data)
 
-    def post(self, endpoint='', url='', data=None, use_api_key=False, omit_api_version=False):
+    def post(self, endpoint='', url='', data=None, use_api_key=False, omit_api_version=False, body=None):
         """Perform a post to an API endpoint.
 
         :param string endpoint: Target endpoint. (Optional).
         :param string url: Override the endpoint and provide the full url (eg for pagination). (Optional).
         :param dict data: Data to pass to the post. (Optional).
+        :param bytes body: Already json encoded data to post instead of data. (Optional).
         :return: Response.
         :rtype: ``Response``
         """
-        return self._request('post', endpoint, url, data=data, use_api_key=use_api_key, omit_api_version=omit_api_version)
+        return self._request('post', endpoint, url, data=data, use_api_key=use_api_key, omit_api_version=omit_api_version, body=body)
 
-    def _request(self, request_method, endpoint='', url='', data=None, params=None, use_api_key=False, omit_api_version=False):
+    def _request(self, request_method, endpoint='', url='', data=None, params=None, use_api_key=False, omit_api_version=False, body=None):
         """Perform a http request via the specified method to an API endpoint.
 
         :param string request_method: Request method.
@@ -60,6 +99,7 @@ class RequestHandler(object):
         :param string url: Override the endpoint and provide the full url (eg for pagination). (Optional).
         :param dict params: Provide parameters to pass to the request. (Optional).
         :param dict data: Data to pass to the post. (Optional).
+        :param bytes body: Already json encoded data, sent instead of data. (Optional).
         :return: Response
         :rtype: ``Response``
         """
@@ -67,6 +107,49 @@ class RequestHandler(object):
             data = {}
         if not params:
             params = {}
+        url, headers = self._prepare(endpoint, url, use_api_key, omit_api_version)
+
+        config = self.config
+        started = time.time()
+        start = time.perf_counter()
+        response = None
+        retries = 0
+        max_retries = config.max_retries if request_method.upper() in config.retry_methods else 0
+        try:
+            while True:
+                response = self.transport.send(
+                    request_method,
+                    url,
+                    hooks=config.hooks,
+                    headers=headers,
+                    json=data,
+                    params=params,
+                    timeout=config.timeout,
+                    body=body,
+                )
+                if retries >= max_retries or response.status_code not in config.retry_statuses:
+                    break
+                time.sleep(config.retry_wait(retries, response))
+                retries += 1
+            if response.status_code >= 400:
+                raise PyCronofyRequestError(
+                    request=response.request,
+                    response=response,
+                )
+        except Exception as e:
+            if self.instrumentation:
+                self._instrument(request_method, endpoint, url, headers, started, start, response, retries, e)
+            raise
+        if self.instrumentation:
+            self._instrument(request_method, endpoint, url, headers, started, start, response, retries)
+        return response
+
+    def _prepare(self, endpoint, url, use_api_key, omit_api_version):
+        """Build the url and headers for a request.
+
+        :return: url and headers.
+        :rtype: ``tuple``
+        """
         if endpoint and omit_api_version and not url:
             url = '%s/%s' % (self.base_url, endpoint)
         if endpoint and not url:
@@ -82,20 +165,124 @@ class RequestHandler(object):
                 'Authorization': self.auth.get_authorization(),
                 'User-Agent': self.user_agent,
             }
+        return url, headers
+
+    def _instrument(self, request_method, endpoint, url, headers, started, start, response, retries=0, error=None):
+        """Emit a RequestEvent describing a completed (or failed) request to each sink."""
+        from pycronofy import instrumentation
 
-        response = requests.__getattribute__(request_method)(
+        event = instrumentation.RequestEvent(
+            method=request_method.upper(),
+            endpoint=instrumentation.endpoint_template(endpoint, url),
             url=url,
-            hooks=settings.REQUEST_HOOK,
-            headers=headers,
-            json=data,
-            params=params
+            started=started,
+            latency=time.perf_counter() - start,
+            retries=retries,
+            token_hash=instrumentation.token_hash(headers.get('Authorization')),
+            error=error,
         )
-        if ((response.status_code != 200) and (response.status_code != 202)):
-            try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError as e:
+        if response is not None:
+            event.url = response.url or url
+            event.status = response.status_code
+            event.server_latency = response.elapsed.total_seconds()
+            event.request_bytes = len(response.request.body or b'')
+            event.response_bytes = len(response.content or b'')
+        instrumentation.emit(self.instrumentation, event)
+
+
+class AsyncRequestHandler(RequestHandler):
+    """RequestHandler for asyncio code.
+
+    ``get``, ``post`` and ``delete`` return coroutines, so many requests can be in
+    flight at once, eg multiplexed over a single HTTP/2 connection. Retries,
+    hooks, errors and instrumentation behave as for RequestHandler.
+
+    Example Usage:
+
+    handler = AsyncRequestHandler(Auth(access_token=''), config=Configuration(max_concurrent_streams=50))
+    responses = await asyncio.gather(*(handler.get(endpoint='free_busy', params=params) for params in queries))
+    """
+
+    def __init__(self, auth, data_center=None, api_base_url=None, instrumentation=(), config=None):
+        """
+        :param Auth auth: Auth instance.
+        :param string data_center: The name of the data_center to use. Ignored if config is given. (Optional, default None)
+        :param string api_base_url: Base URL of the API, overriding data_center. Ignored if config is given. (Optional, default None)
+        :param tuple instrumentation: Sinks receiving a RequestEvent per request, see pycronofy.instrumentation.
+            Ignored if config is given. (Optional)
+        :param Configuration config: Settings for this handler. Its transport must be 'http2', 'httpx' or an
+            AsyncTransport instance. (Optional, default built from the other arguments, using HTTP/2)
+        """
+        if config is None:
+            config = Configuration(data_center=data_center, api_base_url=api_base_url, instrumentation=instrumentation,
+                                   transport='http2')
+        self.auth = auth
+        self.config = config
+        self.base_url = config.api_base_url
+        self.instrumentation = config.instrumentation
+        self._transport = config.create_async_transport()
+        self.user_agent = '%s %s' % (pycronofy.__name__, pycronofy.__version__)
+
+    async def close(self):
+        """Close the transport's connections."""
+        await self.transport.close()
+
+    async def _request(self, request_method, endpoint='', url='', data=None, params=None, use_api_key=False, omit_api_version=False, body=None):
+        """Perform a http request via the specified method to an API endpoint.
+
+        :param string request_method: Request method.
+        :param string endpoint: Target endpoint. (Optional).
+        :param string url: Override the endpoint and provide the full url (eg for pagination). (Optional).
+        :param dict params: Provide parameters to pass to the request. (Optional).
+        :param dict data: Data to pass to the post. (Optional).
+        :param bytes body: Already json encoded data, sent instead of data. (Optional).
+        :return: Response
+        :rtype: ``TransportResponse``
+        """
+        if not data:
+            data = {}
+        if not params:
+            params = {}
+        url, headers = self._prepare(endpoint, url, use_api_key, omit_api_version)
+
+        config = self.config
+        started = time.time()
+        start = time.perf_counter()
+        response = None
+        retries = 0
+        max_retries = config.max_retries if request_method.upper() in config.retry_methods else 0
+        try:
+            while True:
+                response = await self.transport.send(
+                    request_method,
+                    url,
+                    hooks=config.hooks,
+                    headers=headers,
+                    json=data,
+                    params=params,
+                    timeout=config.timeout,
+                    body=body,
+                )
+                if retries >= max_retries or response.status_code not in config.retry_statuses:
+                    break
+                await _sleep(config.retry_wait(retries, response))
+                retries += 1
+            if response.status_code >= 400:
                 raise PyCronofyRequestError(
-                    request=e.request,
-                    response=e.response,
+                    request=response.request,
+                    response=response,
                 )
+        except Exception as e:
+            if self.instrumentation:
+                self._instrument(request_method, endpoint, url, headers, started, start, response, retries, e)
+            raise
+        if self.instrumentation:
+            self._instrument(request_method, endpoint, url, headers, started, start, response, retries)
         return response
+
+
+async def _sleep(seconds):
+    # asyncio is imported on first use to keep it out of ``import pycronofy``.
+    import asyncio
+
+    await asyncio.sleep(seconds)
@@ -17,8 +17,23 @@ DEFAULT_OAUTH_SCOPE = (
     # 'read_free_busy', # implicitly included by 'read_events'
 )
 
+# Most authorizations accepted by one service_account_authorizations request
+MAX_SERVICE_ACCOUNT_AUTHORIZATIONS = 50
+
+# Most requests accepted by one batch request
+MAX_BATCH_SIZE = 50
+
+# Most available_periods accepted by one availability query, and the most days
+# between the earliest start and the latest end of its periods
+MAX_AVAILABLE_PERIODS = 50
+MAX_AVAILABILITY_SPAN_DAYS = 35
+
 # Default Timezone ID (used in read_events)
 DEFAULT_TIMEZONE_ID = 'Etc/UTC'
 
+# Library used to look up timezones by ID: 'zoneinfo', 'pytz' or None to use
+# zoneinfo where available (Python 3.9+) and pytz otherwise.
+TIMEZONE_BACKEND = None
+
 # Dictionary for request event hooks. Either empty or {'response': function}
 REQUEST_HOOK = {}
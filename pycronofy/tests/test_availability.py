@@ -1,8 +1,14 @@
+import datetime
 import pytest
 import responses
 import json
+import pickle
+from copy import deepcopy
 from pycronofy import Client
+from pycronofy.availability import FrozenDict, FrozenList, build_availability, freeze, map_buffer, map_participants, merge_availability
+from pycronofy.availability import plan_availability
 from pycronofy import settings
+from pycronofy.datetime_utils import parse_event_epoch
 from pycronofy.tests import common_data
 
 TEST_AVAILABLITY_RESPONSE = {
@@ -473,3 +479,287 @@ def test_availablity_with_query_slots(client):
         response_format=example_response_format
     )
     assert len(result) == 2
+
+
+@responses.activate
+def test_availability_does_not_modify_arguments(client):
+    """Test Client.availability() leaves its arguments untouched, so they can be reused.
+
+    :param Client client: Client instance with test data.
+    """
+    bodies = []
+
+    def request_callback(request):
+        bodies.append(json.loads(request.body))
+        return (200, {}, json.dumps(TEST_AVAILABLITY_RESPONSE))
+
+    responses.add_callback(
+        responses.POST,
+        url='%s/%s/availability' % (settings.API_BASE_URL, settings.API_VERSION),
+        callback=request_callback,
+        content_type='application/json',
+    )
+
+    participants = [{'members': ['acc_567236000909002', {'sub': 'acc_678347111010113', 'managed_availability': True}]}]
+    periods = [{'start': datetime.datetime(2017, 1, 3, 9, tzinfo=datetime.timezone.utc), 'end': '2017-01-03T18:00:00Z'}]
+    buffer = {'before': 30}
+    template = deepcopy((participants, periods, buffer))
+
+    client.availability(participants=participants, required_duration=60, available_periods=periods, buffer=buffer)
+    client.availability(participants=participants, required_duration=60, available_periods=periods, buffer=buffer)
+
+    assert (participants, periods, buffer) == template
+    assert bodies[0] == bodies[1]
+    assert bodies[0]['participants'] == [{
+        'required': 'all',
+        'members': [{'sub': 'acc_567236000909002'}, {'sub': 'acc_678347111010113', 'managed_availability': True}],
+    }]
+    assert bodies[0]['available_periods'] == [{'start': '2017-01-03T09:00:00Z', 'end': '2017-01-03T18:00:00Z'}]
+
+
+def test_build_availability_shares_unchanged_values():
+    """Test build_availability reuses parts of its arguments that need no conversion."""
+    group = {'members': [{'sub': 'acc_1'}, {'sub': 'acc_2'}], 'required': 'all'}
+    period = {'start': '2017-01-03T09:00:00Z', 'end': '2017-01-03T18:00:00Z'}
+    tz_period = {'start': {'time': datetime.datetime(2017, 1, 4, 9), 'tzid': 'Europe/London'},
+                 'end': {'time': '2017-01-04T18:00:00Z', 'tzid': 'Europe/London'}}
+    options = build_availability(participants=[group], required_duration=60, available_periods=[period, tz_period])
+
+    assert options['participants'][0] is group
+    assert options['available_periods'][0] is period
+    assert options['available_periods'][1]['start'] == {'time': '2017-01-04T09:00:00Z', 'tzid': 'Europe/London'}
+    assert options['available_periods'][1]['end'] is tz_period['end']
+    assert type(tz_period['start']['time']) is datetime.datetime
+
+
+@responses.activate
+def test_prepare_availability(client):
+    """Test a prepared query sends the same body as Client.availability().
+
+    :param Client client: Client instance with test data.
+    """
+    bodies = []
+
+    def request_callback(request):
+        bodies.append(json.loads(request.body))
+        assert request.headers['Content-Type'] == 'application/json'
+        return (200, {}, json.dumps(TEST_AVAILABLITY_RESPONSE_SLOTS))
+
+    responses.add_callback(
+        responses.POST,
+        url='%s/%s/availability' % (settings.API_BASE_URL, settings.API_VERSION),
+        callback=request_callback,
+        content_type='application/json',
+    )
+
+    options = {
+        'participants': {'members': ['acc_567236000909002', 'acc_678347111010113'], 'required': 1},
+        'required_duration': 60,
+        'buffer': {'before': 30, 'after': {'minutes': 45}},
+        'response_format': 'slots',
+        'max_results': 10,
+    }
+    periods = [
+        {'start': datetime.datetime(2017, 1, 3, 9, tzinfo=datetime.timezone.utc), 'end': '2017-01-03T18:00:00Z'},
+        {'start': '2017-01-04T09:00:00Z', 'end': '2017-01-04T18:00:00Z'},
+    ]
+    query = client.prepare_availability(**options)
+    assert query(periods) == TEST_AVAILABLITY_RESPONSE_SLOTS['available_slots']
+    assert query(periods[1:]) == TEST_AVAILABLITY_RESPONSE_SLOTS['available_slots']
+    client.availability(available_periods=periods, **options)
+
+    assert bodies[0] == bodies[2]
+    assert bodies[1]['available_periods'] == [periods[1]]
+    assert bodies[1]['participants'] == bodies[0]['participants']
+
+
+def test_plan_availability():
+    """Test plan_availability limits the periods and span of each query without touching participants."""
+    periods = [{'start': '2017-01-%02dT09:00:00Z' % day, 'end': '2017-01-%02dT17:00:00Z' % day} for day in range(1, 31)]
+    options = build_availability(participants=[{'members': ['acc_1', 'acc_2']}], required_duration=60, available_periods=periods)
+
+    assert plan_availability(options) == [options]
+
+    queries = plan_availability(options, max_periods=8)
+    assert [len(query['available_periods']) for query in queries] == [8, 8, 8, 6]
+    assert [period for query in queries for period in query['available_periods']] == periods
+    assert all(query['participants'] is options['participants'] for query in queries)
+
+    queries = plan_availability(options, max_span_days=7)
+    assert [query['available_periods'][0]['start'] for query in queries] == [
+        '2017-01-01T09:00:00Z', '2017-01-08T09:00:00Z', '2017-01-15T09:00:00Z', '2017-01-22T09:00:00Z', '2017-01-29T09:00:00Z']
+
+
+def test_plan_availability_splits_long_periods():
+    """Test plan_availability cuts long periods into overlapping pieces aligned to the start interval."""
+    options = build_availability(required_duration=45, start_interval=30,
+                                 available_periods=[{'start': '2017-01-01T00:00:00Z', 'end': '2017-01-03T00:00:00Z'}])
+
+    queries = plan_availability(options, max_span_days=1)
+    assert [query['available_periods'] for query in queries] == [
+        [{'start': '2017-01-01T00:00:00Z', 'end': '2017-01-02T00:00:00Z'}],
+        [{'start': '2017-01-01T23:00:00Z', 'end': '2017-01-02T23:00:00Z'}],
+        [{'start': '2017-01-02T22:00:00Z', 'end': '2017-01-03T00:00:00Z'}],
+    ]
+
+
+def test_plan_availability_overlapping_periods():
+    """Test pieces of a long period are ordered with the periods it overlaps, keeping every query within the span."""
+    options = build_availability(required_duration=60, available_periods=[
+        {'start': '2024-01-01T00:00:00Z', 'end': '2024-04-10T00:00:00Z'},
+        {'start': '2024-01-10T00:00:00Z', 'end': '2024-01-11T00:00:00Z'},
+    ])
+
+    queries = plan_availability(options)
+    for query in queries:
+        starts = [parse_event_epoch(period['start']) for period in query['available_periods']]
+        ends = [parse_event_epoch(period['end']) for period in query['available_periods']]
+        assert starts == sorted(starts)
+        assert max(ends) - min(starts) <= 86400 * settings.MAX_AVAILABILITY_SPAN_DAYS
+    firsts = [query['available_periods'][0]['start'] for query in queries]
+    assert firsts == sorted(firsts)
+    assert {'start': '2024-01-10T00:00:00Z', 'end': '2024-01-11T00:00:00Z'} in queries[0]['available_periods']
+
+
+def test_merge_availability():
+    """Test merge_availability joins periods across query boundaries and drops repeated slots."""
+    participants = [{'sub': 'acc_1'}]
+    first = [{'start': '2017-01-01T09:00:00Z', 'end': '2017-01-01T12:00:00Z', 'participants': participants}]
+    second = [
+        {'start': '2017-01-01T11:00:00Z', 'end': '2017-01-01T14:00:00Z', 'participants': participants},
+        {'start': '2017-01-01T11:00:00Z', 'end': '2017-01-01T12:00:00Z', 'participants': [{'sub': 'acc_2'}]},
+        {'start': '2017-01-01T16:00:00Z', 'end': '2017-01-01T17:00:00Z', 'participants': participants},
+    ]
+
+    assert merge_availability([first, second]) == [
+        {'start': '2017-01-01T09:00:00Z', 'end': '2017-01-01T14:00:00Z', 'participants': participants},
+        second[1],
+        second[2],
+    ]
+    assert first[0]['end'] == '2017-01-01T12:00:00Z'
+    assert len(merge_availability([first, second], max_results=2)) == 2
+
+    slots = merge_availability([first + second[:1], second[:1]], response_format='slots')
+    assert slots == first + second[:1]
+
+
+@responses.activate
+def test_sequenced_availabilities(client):
+    """Test Client.sequenced_availabilities() queries every sequence and keys the results by identifier.
+
+    :param Client client: Client instance with test data.
+    """
+    def request_callback(request):
+        payload = json.loads(request.body)
+        assert payload['available_periods'] == [{'start': '2017-01-03T09:00:00Z', 'end': '2017-01-03T18:00:00Z'}]
+        step = payload['sequence'][0]
+        assert step['required_duration'] == {'minutes': 30}
+        sub = step['participants'][0]['members'][0]['sub']
+        if sub == 'acc_busy':
+            return (200, {}, json.dumps({'sequences': []}))
+        if sub == 'acc_4':
+            return (422, {}, json.dumps({'errors': {}}))
+        return (200, {}, json.dumps(TEST_SEQUENCED_AVAILABLITY_RESPONSE))
+
+    responses.add_callback(
+        responses.POST,
+        url='%s/%s/sequenced_availability' % (settings.API_BASE_URL, settings.API_VERSION),
+        callback=request_callback,
+        content_type='application/json',
+    )
+
+    def panel(sub):
+        return [{'sequence_id': '1', 'ordinal': 1, 'participants': {'members': [sub]}, 'required_duration': 30}]
+
+    periods = [{'start': datetime.datetime(2017, 1, 3, 9, tzinfo=datetime.timezone.utc), 'end': '2017-01-03T18:00:00Z'}]
+    panels = {'panel_%d' % i: panel('acc_busy' if i % 2 else 'acc_%d' % i) for i in range(6)}
+
+    report = client.sequenced_availabilities(panels, available_periods=periods, max_workers=3)
+    results = dict(report.results)
+    assert sorted(results) == ['panel_0', 'panel_1', 'panel_2', 'panel_3', 'panel_5']
+    assert results['panel_1'] == []
+    assert results['panel_2'] == TEST_SEQUENCED_AVAILABLITY_RESPONSE['sequences']
+    assert [key for key, _ in report.failures] == ['panel_4']
+    assert report.failures[0][1].response.status_code == 422
+    assert type(periods[0]['start']) is datetime.datetime
+
+    report = client.sequenced_availabilities(sorted(panels.items()), available_periods=periods, max_workers=1, enough=2)
+    assert len([found for _, found in report.results if found]) == 2
+    assert len(responses.calls) <= 6 + 4
+
+
+def test_freeze():
+    """Test freeze builds a hashable copy that cannot be modified but can be encoded and copied."""
+    participants = [{'members': ['acc_1', {'sub': 'acc_2'}], 'required': 'all'}]
+    frozen = freeze(participants)
+
+    assert frozen == ({'members': ('acc_1', {'sub': 'acc_2'}), 'required': 'all'},)
+    assert hash(frozen) == hash(freeze(deepcopy(participants)))
+    assert freeze(frozen) is frozen
+    assert json.loads(json.dumps(frozen)) == participants
+    assert deepcopy(frozen) == frozen
+    group = frozen[0]
+    for modify in (lambda: group.__setitem__('required', 1), lambda: group.update(required=1),
+                   lambda: group.setdefault('extra', 1), lambda: group.pop('required'), group.popitem, group.clear,
+                   lambda: group.__ior__({'required': 1}), lambda: group.__delitem__('required')):
+        with pytest.raises(TypeError):
+            modify()
+    group.__init__({'required': 1})
+    assert group == {'members': ('acc_1', {'sub': 'acc_2'}), 'required': 'all'}
+    assert FrozenDict.fromkeys(['a'], 1) == {'a': 1}
+
+
+def test_map_participants_memoized():
+    """Test mapping frozen participants and buffers is cached and matches mapping the originals."""
+    participants = [
+        {'members': ['acc_1', {'sub': 'acc_2', 'available_periods': [
+            {'start': datetime.datetime(2017, 1, 3, 9, tzinfo=datetime.timezone.utc), 'end': '2017-01-03T18:00:00Z'}]}]},
+        {'members': ['acc_3'], 'required': 1},
+    ]
+    buffer = {'before': 30, 'after': {'minimum': 15}}
+    frozen = freeze(participants)
+
+    mapped = map_participants(frozen)
+    assert map_participants(freeze(deepcopy(participants))) is mapped
+    assert json.loads(json.dumps(mapped)) == map_participants(participants)
+    assert map_buffer(freeze(buffer)) is map_buffer(freeze(buffer))
+    assert map_buffer(freeze(buffer)) == map_buffer(buffer)
+
+    options = build_availability(participants=frozen, required_duration=60, buffer=freeze(buffer),
+                                 available_periods=freeze([{'start': {'time': datetime.datetime(2017, 1, 3, 9), 'tzid': 'Etc/UTC'},
+                                                            'end': '2017-01-03T18:00:00Z'}]))
+    assert options['participants'] is mapped
+    assert options['available_periods'][0]['start'] == {'time': '2017-01-03T09:00:00Z', 'tzid': 'Etc/UTC'}
+
+
+def test_frozen_containers_check_hashability_once():
+    """Test frozen containers refuse unhashable items when built, and survive pickling."""
+    frozen = freeze([{'members': ['acc_1']}])
+    assert type(frozen) is FrozenList and type(frozen[0]['members']) is FrozenList
+    assert hash(frozen) == hash(freeze([{'members': ['acc_1']}]))
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert type(pickle.loads(pickle.dumps(frozen))) is FrozenList
+    with pytest.raises(TypeError):
+        FrozenList([{'members': []}])
+    with pytest.raises(TypeError):
+        FrozenDict(members=[])
+
+
+def test_map_participants_unhashable_tuple():
+    """Test a tuple holding plain dicts is mapped as usual rather than cached."""
+    participants = ({'members': ['acc_1']},)
+    assert map_participants(participants) == [{'members': [{'sub': 'acc_1'}], 'required': 'all'}]
+    assert participants == ({'members': ['acc_1']},)
+
+
+def test_client_map_availability_delegates(client):
+    """Test the Client.map_availability_* helpers no longer modify their input.
+
+    :param Client client: Client instance with test data.
+    """
+    group = {'members': ['acc_1']}
+    assert client.map_availability_participants(group) == [{'members': [{'sub': 'acc_1'}], 'required': 'all'}]
+    assert group == {'members': ['acc_1']}
+    item = {'participants': group, 'required_duration': 30}
+    assert client.map_sequence_item(item)['required_duration'] == {'minutes': 30}
+    assert item['required_duration'] == 30
@@ -8,7 +8,7 @@ import responses
 from pycronofy import Client
 from pycronofy import settings
 from pycronofy.batch import BatchBuilder
-from pycronofy.exceptions import PyCronofyPartialSuccessError
+from pycronofy.exceptions import PyCronofyPartialSuccessError, PyCronofyRequestError
 from pycronofy.tests import common_data
 
 
@@ -184,3 +184,50 @@ def test_batch_upsert_with_datetimes(client):
     result = client.batch(builder)
     assert len(result.entries) == 1
     assert result.entries[0].response == {'status': 202}
+
+
+@responses.activate
+def test_change_participation_statuses(client):
+    """Test change_participation_statuses sends changes in batches and reports every batch's outcome."""
+    batches = []
+
+    def request_callback(request):
+        payload = json.loads(request.body)["batch"]
+        batches.append(payload)
+        uids = [entry['relative_url'].split('/')[-2] for entry in payload]
+        if 'evt_down' in uids:
+            return (503, {}, '')
+        statuses = [{"status": 404 if uid == 'evt_missing' else 202} for uid in uids]
+        return (207, {}, json.dumps({"batch": statuses}))
+
+    responses.add_callback(
+        responses.POST,
+        url='%s/%s/batch' % (settings.API_BASE_URL, settings.API_VERSION),
+        callback=request_callback,
+        content_type='application/json',
+    )
+
+    uids = ('evt_1', 'evt_2', 'evt_missing', 'evt_3', 'evt_down', 'evt_4', 'evt_5')
+    report = client.change_participation_statuses((('cal_123', uid, 'accepted') for uid in uids), batch_size=2)
+
+    assert sorted(len(batch) for batch in batches) == [1, 2, 2, 2]
+    assert {
+        'method': 'POST',
+        'relative_url': '/v1/calendars/cal_123/events/evt_1/participation_status',
+        'data': {'status': 'accepted'},
+    } in [entry for batch in batches for entry in batch]
+    assert len(report) == 4
+    assert [[uid for _, uid, _ in changes] for changes, _ in report.results] == [['evt_1', 'evt_2'], ['evt_5']]
+    assert len(report.results[0][1].entries) == 2
+
+    (partial, partial_error), (down, down_error) = report.failures
+    assert [uid for _, uid, _ in partial] == ['evt_missing', 'evt_3']
+    assert isinstance(partial_error, PyCronofyPartialSuccessError)
+    assert [entry.request['relative_url'] for entry in partial_error.batch_response.errors()] == \
+        ['/v1/calendars/cal_123/events/evt_missing/participation_status']
+    assert [uid for _, uid, _ in down] == ['evt_down', 'evt_4']
+    assert isinstance(down_error, PyCronofyRequestError)
+    assert down_error.response.status_code == 503
+
+    with pytest.raises(ValueError):
+        client.change_participation_statuses([], batch_size=settings.MAX_BATCH_SIZE + 1)
@@ -0,0 +1,47 @@
+import time
+
+from pycronofy.calendars import CalendarIndex
+
+
+CALENDARS = [
+    {'profile_id': 'pro_1', 'calendar_id': 'cal_1', 'calendar_name': 'Work'},
+    {'profile_id': 'pro_1', 'calendar_id': 'cal_2', 'calendar_name': 'Home'},
+    {'profile_id': 'pro_2', 'calendar_id': 'cal_3', 'calendar_name': 'Work'},
+]
+
+
+def test_index_lookups():
+    """Test CalendarIndex finds calendars by id and by profile and name."""
+    index = CalendarIndex()
+    assert index.stale
+    index.update(CALENDARS)
+
+    assert not index.stale
+    assert len(index) == 3
+    assert index.get('cal_2')['calendar_name'] == 'Home'
+    assert index.find('pro_2', 'Work')['calendar_id'] == 'cal_3'
+    assert index.find('pro_2', 'Home') is None
+    assert index.get('cal_4') is None
+
+
+def test_index_add_and_clear():
+    """Test CalendarIndex.add indexes a new calendar and clear empties the index."""
+    index = CalendarIndex()
+    index.update(CALENDARS)
+    index.add({'profile_id': 'pro_2', 'calendar_id': 'cal_4', 'calendar_name': 'Home'})
+
+    assert index.find('pro_2', 'Home')['calendar_id'] == 'cal_4'
+    assert index.get('cal_4') is not None
+
+    index.clear()
+    assert index.stale
+    assert len(index) == 0
+
+
+def test_index_ttl():
+    """Test CalendarIndex becomes stale once its ttl has passed."""
+    index = CalendarIndex(ttl=0.01)
+    index.update(CALENDARS)
+    assert not index.stale
+    time.sleep(0.02)
+    assert index.stale
@@ -0,0 +1,103 @@
+import gzip
+
+import pytest
+
+from pycronofy import Client
+from pycronofy.cassette import Cassette, redact
+from pycronofy.config import Configuration
+from pycronofy.exceptions import PyCronofyCassetteError, PyCronofyRequestError
+from pycronofy.fake_server import FakeCronofyServer
+from pycronofy.tests import common_data
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    """Record a session against a FakeCronofyServer and save it."""
+    path = str(tmp_path_factory.mktemp('cassettes') / 'session.jsonl.gz')
+    with FakeCronofyServer(page_size=2) as server:
+        server.add_calendar('pro_1', 'Work', calendar_id='cal_1')
+        server.populate(events=3)
+        client = Client(api_base_url=server.url, **common_data.AUTH_ARGS)
+        cassette = Cassette().record(client)
+        events = [event['event_id'] for event in client.read_events()]
+        client.upsert_event('cal_1', {'event_id': 'evt_new', 'summary': 'New',
+                                      'start': '2024-02-01T09:00:00Z', 'end': '2024-02-01T10:00:00Z'})
+        server.inject_error(status=500)
+        with pytest.raises(PyCronofyRequestError):
+            client.account()
+        cassette.save(path)
+        return server.url, events, path
+
+
+def test_record(recording):
+    """Test requests and responses are saved without credentials."""
+    url, events, path = recording
+    cassette = Cassette.load(path)
+    assert [interaction['status'] for interaction in cassette.interactions] == [200, 200, 202, 500]
+    assert cassette.interactions[2]['method'] == 'POST'
+    assert '"event_id": "evt_new"' in cassette.interactions[2]['body']
+    with open(path, 'rb') as f:
+        assert common_data.AUTH_ARGS['access_token'].encode() not in f.read()
+
+
+def test_replay(recording):
+    """Test a replayed session gives the same results with the server gone."""
+    url, events, path = recording
+    client = Client(api_base_url=url, **common_data.AUTH_ARGS)
+    adapter = Cassette.load(path).replay(client)
+    assert [event['event_id'] for event in client.read_events()] == events
+    client.upsert_event('cal_1', {'event_id': 'evt_new', 'summary': 'New',
+                                  'start': '2024-02-01T09:00:00Z', 'end': '2024-02-01T10:00:00Z'})
+    with pytest.raises(PyCronofyRequestError) as exception_info:
+        client.account()
+    assert exception_info.value.response.status_code == 500
+    assert adapter.unused() == []
+
+    with pytest.raises(PyCronofyCassetteError):
+        client.account()
+    with pytest.raises(PyCronofyCassetteError):
+        client.userinfo()
+
+
+def test_replay_repeat(recording):
+    """Test repeat replays matching interactions from the start again."""
+    url, events, path = recording
+    client = Client(api_base_url=url, **common_data.AUTH_ARGS)
+    Cassette.load(path).replay(client, repeat=True)
+    for _ in range(3):
+        assert [event['event_id'] for event in client.read_events()] == events
+
+
+def test_record_and_replay_other_transports(tmp_path):
+    """Test recording through urllib3 and replaying to a requests client, with credentials redacted."""
+    path = str(tmp_path / 'oauth.jsonl.gz')
+    with FakeCronofyServer() as server:
+        server.add_calendar('pro_1', 'Work', calendar_id='cal_1')
+        server.populate(events=3)
+        config = Configuration(api_base_url=server.url, transport='urllib3')
+        client = Client(config=config, **common_data.AUTH_ARGS)
+        cassette = Cassette().record(client)
+        assert client.refresh_authorization()['access_token'].startswith('fake_access_')
+        events = [event['event_id'] for event in client.read_events(calendar_ids=('cal_1',))]
+        cassette.save(path)
+        url = server.url
+
+    with gzip.open(path, 'rb') as f:
+        content = f.read()
+    for secret in (b'opposable thumbs', b'teeth', b'fake_access_', b'fake_refresh_'):
+        assert secret not in content
+
+    client = Client(api_base_url=url, **common_data.AUTH_ARGS)
+    transport = Cassette.load(path).replay(client)
+    assert client.refresh_authorization()['access_token'] == 'REDACTED'
+    assert [event['event_id'] for event in client.read_events(calendar_ids=('cal_1',))] == events
+    assert transport.unused() == []
+
+
+def test_redact():
+    """Test credential fields are redacted at any depth, leaving other bodies untouched."""
+    assert redact(b'{"code": "abc", "nested": [{"refresh_token": "x", "keep": 1}]}') == \
+        '{"code": "REDACTED", "nested": [{"refresh_token": "REDACTED", "keep": 1}]}'
+    assert redact('{"event_id": "evt_1"}') == '{"event_id": "evt_1"}'
+    assert redact('not json') == 'not json'
+    assert redact(None) is None
@@ -8,6 +8,8 @@ from functools import partial
 
 from pycronofy import Client
 from pycronofy import settings
+from pycronofy.concurrency import Checkpoint
+from pycronofy.config import Configuration
 from pycronofy.exceptions import PyCronofyRequestError
 from pycronofy.tests import common_data
 
@@ -231,6 +233,50 @@ def test_create_calendar_with_duplicate_no_issues(client):
     assert calendar_data['calendar_name'] == TEST_CALENDAR_NAME
 
 
+@responses.activate
+def test_create_calendar_with_duplicates_lists_calendars_once():
+    """Test Client.create_calendar
+        - resolves repeated duplicate calendar errors from a single cached listing,
+        listing again when a name is missing or the listing has expired
+    """
+    client = Client(config=Configuration(calendar_index_ttl=60), **common_data.AUTH_ARGS)
+    duplicate_error_json = '{"errors": {"name": [{"key": "errors.duplicate_calendar_name", "description": "A calendar with this name already exists and the provider does not allow duplicates"}]}}'
+    calendars_url = '%s/%s/calendars' % (settings.API_BASE_URL, settings.API_VERSION)
+    responses.add(responses.POST, url=calendars_url, body=duplicate_error_json, status=422, content_type='application/json')
+    listing = responses.add(responses.GET, url=calendars_url, body=json.dumps(dict(calendars=TEST_CALENDAR_LIST)), status=200,
+                            content_type='application/json')
+
+    for _ in range(3):
+        calendar_data = client.create_calendar(profile_id='test_profile_google', calendar_name=TEST_CALENDAR_NAME, error_on_duplicate=False)
+        assert calendar_data['calendar_id'] == 'cal_test_google'
+    assert listing.call_count == 1
+
+    assert client.create_calendar(profile_id='test_profile_google', calendar_name='missing', error_on_duplicate=False) is None
+    assert listing.call_count == 2
+
+    client.calendar_index.ttl = 0
+    client.find_calendar(calendar_id='testing_cal')
+    assert listing.call_count == 3
+
+
+@responses.activate
+def test_create_calendar_updates_calendar_index():
+    """Test Client.create_calendar adds the new calendar to the client's calendar index."""
+    client = Client(**common_data.AUTH_ARGS)
+    calendars_url = '%s/%s/calendars' % (settings.API_BASE_URL, settings.API_VERSION)
+    responses.add(responses.GET, url=calendars_url, body=json.dumps(dict(calendars=TEST_CALENDAR_LIST)), status=200,
+                  content_type='application/json')
+    responses.add(responses.POST, url=calendars_url, status=200, content_type='application/json',
+                  body=json.dumps({'calendar': {'profile_id': TEST_PROFILE_ID, 'calendar_id': 'cal_new', 'calendar_name': 'new'}}))
+
+    client.list_calendars()
+    client.create_calendar(profile_id=TEST_PROFILE_ID, calendar_name='new')
+
+    assert client.find_calendar(calendar_id='cal_new')['calendar_name'] == 'new'
+    assert client.find_calendar(TEST_PROFILE_ID, 'new')['calendar_id'] == 'cal_new'
+    assert len(responses.calls) == 2
+
+
 @responses.activate
 def test_create_calendar(client):
     """Test Client.create_calendar
@@ -559,6 +605,36 @@ def test_upsert_smart_invites_with_multiple_recievers(client):
     assert result['attachments']['icalendar'] == "BEGIN:VCALENDAR\nVERSION:2.0..."
 
 
+@responses.activate
+def test_bulk_upsert_smart_invites(client):
+    """Test Client.bulk_upsert_smart_invites reports each invite's result or failure."""
+    def request_callback(request):
+        payload = json.loads(request.body)
+        if payload['smart_invite_id'] == 'invite-3':
+            return (422, {}, json.dumps({'errors': {'recipient': [{'key': 'errors.required'}]}}))
+        return (202, {}, json.dumps({'smart_invite_id': payload['smart_invite_id']}))
+
+    responses.add_callback(
+        responses.POST,
+        '%s/v1/smart_invites' % settings.API_BASE_URL,
+        callback=request_callback,
+        content_type='application/json',
+    )
+
+    event = {'summary': 'Test', 'start': datetime.datetime(2017, 10, 5, 9, 30, tzinfo=pytz.utc), 'end': '2017-10-05T10:00:00Z'}
+    invites = [('invite-%d' % i, {'email': 'test%d@example.com' % i}, event) for i in range(5)]
+    invites.append({'smart_invite_id': 'invite-5', 'recipient': {'email': 'test5@example.com'}, 'event': event,
+                    'callback_url': 'http://www.example.com'})
+
+    report = client.bulk_upsert_smart_invites(iter(invites), max_workers=3)
+
+    assert len(report) == 6
+    assert sorted(result['smart_invite_id'] for _, result in report.results) == ['invite-%d' % i for i in (0, 1, 2, 4, 5)]
+    assert [invite for invite, _ in report.failures] == [invites[3]]
+    assert isinstance(report.failures[0][1], PyCronofyRequestError)
+    assert isinstance(event['start'], datetime.datetime)
+
+
 @responses.activate
 def test_get_smart_invite(client):
     smart_invite_id = "qTtZdczOccgaPncGJaCiLg"
@@ -834,6 +910,50 @@ def test_authorize_multiple_accounts_via_service_account(client):
     )
 
 
+@responses.activate
+def test_bulk_authorize_via_service_account(client, tmp_path):
+    """Test bulk_authorize_via_service_account chunks authorizations, tracks progress and resumes from a checkpoint.
+    :param Client client: Client instance with test data.
+    """
+    submitted = []
+
+    def request_callback(request):
+        authorizations = json.loads(request.body)['service_account_authorizations']
+        assert len(authorizations) <= 4
+        if any(authorization['email'] == 'fail@example.com' for authorization in authorizations):
+            return (422, {}, json.dumps({'errors': {}}))
+        submitted.extend(authorization['email'] for authorization in authorizations)
+        return (202, {}, None)
+
+    responses.add_callback(
+        responses.POST,
+        '%s/v1/service_account_authorizations' % settings.API_BASE_URL,
+        callback=request_callback,
+        content_type='application/json',
+    )
+
+    emails = ['example+%d@example.com' % i for i in range(10)] + ['fail@example.com']
+    authorizations = [{'email': email, 'scope': 'felines', 'callback_url': 'http://www.example.com/callback'} for email in emails]
+    path = str(tmp_path / 'checkpoint')
+    checkpoint = Checkpoint.load(path)
+    checkpoint.add(emails[:2])
+    progress = []
+
+    report = client.bulk_authorize_via_service_account(
+        iter(authorizations), chunk_size=4, max_workers=2, checkpoint=checkpoint,
+        progress=lambda done, failed: progress.append((done, failed)),
+    )
+
+    assert sorted(submitted) == sorted(emails[2:10])
+    assert len(report.results) == 2
+    assert report.failures[0][0] == authorizations[10:]
+    assert sorted(progress)[-1] == (8, 1)
+    assert sorted(Checkpoint.load(path).keys) == sorted(emails[:10])
+
+    with pytest.raises(ValueError):
+        client.bulk_authorize_via_service_account(authorizations, chunk_size=51)
+
+
 @responses.activate
 def test_list_resources(client):
     """Test resources listing
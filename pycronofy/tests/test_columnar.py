@@ -0,0 +1,75 @@
+import json
+
+import pytest
+import responses
+
+from pycronofy import Client
+from pycronofy import settings
+from pycronofy.columnar import FreeBusyColumns
+from pycronofy.tests import common_data
+
+NEXT_PAGE_URL = '%s/%s/free_busy/pages/08a07b034306679e' % (settings.API_BASE_URL, settings.API_VERSION)
+
+TEST_FREE_BUSY_PAGE_ONE = {
+    'pages': {'current': 1, 'total': 2, 'next_page': NEXT_PAGE_URL},
+    'free_busy': [
+        {'calendar_id': 'cal_1', 'start': '2014-09-06T10:00:00Z', 'end': '2014-09-06T11:00:00Z', 'free_busy_status': 'busy'},
+        {'calendar_id': 'cal_2', 'start': '2014-09-06', 'end': '2014-09-07', 'free_busy_status': 'tentative'},
+    ]
+}
+
+TEST_FREE_BUSY_PAGE_TWO = {
+    'pages': {'current': 2, 'total': 2},
+    'free_busy': [
+        {'calendar_id': 'cal_1', 'start': {'time': '2014-09-08T10:00:00Z', 'tzid': 'Europe/London'},
+         'end': {'time': '2014-09-08T10:30:00Z', 'tzid': 'Europe/London'}, 'free_busy_status': 'out_of_office'},
+    ]
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Setup Client instance with test values."""
+    return Client(**common_data.AUTH_ARGS)
+
+
+@responses.activate
+def test_read_free_busy_columns(client):
+    """Test Client.read_free_busy_columns() collects every page into columns.
+
+    :param Client client: Client instance with test data.
+    """
+    responses.add(responses.GET, '%s/%s/free_busy' % (settings.API_BASE_URL, settings.API_VERSION),
+                  body=json.dumps(TEST_FREE_BUSY_PAGE_ONE), status=200, content_type='application/json')
+    responses.add(responses.GET, NEXT_PAGE_URL,
+                  body=json.dumps(TEST_FREE_BUSY_PAGE_TWO), status=200, content_type='application/json')
+
+    columns = client.read_free_busy_columns(from_date='2014-09-06', to_date='2014-09-09')
+
+    assert len(columns) == 3
+    assert [columns.calendar_ids[code] for code in columns.calendar_id] == ['cal_1', 'cal_2', 'cal_1']
+    assert list(columns.start) == [1409997600, 1409961600, 1410170400]
+    assert list(columns.end) == [1410001200, 1410048000, 1410172200]
+    assert [columns.statuses[code] for code in columns.status] == ['busy', 'tentative', 'out_of_office']
+
+
+def test_to_numpy():
+    """Test FreeBusyColumns.to_numpy() exposes the columns as typed arrays."""
+    numpy = pytest.importorskip('numpy')
+    columns = FreeBusyColumns()
+    columns.extend(TEST_FREE_BUSY_PAGE_ONE['free_busy'])
+    arrays = columns.to_numpy()
+    assert arrays['start'].dtype == numpy.int64
+    assert arrays['end'].tolist() == [1410001200, 1410048000]
+    assert arrays['status'].tolist() == [1, 0]
+
+
+def test_to_arrow():
+    """Test FreeBusyColumns.to_arrow() builds a dictionary encoded table."""
+    pytest.importorskip('pyarrow')
+    columns = FreeBusyColumns()
+    columns.extend(TEST_FREE_BUSY_PAGE_ONE['free_busy'])
+    table = columns.to_arrow()
+    assert table.column('calendar_id').to_pylist() == ['cal_1', 'cal_2']
+    assert table.column('status').to_pylist() == ['busy', 'tentative']
+    assert table.column('start').to_pylist()[1].isoformat() == '2014-09-06T00:00:00+00:00'
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from pycronofy.concurrency import BulkReport, Checkpoint, RateLimiter, chunked, run_concurrently, run_pipelined
+
+
+def test_rate_limiter_bursts_then_waits():
+    """Test RateLimiter allows a burst at once, then spaces further calls by the rate."""
+    limiter = RateLimiter(rate=50, burst=2)
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    # Two from the burst, two more at 50/s.
+    assert time.monotonic() - start >= 0.035
+
+
+def test_rate_limiter_requires_positive_rate():
+    """Test RateLimiter rejects a rate of zero."""
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+def test_run_concurrently_reports_results_and_errors():
+    """Test run_concurrently yields a result or an exception for every item."""
+    def square(n):
+        if n == 3:
+            raise ValueError(n)
+        return n * n
+
+    outcomes = {item: (result, error) for item, result, error in run_concurrently(square, range(6), max_workers=3)}
+
+    assert sorted(outcomes) == list(range(6))
+    assert outcomes[4] == (16, None)
+    assert outcomes[3][0] is None
+    assert isinstance(outcomes[3][1], ValueError)
+
+
+def test_run_concurrently_bounds_work_in_flight():
+    """Test run_concurrently runs at most max_workers calls and pulls items lazily."""
+    lock = threading.Lock()
+    state = {'running': 0, 'most': 0, 'pulled': 0}
+
+    def items():
+        for n in range(20):
+            state['pulled'] += 1
+            yield n
+
+    def work(n):
+        with lock:
+            state['running'] += 1
+            state['most'] = max(state['most'], state['running'])
+        time.sleep(0.005)
+        with lock:
+            state['running'] -= 1
+        return n
+
+    outcomes = run_concurrently(work, items(), max_workers=4)
+    next(outcomes)
+    assert state['pulled'] <= 5
+    assert len(list(outcomes)) == 19
+    assert state['most'] <= 4
+
+
+def test_bulk_report():
+    """Test BulkReport separates results from failures."""
+    report = BulkReport()
+    report.add('a', result=1)
+    error = ValueError('b')
+    report.add('b', error=error)
+
+    assert len(report) == 2
+    assert report.results == [('a', 1)]
+    assert report.failures == [('b', error)]
+    assert report.has_failures()
+    assert repr(report) == '<BulkReport 1 succeeded, 1 failed>'
+
+
+def test_chunked():
+    """Test chunked groups items lazily, with a shorter final chunk."""
+    assert list(chunked(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+
+
+def test_checkpoint_appends_and_reloads(tmp_path):
+    """Test Checkpoint appends completed keys to its file so a later run can resume."""
+    path = str(tmp_path / 'checkpoint')
+    checkpoint = Checkpoint.load(path)
+    assert len(checkpoint) == 0
+    checkpoint.add(['a@example.com', 'b@example.com'])
+    checkpoint.add(['b@example.com', 'c@example.com'])
+
+    resumed = Checkpoint.load(path)
+    assert len(resumed) == 3
+    assert 'c@example.com' in resumed
+    assert 'd@example.com' not in resumed
+
+    copy = str(tmp_path / 'copy')
+    resumed.save(copy)
+    assert Checkpoint.load(copy).keys == resumed.keys
+
+
+def test_run_pipelined_keeps_order():
+    """Test run_pipelined yields outcomes in the order of items however calls complete."""
+    def work(n):
+        time.sleep(0.001 * (5 - n))
+        if n == 2:
+            raise ValueError(n)
+        return n * 10
+
+    outcomes = list(run_pipelined(work, iter(range(5)), max_workers=3))
+
+    assert [item for item, _, _ in outcomes] == [0, 1, 2, 3, 4]
+    assert [result for _, result, _ in outcomes] == [0, 10, None, 30, 40]
+    assert isinstance(outcomes[2][2], ValueError)
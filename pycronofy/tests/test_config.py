@@ -0,0 +1,132 @@
+import pytest
+import responses
+
+import pycronofy
+from pycronofy import Client
+from pycronofy import settings
+from pycronofy.config import Configuration
+from pycronofy.exceptions import PyCronofyRequestError
+from pycronofy.tests import common_data
+
+EVENTS_URL = '%s/%s/events' % (settings.API_BASE_URL, settings.API_VERSION)
+EMPTY_EVENTS = '{"pages": {"current": 1, "total": 1}, "events": []}'
+
+
+def test_base_urls():
+    """Test base URLs are derived from the data center unless given."""
+    assert Configuration().api_base_url == settings.API_BASE_URL
+    config = Configuration(data_center='de')
+    assert config.api_base_url == 'https://api-de.cronofy.com'
+    assert config.app_base_url == 'https://app-de.cronofy.com'
+    assert Configuration(api_base_url='http://localhost:8000/').api_base_url == 'http://localhost:8000'
+
+    client = Client(config=Configuration(data_center='au'), **common_data.AUTH_ARGS)
+    assert client.request_handler.base_url == 'https://api-au.cronofy.com'
+    assert client.app_base_url == 'https://app-au.cronofy.com'
+
+
+@responses.activate
+def test_request_hooks_are_per_client():
+    """Test a client's request_hook is used instead of, and only by, that client."""
+    seen = {'global': 0, 'own': 0}
+
+    def global_hook(response, *args, **kwargs):
+        seen['global'] += 1
+
+    def own_hook(response, *args, **kwargs):
+        seen['own'] += 1
+
+    responses.add(responses.GET, EVENTS_URL, body=EMPTY_EVENTS, status=200, content_type='application/json')
+    own = Client(config=Configuration(request_hook=own_hook), **common_data.AUTH_ARGS)
+    shared = Client(**common_data.AUTH_ARGS)
+    pycronofy.set_request_hook(global_hook)
+    try:
+        own.read_events()
+        assert seen == {'global': 0, 'own': 1}
+        shared.read_events()
+        assert seen == {'global': 1, 'own': 1}
+    finally:
+        pycronofy.set_request_hook(None)
+
+
+@responses.activate
+def test_default_tzid():
+    """Test read_events uses the configured timezone when none is given."""
+    responses.add(responses.GET, EVENTS_URL, body=EMPTY_EVENTS, status=200, content_type='application/json')
+    client = Client(config=Configuration(default_tzid='Europe/London'), **common_data.AUTH_ARGS)
+    client.read_events()
+    client.read_events(tzid='America/Chicago')
+    assert 'tzid=Europe%2FLondon' in responses.calls[0].request.url
+    assert 'tzid=America%2FChicago' in responses.calls[1].request.url
+
+
+@responses.activate
+def test_retries():
+    """Test retryable statuses are retried up to max_retries, honouring Retry-After."""
+    events = []
+    config = Configuration(max_retries=2, retry_backoff=0, instrumentation=(events.append,))
+    client = Client(config=config, **common_data.AUTH_ARGS)
+    responses.add(responses.GET, EVENTS_URL, status=429, headers={'Retry-After': '0'})
+    responses.add(responses.GET, EVENTS_URL, status=503)
+    responses.add(responses.GET, EVENTS_URL, body=EMPTY_EVENTS, status=200, content_type='application/json')
+    assert list(client.read_events()) == []
+    assert len(responses.calls) == 3
+    assert events[0].retries == 2
+    assert events[0].status == 200
+
+
+@responses.activate
+def test_retries_exhausted():
+    """Test the last response is raised once retries run out."""
+    client = Client(config=Configuration(max_retries=1, retry_backoff=0), **common_data.AUTH_ARGS)
+    responses.add(responses.GET, EVENTS_URL, status=429, headers={'Retry-After': '0'})
+    with pytest.raises(PyCronofyRequestError) as exception_info:
+        client.read_events()
+    assert exception_info.value.response.status_code == 429
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_posts_are_not_retried_by_default():
+    """Test POSTs are only retried when retry_methods includes them."""
+    calendars_url = '%s/%s/calendars' % (settings.API_BASE_URL, settings.API_VERSION)
+    responses.add(responses.POST, calendars_url, status=503)
+    responses.add(responses.POST, calendars_url, json={'calendar': {'calendar_id': 'cal_1'}}, status=200)
+
+    client = Client(config=Configuration(max_retries=1, retry_backoff=0), **common_data.AUTH_ARGS)
+    with pytest.raises(PyCronofyRequestError):
+        client.request_handler.post(endpoint='calendars', data={'profile_id': 'pro_1', 'name': 'Work'})
+    assert len(responses.calls) == 1
+
+    config = Configuration(max_retries=1, retry_backoff=0, retry_methods=('get', 'post'))
+    client = Client(config=config, **common_data.AUTH_ARGS)
+    responses.reset()
+    responses.add(responses.POST, calendars_url, status=503)
+    responses.add(responses.POST, calendars_url, json={'calendar': {'calendar_id': 'cal_1'}}, status=200)
+    response = client.request_handler.post(endpoint='calendars', data={'profile_id': 'pro_1', 'name': 'Work'})
+    assert response.json()['calendar']['calendar_id'] == 'cal_1'
+    assert len(responses.calls) == 2
+    assert config.retry_methods == frozenset(['GET', 'POST'])
+
+
+@pytest.mark.parametrize('retry_after,attempt,expected', [
+    (None, 0, 0.5),
+    (None, 2, 2.0),
+    ('3', 0, 3.0),
+    ('120', 0, 30),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 1, 1.0),
+])
+def test_retry_wait(retry_after, attempt, expected):
+    """Test retry_wait backs off exponentially, preferring Retry-After and capped at max_retry_wait."""
+    class FakeResponse(object):
+        headers = {'Retry-After': retry_after} if retry_after else {}
+
+    assert Configuration().retry_wait(attempt, FakeResponse()) == expected
+
+
+def test_session_pool_size():
+    """Test each client gets its own session with the configured pool size."""
+    first = Client(config=Configuration(pool_maxsize=32), **common_data.AUTH_ARGS)
+    second = Client(**common_data.AUTH_ARGS)
+    assert first.request_handler.session is not second.request_handler.session
+    assert first.request_handler.session.get_adapter('https://api.cronofy.com')._pool_maxsize == 32
@@ -1,7 +1,8 @@
 import datetime
 import pytest
 import pytz
-from pycronofy.datetime_utils import format_event_time
+from pycronofy.datetime_utils import format_event_epoch, format_event_time, format_event_times, parse_event_epoch, parse_event_time, split_time_range
+from pycronofy.exceptions import PyCronofyDateTimeError
 
 
 def test_date():
@@ -70,3 +71,104 @@ def test_unsupported():
         format_event_time(1)
     assert exception_info.value.message == 'Unsupported type: ``%s``.\nSupported types: ``<datetime.datetime>``, ``<datetime.date>``, ``<dict>``, or ``<str>``.' % repr(type(1))
     assert exception_info.value.argument == 1
+
+
+def test_format_event_times():
+    """Test format_event_times converts a mixed sequence in order"""
+    values = [
+        datetime.datetime(2016, 1, 15, 9, 8, tzinfo=pytz.utc),
+        datetime.date(2016, 1, 15),
+        '2016-01-15T09:08:00Z',
+        None,
+        pytz.timezone('Europe/London').localize(datetime.datetime(2016, 7, 15, 10, 8)),
+    ]
+    assert format_event_times(values) == [
+        '2016-01-15T09:08:00Z',
+        '2016-01-15',
+        '2016-01-15T09:08:00Z',
+        None,
+        '2016-07-15T09:08:00Z',
+    ]
+
+
+def test_repeated_values_use_the_instant():
+    """Test equal instants in different zones format identically, and naive values are treated as UTC"""
+    utc = datetime.datetime(2016, 7, 15, 9, 8, tzinfo=pytz.utc)
+    london = utc.astimezone(pytz.timezone('Europe/London'))
+    naive = datetime.datetime(2016, 7, 15, 10, 8)
+    assert format_event_time(utc) == '2016-07-15T09:08:00Z'
+    assert format_event_time(london) == '2016-07-15T09:08:00Z'
+    assert format_event_time(naive) == '2016-07-15T10:08:00Z'
+    assert format_event_time(datetime.date(2016, 7, 15)) == '2016-07-15'
+
+
+def test_format_event_times_datetime64():
+    """Test format_event_times converts NumPy datetime64 arrays"""
+    numpy = pytest.importorskip('numpy')
+    values = numpy.array(['2016-01-15T09:08:00.500', 'NaT'], dtype='datetime64[ms]')
+    assert format_event_times(values) == ['2016-01-15T09:08:00Z', None]
+
+
+@pytest.mark.parametrize('value', [
+    '2016-01-15T09:08:07Z',
+    '2016-01-15T09:08:07UTC',
+    '2016-01-15T09:08:07+00:00',
+    '2016-01-15T10:08:07+01:00',
+    '2016-01-15T09:08:07.250Z',
+])
+def test_parse_event_time(value):
+    """Test parse_event_time returns an aware UTC datetime for each supported format"""
+    parsed = parse_event_time(value)
+    assert parsed == datetime.datetime(2016, 1, 15, 9, 8, 7, tzinfo=pytz.utc)
+    assert parsed.utcoffset() == datetime.timedelta(0)
+    assert parse_event_epoch(value) == 1452848887
+
+
+def test_parse_event_time_date():
+    """Test parse_event_time returns a date for date strings, and epoch midnight UTC"""
+    assert parse_event_time('2016-01-15') == datetime.date(2016, 1, 15)
+    assert parse_event_epoch('2016-01-15') == 1452816000
+
+
+def test_parse_event_time_dict():
+    """Test parse_event_time parses the time in a localized dict without mutating it"""
+    value = {'time': '2016-01-15T09:08:07Z', 'tzid': 'Europe/London'}
+    assert parse_event_time(value) == {
+        'time': datetime.datetime(2016, 1, 15, 9, 8, 7, tzinfo=pytz.utc),
+        'tzid': 'Europe/London',
+    }
+    assert value['time'] == '2016-01-15T09:08:07Z'
+    assert parse_event_epoch(value) == 1452848887
+
+
+def test_parse_event_time_round_trip():
+    """Test format_event_time(parse_event_time(x)) returns x"""
+    assert format_event_time(parse_event_time('2016-01-15T09:08:07Z')) == '2016-01-15T09:08:07Z'
+
+
+def test_format_event_epoch():
+    """Test format_event_epoch formats epoch seconds as UTC and round trips with parse_event_epoch"""
+    assert format_event_epoch(1452848887) == '2016-01-15T09:08:07Z'
+    assert parse_event_epoch(format_event_epoch(1452816000)) == 1452816000
+
+
+def test_parse_event_time_unsupported():
+    """Test parse_event_time raises PyCronofyDateTimeError for values it cannot parse"""
+    with pytest.raises(PyCronofyDateTimeError) as exception_info:
+        parse_event_time('15/01/2016')
+    assert exception_info.value.argument == '15/01/2016'
+
+
+def test_split_time_range():
+    """Test split_time_range splits dates on days and datetimes on seconds, covering the whole range."""
+    assert split_time_range('2024-01-01', datetime.date(2024, 1, 10), 4) == [
+        (datetime.date(2024, 1, 1), datetime.date(2024, 1, 3)),
+        (datetime.date(2024, 1, 3), datetime.date(2024, 1, 5)),
+        (datetime.date(2024, 1, 5), datetime.date(2024, 1, 7)),
+        (datetime.date(2024, 1, 7), datetime.date(2024, 1, 10)),
+    ]
+    assert len(split_time_range('2024-01-01', '2024-01-03', 5)) == 2
+
+    windows = split_time_range(datetime.datetime(2024, 1, 1), '2024-01-01T00:00:10Z', 3)
+    assert [format_event_time(end) for _, end in windows] == ['2024-01-01T00:00:03Z', '2024-01-01T00:00:06Z', '2024-01-01T00:00:10Z']
+    assert windows[0][0] == datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
@@ -0,0 +1,187 @@
+import pytest
+
+from pycronofy import Client
+from pycronofy import settings
+from pycronofy.batch import BatchBuilder
+from pycronofy.exceptions import PyCronofyRequestError
+from pycronofy.fake_server import FakeCronofyServer
+from pycronofy.tests import common_data
+
+
+@pytest.fixture
+def server():
+    """Start a FakeCronofyServer with one calendar."""
+    with FakeCronofyServer(page_size=2) as server:
+        server.add_calendar('pro_1', 'Work', calendar_id='cal_1')
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    """Setup Client instance pointed at the fake server."""
+    return Client(api_base_url=server.url, **common_data.AUTH_ARGS)
+
+
+def event(i):
+    return {
+        'event_id': 'evt_%d' % i,
+        'summary': 'Event %d' % i,
+        'start': '2024-01-0%dT09:00:00Z' % i,
+        'end': '2024-01-0%dT10:00:00Z' % i,
+    }
+
+
+def test_upsert_and_read_events(server, client):
+    """Test events upserted through the client are paged back by read_events."""
+    for i in range(1, 6):
+        client.upsert_event('cal_1', event(i))
+    events = client.read_events(from_date='2024-01-01', to_date='2024-01-05')
+    assert events.total == 2
+    assert [item['event_id'] for item in events] == ['evt_1', 'evt_2', 'evt_3', 'evt_4']
+
+    client.delete_event('cal_1', 'evt_1')
+    assert [block['start'] for block in client.read_free_busy(from_date='2024-01-01', to_date='2024-01-03')] == ['2024-01-02T09:00:00Z']
+
+
+def test_read_events_prefetch(server, client):
+    """Test read_events returns the same events when prefetching pages."""
+    for i in range(1, 6):
+        client.upsert_event('cal_1', event(i))
+    events = client.read_events(from_date='2024-01-01', to_date='2024-01-06', prefetch=True)
+    assert [item['event_id'] for item in events] == ['evt_1', 'evt_2', 'evt_3', 'evt_4', 'evt_5']
+
+
+def test_read_events_shards(server, client):
+    """Test sharded reads return every event once, including those spanning shard boundaries."""
+    for i in range(1, 10):
+        client.upsert_event('cal_1', event(i))
+    client.upsert_event('cal_1', {'event_id': 'evt_long', 'summary': 'Long', 'start': '2024-01-02T12:00:00Z', 'end': '2024-01-07T12:00:00Z'})
+
+    sharded = client.read_events(from_date='2024-01-01', to_date='2024-01-10', shards=4)
+    events = sharded.all()
+    assert sorted(item['event_id'] for item in events) == sorted(['evt_%d' % i for i in range(1, 10)] + ['evt_long'])
+    assert server.request_counts[('GET', '/v1/events')] == 4
+    assert sharded.max_workers == client.config.pool_maxsize
+    assert client.read_events(from_date='2024-01-01', to_date='2024-01-10', shards=4, max_workers=2).max_workers == 2
+
+    blocks = client.read_free_busy(from_date='2024-01-01', to_date='2024-01-10', shards=3).all()
+    assert len(blocks) == 10
+
+    with pytest.raises(ValueError):
+        client.read_events(from_date='2024-01-01', shards=2)
+
+
+def test_batch(server, client):
+    """Test batch entries are applied and answered individually."""
+    builder = BatchBuilder()
+    builder.upsert_event('cal_1', event(1))
+    builder.upsert_event('cal_1', event(2))
+    builder.delete_event('cal_1', 'evt_1')
+    result = client.batch(builder)
+    assert [entry.status() for entry in result.entries] == [202, 202, 202]
+    assert [key[1] for key in server.events] == ['evt_2']
+
+
+def test_change_participation_statuses(server, client):
+    """Test participation statuses changed in bulk are applied to each event."""
+    for i in range(1, 4):
+        server.add_event('cal_1', dict(event(i), event_uid='uid_%d' % i))
+    report = client.change_participation_statuses(('cal_1', 'uid_%d' % i, 'tentative') for i in range(1, 4))
+    assert not report.has_failures()
+    assert len(report.results[0][1].entries) == 3
+    assert set(e['participation_status'] for e in server.events.values()) == {'tentative'}
+
+
+def test_upsert_and_delete_events_stream(server, client):
+    """Test upsert_events and delete_events read events lazily and send them in batches."""
+    pulled = []
+
+    def events():
+        for i in range(1, 121):
+            pulled.append(i)
+            yield {'event_id': 'evt_%d' % i, 'summary': 'Event %d' % i,
+                   'start': '2024-01-01T09:00:00Z', 'end': '2024-01-01T10:00:00Z'}
+
+    entries = client.upsert_events('cal_1', events())
+    assert pulled == []
+    first = next(entries)
+    assert first.status() == 202
+    assert len(pulled) <= 150
+    assert len(list(entries)) == 119
+    assert server.request_counts[('POST', '/v1/batch')] == 3
+    assert len(server.events) == 120
+
+    deleted = list(client.delete_events('cal_1', ('evt_%d' % i for i in range(1, 121)), batch_size=40))
+    assert [entry.request['data']['event_id'] for entry in deleted[:2]] == ['evt_1', 'evt_2']
+    assert server.request_counts[('POST', '/v1/batch')] == 6
+    assert len(server.events) == 0
+
+
+def test_create_calendar_duplicate(server, client):
+    """Test duplicate calendar names are rejected as the API does."""
+    assert client.create_calendar('pro_1', 'Work', error_on_duplicate=False)['calendar_id'] == 'cal_1'
+    with pytest.raises(PyCronofyRequestError):
+        client.create_calendar('pro_1', 'Work')
+    assert client.create_calendar('pro_1', 'Home')['calendar']['calendar_name'] == 'Home'
+
+
+def test_availability(server, client):
+    """Test availability excludes busy events."""
+    server.add_event('cal_1', event(1))
+    periods = client.availability(
+        participants={'members': ['acc_1']},
+        required_duration=60,
+        available_periods=[{'start': '2024-01-01T08:00:00Z', 'end': '2024-01-01T12:00:00Z'}],
+    )
+    assert [(period['start'], period['end']) for period in periods] == [
+        ('2024-01-01T08:00:00Z', '2024-01-01T09:00:00Z'),
+        ('2024-01-01T10:00:00Z', '2024-01-01T12:00:00Z'),
+    ]
+
+
+def test_authorization(server, client):
+    """Test oauth/token issues tokens."""
+    client.get_authorization_from_code('code', redirect_uri='http://example.com')
+    assert client.auth.access_token.startswith('fake_access_')
+
+
+def test_injected_rate_limit(server, client):
+    """Test injected 429s carry a Retry-After header."""
+    server.inject_error(429, path='/v1/calendars', retry_after=7)
+    with pytest.raises(PyCronofyRequestError) as exception_info:
+        client.list_calendars()
+    assert exception_info.value.response.status_code == 429
+    assert exception_info.value.response.headers['Retry-After'] == '7'
+    assert client.list_calendars()[0]['calendar_id'] == 'cal_1'
+
+
+def test_split_availability(server, client):
+    """Test availability split into several queries finds the same periods as a single query."""
+    for day in range(1, 29):
+        server.add_event('cal_1', {'event_id': 'busy_%d' % day, 'summary': 'Busy',
+                                   'start': '2024-01-%02dT12:00:00Z' % day, 'end': '2024-01-%02dT13:30:00Z' % day})
+    options = {
+        'participants': [{'members': ['acc_1'], 'required': 'all'}],
+        'required_duration': 60,
+        'available_periods': [{'start': '2024-01-01T00:00:00Z', 'end': '2024-01-29T00:00:00Z'}],
+    }
+    expected = client.availability(**options)
+
+    settings.MAX_AVAILABILITY_SPAN_DAYS, span_days = 3, settings.MAX_AVAILABILITY_SPAN_DAYS
+    try:
+        assert client.availability(split=True, max_workers=4, **options) == expected
+        requests = server.request_counts[('POST', '/v1/availability')]
+        assert requests > 2
+
+        limited = client.availability(split=True, max_workers=1, max_results=3, **options)
+        assert limited == expected[:3]
+        assert server.request_counts[('POST', '/v1/availability')] - requests < requests - 1
+    finally:
+        settings.MAX_AVAILABILITY_SPAN_DAYS = span_days
+
+
+def test_stop_without_start():
+    """Test stop() closes a server that was never started instead of waiting on shutdown()"""
+    server = FakeCronofyServer()
+    server.stop()
+    assert server.httpd.socket.fileno() == -1
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pycronofy
+
+
+def loaded_modules(code):
+    """Run code in a fresh interpreter and return the modules it loaded."""
+    output = subprocess.check_output([sys.executable, '-c', '%s\nimport sys\nprint(" ".join(sys.modules))' % code])
+    return set(output.decode().split())
+
+
+def test_import_is_lazy():
+    """Test importing pycronofy doesn't load the client or HTTP libraries."""
+    modules = loaded_modules('import pycronofy')
+    assert 'pycronofy.client' not in modules
+    assert 'requests' not in modules
+
+
+def test_client_import_defers_heavy_modules():
+    """Test the client can be imported without requests or asyncio, which load on first use."""
+    modules = loaded_modules('from pycronofy import Client')
+    assert 'pycronofy.client' in modules
+    assert 'requests' not in modules
+    assert 'asyncio' not in modules
+
+
+def test_lazy_attributes():
+    """Test Client and submodules are available as attributes of the package."""
+    from pycronofy.client import Client
+    from pycronofy.validation import ISO_8601_REGEX
+
+    assert pycronofy.Client is Client
+    assert pycronofy.batch.BatchBuilder
+    assert 'Client' in dir(pycronofy)
+    assert ISO_8601_REGEX.match('2024-01-01')
+    try:
+        pycronofy.missing
+    except AttributeError:
+        pass
+    else:
+        assert False, 'Expected AttributeError'
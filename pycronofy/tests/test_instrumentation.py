@@ -0,0 +1,84 @@
+import pytest
+import responses
+
+from pycronofy import Client
+from pycronofy import settings
+from pycronofy.exceptions import PyCronofyRequestError
+from pycronofy.instrumentation import MetricsRegistry, endpoint_template, token_hash
+from pycronofy.tests import common_data
+
+
+@pytest.mark.parametrize('endpoint,template', [
+    ('events', 'events'),
+    ('calendars/cal_123/events', 'calendars/{id}/events'),
+    ('calendars/cal_123/events/evt_456/participation_status', 'calendars/{id}/events/{id}/participation_status'),
+    ('profiles/pro_123/revoke', 'profiles/{id}/revoke'),
+    ('real_time_scheduling/sch_123/disable', 'real_time_scheduling/{id}/disable'),
+    ('oauth/token/revoke', 'oauth/token/revoke'),
+])
+def test_endpoint_template(endpoint, template):
+    """Test endpoint_template replaces IDs in endpoints."""
+    assert endpoint_template(endpoint) == template
+
+
+def test_endpoint_template_from_url():
+    """Test endpoint_template handles pagination URLs."""
+    url = '%s/%s/events/pages/08a07b034306679e' % (settings.API_BASE_URL, settings.API_VERSION)
+    assert endpoint_template(url=url) == 'events/pages/{id}'
+
+
+@responses.activate
+def test_request_events():
+    """Test the client emits a RequestEvent per request, including failures."""
+    events = []
+    metrics = MetricsRegistry()
+    client = Client(instrumentation=(events.append, metrics), **common_data.AUTH_ARGS)
+    responses.add(responses.POST, '%s/%s/calendars/cal_123/events' % (settings.API_BASE_URL, settings.API_VERSION),
+                  status=202)
+    responses.add(responses.GET, '%s/%s/calendars' % (settings.API_BASE_URL, settings.API_VERSION),
+                  status=500, body='{"errors": {}}')
+
+    client.upsert_event('cal_123', {'event_id': 'evt_1', 'start': '2024-01-01T09:00:00Z', 'end': '2024-01-01T10:00:00Z'})
+    with pytest.raises(PyCronofyRequestError):
+        client.list_calendars()
+
+    upsert, failed = events
+    assert upsert.method == 'POST'
+    assert upsert.endpoint == 'calendars/{id}/events'
+    assert upsert.status == 202
+    assert upsert.request_bytes > 0
+    assert upsert.latency >= upsert.server_latency >= 0
+    assert upsert.token_hash == token_hash('Bearer %s' % common_data.AUTH_ARGS['access_token'])
+    assert common_data.AUTH_ARGS['access_token'] not in upsert.token_hash
+    assert failed.status == 500
+    assert isinstance(failed.error, PyCronofyRequestError)
+    assert failed.response_bytes == len('{"errors": {}}')
+
+    rendered = metrics.render()
+    assert 'cronofy_requests_total{method="POST",endpoint="calendars/{id}/events",status="202"} 1' in rendered
+    assert 'cronofy_requests_total{method="GET",endpoint="calendars",status="500"} 1' in rendered
+    assert 'cronofy_request_duration_seconds_count{method="GET",endpoint="calendars"} 1' in rendered
+
+
+@responses.activate
+def test_open_telemetry_sink():
+    """Test OpenTelemetrySink records a client span per request."""
+    pytest.importorskip('opentelemetry.sdk')
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from pycronofy.instrumentation import OpenTelemetrySink
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    client = Client(instrumentation=(OpenTelemetrySink(provider.get_tracer('test')),), **common_data.AUTH_ARGS)
+    responses.add(responses.GET, '%s/%s/calendars' % (settings.API_BASE_URL, settings.API_VERSION),
+                  status=200, body='{"calendars": []}')
+
+    client.list_calendars()
+
+    span, = exporter.get_finished_spans()
+    assert span.name == 'GET calendars'
+    assert span.attributes['http.response.status_code'] == 200
+    assert span.end_time >= span.start_time
@@ -1,9 +1,14 @@
+import datetime
 from copy import deepcopy
 import json
+import pickle
 import pytest
 import responses
 from pycronofy import Client
-from pycronofy.pagination import Pages
+from pycronofy.datetime_utils import parse_event_time
+from pycronofy.exceptions import PyCronofyDateTimeError, PyCronofyRequestError
+from pycronofy.pagination import TIME_PARSERS, Pages, ParsedItem
+from pycronofy.records import Event
 from pycronofy import settings
 from pycronofy.tests import common_data
 
@@ -168,3 +173,181 @@ def test___len__(client):
     """
     pages = Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events')
     assert len(pages) == 1
+
+
+@responses.activate
+def test_parse_times(client):
+    """Test Pages converts time fields when accessed with parse_times='datetime'.
+
+    :param Client client: Client instance with test data.
+    """
+    pages = Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events', parse_times='datetime')
+    responses.add(**NEXT_PAGE_GET_ARGS)
+    results = list(pages)
+    assert results[0]['start'] == datetime.date(2014, 9, 6)
+    assert results[0].get('created') == datetime.datetime(2014, 9, 1, 8, 0, 1, tzinfo=datetime.timezone.utc)
+    assert dict(results[1].items())['updated'] == datetime.datetime(2014, 10, 1, 9, 24, 16, tzinfo=datetime.timezone.utc)
+    assert results[1]['summary'] == TEST_DATA_PAGE_TWO['events'][0]['summary']
+
+
+def test_parse_times_epoch(client):
+    """Test Pages converts time fields to epoch seconds with parse_times='epoch'.
+
+    :param Client client: Client instance with test data.
+    """
+    pages = Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events', parse_times='epoch')
+    assert pages[0]['start'] == 1409961600
+    assert pages[0]['updated'] == 1409563456
+
+
+def test_parsed_items_behave_the_same_whichever_fields_were_read(client):
+    """Test parsed items compare, copy and pop the same however many fields have been read.
+
+    :param Client client: Client instance with test data.
+    """
+    def first_item():
+        return Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events', parse_times='epoch')[0]
+
+    untouched = first_item()
+    read = first_item()
+    read['start']
+
+    assert untouched == read
+    assert dict(first_item()) == read.copy() == dict(read)
+    assert dict(first_item())['created'] == 1409558401
+    assert first_item().pop('end') == 1410134400
+    assert first_item().setdefault('updated') == 1409563456
+
+
+def test_parsed_item_failed_parse_is_not_cached():
+    """Test a field that fails to parse raises on every read instead of returning the raw value."""
+    item = ParsedItem({'start': 'not a time'}, parse_event_time)
+    for _ in range(2):
+        with pytest.raises(PyCronofyDateTimeError):
+            item['start']
+
+
+def test_parsed_item_pickles():
+    """Test a ParsedItem survives pickling, whether or not its fields have been read."""
+    item = ParsedItem({'summary': 'Retreat', 'start': '2014-09-06', 'end': '2014-09-08T10:00:00Z'}, parse_event_time)
+    item['start']
+
+    restored = pickle.loads(pickle.dumps(item))
+    assert type(restored) is ParsedItem
+    assert dict.__getitem__(restored, 'end') == '2014-09-08T10:00:00Z'
+    assert restored == item
+    assert restored['start'] == datetime.date(2014, 9, 6)
+    assert restored['end'] == parse_event_time('2014-09-08T10:00:00Z')
+    assert deepcopy(item) == item
+
+
+def test_unknown_parse_times(client):
+    """Test Pages rejects an unknown parse_times mode with a ValueError naming the valid ones.
+
+    :param Client client: Client instance with test data.
+    """
+    with pytest.raises(ValueError) as exc_info:
+        Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events', parse_times='iso')
+    assert 'datetime, epoch' in str(exc_info.value)
+
+
+@responses.activate
+def test_record_class(client):
+    """Test Pages builds records for each page when given a record_class.
+
+    :param Client client: Client instance with test data.
+    """
+    pages = Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events', record_class=Event)
+    responses.add(**NEXT_PAGE_GET_ARGS)
+    results = pages.all()
+    assert [type(result) for result in results] == [Event, Event]
+    assert results[1].summary == TEST_DATA_PAGE_TWO['events'][0]['summary']
+    assert results[0].to_dict() == TEST_DATA_PAGE_ONE['events'][0]
+
+
+@responses.activate
+def test_prefetch(client):
+    """Test Pages fetches the next page in the background once iteration starts, when prefetch is set.
+
+    :param Client client: Client instance with test data.
+    """
+    responses.add(**NEXT_PAGE_GET_ARGS)
+    pages = Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events', prefetch=True)
+    assert pages._prefetched is None
+
+    first = next(pages)
+    pages._prefetched.result()
+    assert len(responses.calls) == 1
+
+    results = [first] + list(pages)
+    assert len(responses.calls) == 1
+    assert [result['summary'] for result in results] == [TEST_DATA_PAGE_ONE['events'][0]['summary'], TEST_DATA_PAGE_TWO['events'][0]['summary']]
+    assert pages._prefetched is None
+
+
+@responses.activate
+def test_prefetch_only_when_paginating(client):
+    """Test nothing is prefetched for pages that will not move to the next page.
+
+    :param Client client: Client instance with test data.
+    """
+    responses.add(**NEXT_PAGE_GET_ARGS)
+    pages = Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events',
+                  automatic_pagination=False, prefetch=True)
+    assert len(list(pages)) == 1
+    assert pages._prefetched is None
+    assert len(responses.calls) == 0
+
+
+@responses.activate
+def test_prefetch_error(client):
+    """Test an error prefetching the next page is raised when that page is needed.
+
+    :param Client client: Client instance with test data.
+    """
+    responses.add(**dict(NEXT_PAGE_GET_ARGS, status=500, body='{}'))
+    pages = Pages(request_handler=client.request_handler, data=deepcopy(TEST_DATA_PAGE_ONE), data_type='events', prefetch=True)
+    next(pages)
+    assert pages._prefetched is not None
+    with pytest.raises(PyCronofyRequestError):
+        next(pages)
+
+
+@responses.activate
+@pytest.mark.parametrize('parse_times', [None, 'datetime', 'epoch'])
+def test_sharded_localized_free_busy(client, parse_times):
+    """Test sharded free/busy reads merge localized blocks spanning windows, however times are parsed.
+
+    :param Client client: Client instance with test data.
+    """
+    def block(start, end):
+        return {
+            'calendar_id': 'cal_1',
+            'start': {'time': start, 'tzid': 'Europe/London'},
+            'end': {'time': end, 'tzid': 'Europe/London'},
+            'free_busy_status': 'busy',
+        }
+
+    windows = {
+        '2024-01-01': [block('2024-01-01T09:00:00Z', '2024-01-01T10:00:00Z'), block('2024-01-01T23:00:00Z', '2024-01-02T01:00:00Z')],
+        '2024-01-02': [block('2024-01-01T23:00:00Z', '2024-01-02T01:00:00Z'), block('2024-01-02T09:00:00Z', '2024-01-02T10:00:00Z')],
+    }
+
+    def request_callback(request):
+        blocks = windows[request.params['from']]
+        return (200, {}, json.dumps({'pages': {'current': 1, 'total': 1}, 'free_busy': blocks}))
+
+    responses.add_callback(
+        responses.GET,
+        url='%s/%s/free_busy' % (settings.API_BASE_URL, settings.API_VERSION),
+        callback=request_callback,
+        content_type='application/json',
+    )
+
+    blocks = list(client.read_free_busy(from_date=datetime.date(2024, 1, 1), to_date=datetime.date(2024, 1, 3),
+                                        localized_times=True, parse_times=parse_times, shards=2))
+    assert len(responses.calls) == 2
+    assert all('localized_times=True' in call.request.url for call in responses.calls)
+    starts = [item['start']['time'] if type(item['start']) is dict else item['start'] for item in blocks]
+    expected = ['2024-01-01T09:00:00Z', '2024-01-01T23:00:00Z', '2024-01-02T09:00:00Z']
+    assert starts == [TIME_PARSERS[parse_times](time) if parse_times else time for time in expected]
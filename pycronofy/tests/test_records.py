@@ -0,0 +1,86 @@
+import datetime
+from copy import copy, deepcopy
+
+import pytest
+
+from pycronofy.datetime_utils import parse_event_time
+from pycronofy.records import Event, FreeBusyBlock
+from pycronofy.tests.test_pagination import TEST_DATA_PAGE_ONE
+
+TEST_EVENT = TEST_DATA_PAGE_ONE['events'][0]
+
+TEST_FREE_BUSY_BLOCK = {
+    'calendar_id': 'cal_U9uuErStTG@EAAAB_IsAsykA2DBTWqQTf-f0kJw',
+    'start': '2014-09-06T10:00:00Z',
+    'end': '2014-09-06T11:00:00Z',
+    'free_busy_status': 'busy',
+}
+
+
+def test_event_fields():
+    """Test Event exposes fields as attributes and via item access."""
+    event = Event(deepcopy(TEST_EVENT))
+    assert event.summary == 'Company Retreat'
+    assert event['location'] == {'description': 'Beach'}
+    assert event.get('event_id') is None
+    assert event.get('event_id', 'missing') == 'missing'
+    assert 'summary' in event
+    assert 'event_id' not in event
+
+
+def test_event_to_dict():
+    """Test Event.to_dict() round trips, including fields without a slot."""
+    data = deepcopy(TEST_EVENT)
+    data['new_field'] = 'value'
+    event = Event(data)
+    assert event.extra == {'new_field': 'value'}
+    assert event['new_field'] == 'value'
+    assert event.to_dict() == data
+    assert event == Event(deepcopy(data))
+
+
+def test_interned_values():
+    """Test enum-like values are shared between records."""
+    first = Event(deepcopy(TEST_EVENT))
+    second = Event(deepcopy(TEST_EVENT))
+    assert first.participation_status is second.participation_status
+    assert first.calendar_id is second.calendar_id
+
+
+def test_parsed_times():
+    """Test time fields are parsed when given a parser."""
+    block = FreeBusyBlock(TEST_FREE_BUSY_BLOCK, parse_event_time)
+    assert block.start == datetime.datetime(2014, 9, 6, 10, tzinfo=datetime.timezone.utc)
+    assert block.free_busy_status == 'busy'
+    assert block.extra is None
+
+
+def test_null_fields_round_trip():
+    """Test fields returned as null are kept, and told apart from absent fields."""
+    data = dict(deepcopy(TEST_EVENT), description=None, color=None, new_field=None)
+    event = Event(data)
+
+    assert event.to_dict() == data
+    assert 'description' in event and event['description'] is None
+    assert 'new_field' in event and event['new_field'] is None
+    assert event.get('description', 'missing') is None
+    assert 'event_id' not in event
+    assert event.event_id is None
+    with pytest.raises(KeyError):
+        event['event_id']
+
+
+def test_records_are_read_only():
+    """Test record attributes cannot be set or deleted."""
+    event = Event(deepcopy(TEST_EVENT))
+    with pytest.raises(AttributeError):
+        event.summary = 'Changed'
+    with pytest.raises(AttributeError):
+        event.event_id = 'evt_1'
+    with pytest.raises(AttributeError):
+        del event.summary
+    with pytest.raises(AttributeError):
+        event.not_a_field
+    assert event.summary == 'Company Retreat'
+    assert copy(event) == event
+    assert deepcopy(event) == event
@@ -0,0 +1,55 @@
+import datetime
+
+import pytest
+import pytz
+
+from pycronofy import settings
+from pycronofy import timezones
+from pycronofy.datetime_utils import format_event_time, parse_event_time
+from pycronofy.exceptions import PyCronofyDateTimeError
+
+
+@pytest.fixture(params=timezones.BACKENDS)
+def backend(request):
+    """Run a test under each timezone backend."""
+    settings.TIMEZONE_BACKEND = request.param
+    yield request.param
+    settings.TIMEZONE_BACKEND = None
+
+
+def test_default_backend():
+    """Test zoneinfo is preferred when it is available."""
+    try:
+        import zoneinfo  # noqa: F401
+        expected = 'zoneinfo'
+    except ImportError:
+        expected = 'pytz'
+    assert timezones.backend() == expected
+
+
+def test_get_timezone(backend):
+    """Test get_timezone returns a usable tzinfo from the selected backend."""
+    tz = timezones.get_timezone('Europe/London')
+    summer = datetime.datetime(2016, 7, 15, 9, 8, tzinfo=timezones.UTC)
+    assert summer.astimezone(tz).hour == 10
+    assert (type(tz).__module__.split('.')[0] == 'pytz') == (backend == 'pytz')
+
+
+def test_get_timezone_unknown(backend):
+    """Test get_timezone raises PyCronofyDateTimeError for unknown IDs."""
+    with pytest.raises(PyCronofyDateTimeError):
+        timezones.get_timezone('Not/A_Zone')
+
+
+def test_format_event_time_accepts_either_backend(backend):
+    """Test datetimes localized by either library format the same way."""
+    local = timezones.localize(datetime.datetime(2016, 7, 15, 9, 8, tzinfo=timezones.UTC), 'America/New_York')
+    assert format_event_time(local) == '2016-07-15T09:08:00Z'
+    assert format_event_time(pytz.timezone('America/New_York').localize(datetime.datetime(2016, 7, 15, 5, 8))) == '2016-07-15T09:08:00Z'
+
+
+def test_parse_event_time_localizes_to_tzid(backend):
+    """Test localized times are parsed into the tzid they were returned with."""
+    parsed = parse_event_time({'time': '2016-07-15T09:08:00Z', 'tzid': 'Europe/London'})
+    assert parsed['time'].hour == 10
+    assert parsed['time'] == datetime.datetime(2016, 7, 15, 9, 8, tzinfo=timezones.UTC)
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+import requests
+
+from pycronofy import Client
+from pycronofy.auth import Auth
+from pycronofy.config import Configuration
+from pycronofy.exceptions import PyCronofyRequestError
+from pycronofy.fake_server import FakeCronofyServer
+from pycronofy.tests import common_data
+from pycronofy.request_handler import AsyncRequestHandler
+from pycronofy.transport import AsyncTransport, RequestsTransport, Urllib3Transport, encode_params
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Start a FakeCronofyServer with a few events."""
+    with FakeCronofyServer(page_size=2) as server:
+        server.add_calendar('pro_1', 'Work', calendar_id='cal_1')
+        server.populate(events=5)
+        yield server
+
+
+@pytest.fixture(params=['requests', 'urllib3', 'httpx'])
+def transport(request):
+    if request.param == 'httpx':
+        pytest.importorskip('httpx')
+    return request.param
+
+
+def test_transports(server, transport):
+    """Test each transport pages, posts, runs hooks and raises errors the same way."""
+    hooked = []
+    config = Configuration(api_base_url=server.url, transport=transport,
+                           request_hook=lambda response, *args, **kwargs: hooked.append(response.status_code))
+    client = Client(config=config, **common_data.AUTH_ARGS)
+
+    events = client.read_events(calendar_ids=('cal_1',), from_date='2024-01-01', to_date='2024-01-02')
+    assert [event['event_id'] for event in events] == ['evt_%d' % i for i in range(5)]
+    assert server.request_counts[('GET', '/v1/events')] == 1
+
+    client.upsert_event('cal_1', {'event_id': 'evt_new', 'summary': 'New',
+                                  'start': '2024-02-01T09:00:00Z', 'end': '2024-02-01T10:00:00Z'})
+    assert server.request_counts[('POST', '/v1/calendars/cal_1/events')] == 1
+
+    query = client.prepare_availability(participants={'members': [{'sub': 'acc_fake', 'calendar_ids': ['cal_1']}]},
+                                        required_duration=60)
+    assert query([{'start': '2024-01-01T00:00:00Z', 'end': '2024-01-01T08:00:00Z'}])
+
+    server.inject_error(status=500)
+    with pytest.raises(PyCronofyRequestError) as exception_info:
+        client.account()
+    assert exception_info.value.response.status_code == 500
+    assert exception_info.value.request.method == 'GET'
+    assert hooked == [200, 200, 200, 202, 200, 500]
+    server.request_counts.clear()
+
+
+def test_encode_params():
+    """Test encode_params encodes the way requests does."""
+    params = {
+        'tzid': 'Europe/London',
+        'calendar_ids[]': ('cal_1', 'cal_2'),
+        'from': '2024-01-01',
+        'last_modified': None,
+        'include_managed': True,
+    }
+    prepared = requests.Request('GET', 'https://api.cronofy.com/v1/events', params=params).prepare()
+    assert prepared.url == 'https://api.cronofy.com/v1/events?' + encode_params(params)
+
+
+def test_custom_transport():
+    """Test a Transport instance can be shared between clients."""
+    transport = RequestsTransport()
+    config = Configuration(transport=transport)
+    assert Client(config=config).request_handler.transport is transport
+    assert Client(config=config).request_handler.session is transport.session
+    with pytest.raises(ValueError):
+        Client(config=Configuration(transport='carrier-pigeon'))
+
+
+class ThreadedAsyncTransport(AsyncTransport):
+    """Runs a synchronous transport in a thread pool, so AsyncRequestHandler can be tested without httpx."""
+
+    def __init__(self):
+        self.transport = Urllib3Transport()
+        self.in_flight = 0
+        self.most_in_flight = 0
+
+    async def send(self, *args, **kwargs):
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, lambda: self.transport.send(*args, **kwargs))
+        finally:
+            self.in_flight -= 1
+
+
+def test_async_request_handler(server):
+    """Test AsyncRequestHandler runs requests concurrently, with retries and errors as for RequestHandler."""
+    events = []
+    config = Configuration(api_base_url=server.url, transport=ThreadedAsyncTransport(), max_retries=1,
+                           retry_backoff=0, instrumentation=(events.append,))
+    handler = AsyncRequestHandler(Auth(**common_data.AUTH_ARGS), config=config)
+
+    async def run():
+        server.inject_error(status=429, path='/v1/account', retry_after=0)
+        responses = await asyncio.gather(*(handler.get(endpoint='account') for _ in range(10)))
+        assert [response.status_code for response in responses] == [200] * 10
+        server.inject_error(status=500, path='/v1/userinfo')
+        with pytest.raises(PyCronofyRequestError):
+            await handler.get(endpoint='userinfo')
+        await handler.close()
+
+    asyncio.run(run())
+    assert config.transport.most_in_flight > 1
+    assert sum(event.retries for event in events) == 1
+    assert [event.status for event in events].count(500) == 1
+    server.request_counts.clear()
+
+
+def test_async_transport_required():
+    """Test AsyncRequestHandler rejects synchronous transports."""
+    with pytest.raises(ValueError):
+        AsyncRequestHandler(Auth(**common_data.AUTH_ARGS), config=Configuration(transport='urllib3'))
+
+
+def test_http2_transports(server):
+    """Test the HTTP/2 transports against a server only speaking HTTP/1.1, which they fall back to."""
+    pytest.importorskip('httpx')
+    pytest.importorskip('h2')
+    config = Configuration(api_base_url=server.url, transport='http2', max_concurrent_streams=4)
+    client = Client(config=config, **common_data.AUTH_ARGS)
+    assert client.account()['account_id']
+    assert client.request_handler.transport.streams is not None
+
+    handler = AsyncRequestHandler(Auth(**common_data.AUTH_ARGS), config=config)
+
+    async def run():
+        responses = await asyncio.gather(*(handler.get(endpoint='account') for _ in range(10)))
+        await handler.close()
+        return responses
+
+    assert [response.status_code for response in asyncio.run(run())] == [200] * 10
+    server.request_counts.clear()
@@ -0,0 +1,73 @@
+import datetime
+
+from pycronofy import settings
+from pycronofy.exceptions import PyCronofyDateTimeError
+
+UTC = datetime.timezone.utc
+
+BACKENDS = ('zoneinfo', 'pytz')
+
+_timezones = {}
+
+
+def backend():
+    """Name of the backend used to look up timezones by ID.
+
+    ``settings.TIMEZONE_BACKEND`` selects one explicitly, otherwise the standard
+    library's zoneinfo is used when available (Python 3.9+) with pytz as the
+    fallback.
+
+    :return: 'zoneinfo' or 'pytz'.
+    :rtype: ``string``
+    """
+    if settings.TIMEZONE_BACKEND:
+        if settings.TIMEZONE_BACKEND not in BACKENDS:
+            raise PyCronofyDateTimeError('Unsupported timezone backend: ``%s``.' % settings.TIMEZONE_BACKEND,
+                                         settings.TIMEZONE_BACKEND)
+        return settings.TIMEZONE_BACKEND
+    try:
+        import zoneinfo  # noqa: F401
+    except ImportError:
+        return 'pytz'
+    return 'zoneinfo'
+
+
+def get_timezone(tzid):
+    """Get a tzinfo for a timezone ID such as 'Europe/London'.
+
+    :param string tzid: Timezone ID.
+    :return: Timezone from the active backend.
+    :rtype: ``datetime.tzinfo``
+    """
+    name = backend()
+    key = (name, tzid)
+    if key not in _timezones:
+        try:
+            if name == 'zoneinfo':
+                import zoneinfo
+                _timezones[key] = zoneinfo.ZoneInfo(tzid)
+            else:
+                import pytz
+                _timezones[key] = pytz.timezone(tzid)
+        except (ImportError, KeyError, ValueError) as e:
+            raise PyCronofyDateTimeError('Unable to load timezone ``%s``: %s' % (tzid, e), tzid)
+    return _timezones[key]
+
+
+def localize(date_time, tzid):
+    """Convert an aware datetime to the timezone with the given ID.
+
+    :param datetime.datetime date_time: Aware datetime.
+    :param string tzid: Timezone ID.
+    :return: The same instant in the tzid's local time.
+    :rtype: ``datetime.datetime``
+    """
+    return date_time.astimezone(get_timezone(tzid))
+
+
+def now():
+    """The current time as an aware UTC datetime.
+
+    :rtype: ``datetime.datetime``
+    """
+    return datetime.datetime.now(tz=UTC)
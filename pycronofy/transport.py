@@ -0,0 +1,361 @@
+import datetime
+import json
+import threading
+import time
+from urllib.parse import urlencode
+
+
+class Transport(object):
+    """Sends HTTP requests for a RequestHandler.
+
+    Subclasses implement ``send`` and return an object with the parts of a
+    ``requests.Response`` pycronofy relies on: ``status_code``, ``reason``,
+    ``headers``, ``content``, ``text``, ``json()``, ``url``, ``elapsed`` and
+    ``request`` (with ``method``, ``url``, ``headers`` and ``body``).
+    """
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a transport with the pool sizes from a Configuration.
+
+        :param Configuration config: Client configuration.
+        :rtype: ``Transport``
+        """
+        return cls(pool_connections=config.pool_connections, pool_maxsize=config.pool_maxsize)
+
+    def send(self, method, url, headers=None, params=None, json=None, hooks=None, timeout=None, body=None):
+        """Send a request.
+
+        :param string method: HTTP method, lower case.
+        :param string url: URL to request.
+        :param dict headers: Request headers. (Optional)
+        :param dict params: Query parameters, encoded as requests would. (Optional)
+        :param object json: Value sent as the json request body. (Optional)
+        :param bytes body: Already encoded json request body, sent instead of json. (Optional)
+        :param dict hooks: requests style hooks, eg {'response': function}. (Optional)
+        :param float timeout: Seconds, or a (connect, read) tuple. (Optional, default None waits indefinitely)
+        :rtype: ``Response`` or ``TransportResponse``
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Close any open connections."""
+        pass
+
+
+class RequestsTransport(Transport):
+    """Transport using a ``requests.Session``. The default."""
+
+    def __init__(self, session=None, pool_connections=10, pool_maxsize=10):
+        """
+        :param Session session: Session to send requests with. (Optional, default a new session)
+        :param int pool_connections: Number of connection pools to cache, for a new session. (Optional, default 10)
+        :param int pool_maxsize: Connections kept open per host, for a new session. (Optional, default 10)
+        """
+        if session is None:
+            import requests
+
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+    def send(self, method, url, headers=None, params=None, json=None, hooks=None, timeout=None, body=None):
+        if body is not None:
+            headers = dict(headers or {}, **{'Content-Type': 'application/json'})
+            return self.session.request(method, url=url, hooks=hooks, headers=headers, data=body, params=params, timeout=timeout)
+        return self.session.request(method, url=url, hooks=hooks, headers=headers, json=json, params=params, timeout=timeout)
+
+    def close(self):
+        self.session.close()
+
+
+class TransportRequest(object):
+    """The request a TransportResponse answers, as needed by PyCronofyRequestError."""
+
+    def __init__(self, method, url, headers, body):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self):
+        return '<TransportRequest [%s]>' % self.method
+
+
+class TransportResponse(object):
+    """Minimal stand-in for ``requests.Response`` returned by transports not based on requests."""
+
+    def __init__(self, request, status_code, headers, content, reason=None, elapsed=None):
+        """
+        :param TransportRequest request: Request sent.
+        :param int status_code: Response status.
+        :param dict headers: Response headers, looked up case-insensitively.
+        :param bytes content: Response body.
+        :param string reason: Status reason phrase. (Optional)
+        :param float elapsed: Seconds taken to receive the response. (Optional)
+        """
+        self.request = request
+        self.url = request.url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.reason = reason
+        self.elapsed = datetime.timedelta(seconds=elapsed or 0)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.content)
+
+    def __repr__(self):
+        return '<TransportResponse [%s]>' % self.status_code
+
+
+class Urllib3Transport(Transport):
+    """Transport using a urllib3 PoolManager directly, skipping the requests layers."""
+
+    def __init__(self, pool_manager=None, pool_connections=10, pool_maxsize=10):
+        """
+        :param PoolManager pool_manager: Pool manager to send requests with. (Optional, default a new one)
+        :param int pool_connections: Number of connection pools to cache, for a new pool manager. (Optional, default 10)
+        :param int pool_maxsize: Connections kept open per host, for a new pool manager. (Optional, default 10)
+        """
+        if pool_manager is None:
+            import urllib3
+
+            pool_manager = urllib3.PoolManager(num_pools=pool_connections, maxsize=pool_maxsize)
+        self.pool_manager = pool_manager
+
+    def send(self, method, url, headers=None, params=None, json=None, hooks=None, timeout=None, body=None):
+        import urllib3
+
+        url, body, headers = prepare_request(url, headers, params, json, body)
+        request = TransportRequest(method.upper(), url, headers, body)
+        if isinstance(timeout, tuple):
+            timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        elif timeout is None:
+            timeout = urllib3.Timeout(connect=None, read=None)
+        start = time.perf_counter()
+        raw = self.pool_manager.request(request.method, url, body=body, headers=headers, timeout=timeout,
+                                        retries=False, redirect=False)
+        response = TransportResponse(request, raw.status, raw.headers, raw.data, raw.reason, time.perf_counter() - start)
+        return dispatch_hooks(hooks, response)
+
+    def close(self):
+        self.pool_manager.clear()
+
+
+class HttpxTransport(Transport):
+    """Transport using an httpx Client, optionally over HTTP/2.
+
+    Requires the ``httpx`` package, and ``h2`` for HTTP/2 (``pip install httpx[http2]``).
+    """
+
+    def __init__(self, client=None, http2=False, pool_maxsize=10, max_streams=None):
+        """
+        :param httpx.Client client: Client to send requests with. (Optional, default a new one)
+        :param bool http2: Negotiate HTTP/2 where the server supports it, for a new client. (Optional, default False)
+        :param int pool_maxsize: Connections kept open, for a new client. (Optional, default 10)
+        :param int max_streams: Most requests in flight at once, across all threads. (Optional, default unlimited)
+        """
+        if client is None:
+            client = _httpx_client(http2, pool_maxsize)
+        self.client = client
+        self.streams = threading.BoundedSemaphore(max_streams) if max_streams else None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(pool_maxsize=config.pool_maxsize)
+
+    def send(self, method, url, headers=None, params=None, json=None, hooks=None, timeout=None, body=None):
+        url, body, headers = prepare_request(url, headers, params, json, body)
+        request = TransportRequest(method.upper(), url, headers, body)
+        if self.streams is None:
+            raw = self.client.request(request.method, url, content=body, headers=headers, timeout=_httpx_timeout(timeout))
+        else:
+            with self.streams:
+                raw = self.client.request(request.method, url, content=body, headers=headers, timeout=_httpx_timeout(timeout))
+        return dispatch_hooks(hooks, _httpx_response(request, raw))
+
+    def close(self):
+        self.client.close()
+
+
+class Http2Transport(HttpxTransport):
+    """HTTP/2 transport multiplexing concurrent requests over a few connections.
+
+    Requests made from many threads share connections, each request being a
+    stream on one. At most ``max_streams`` are in flight at once; further
+    requests wait for a stream to finish.
+    """
+
+    def __init__(self, client=None, connections=2, max_streams=100):
+        """
+        :param httpx.Client client: Client to send requests with. (Optional, default a new HTTP/2 client)
+        :param int connections: Most connections to open per host, for a new client. (Optional, default 2)
+        :param int max_streams: Most requests in flight at once. (Optional, default 100)
+        """
+        if client is None:
+            client = _httpx_client(True, connections)
+        super(Http2Transport, self).__init__(client=client, max_streams=max_streams)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(connections=config.http2_connections, max_streams=config.max_concurrent_streams)
+
+
+class AsyncTransport(object):
+    """Sends HTTP requests for an AsyncRequestHandler. As Transport, but ``send`` and ``close`` are coroutines."""
+
+    async def send(self, method, url, headers=None, params=None, json=None, hooks=None, timeout=None, body=None):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class AsyncHttpxTransport(AsyncTransport):
+    """Transport using an httpx AsyncClient, over HTTP/2 by default.
+
+    Concurrent requests from one event loop are multiplexed over a few
+    connections, with at most ``max_streams`` in flight at once.
+    Requires ``httpx[http2]``.
+    """
+
+    def __init__(self, client=None, http2=True, connections=2, max_streams=100):
+        """
+        :param httpx.AsyncClient client: Client to send requests with. (Optional, default a new one)
+        :param bool http2: Negotiate HTTP/2 where the server supports it, for a new client. (Optional, default True)
+        :param int connections: Most connections to open per host, for a new client. (Optional, default 2)
+        :param int max_streams: Most requests in flight at once. (Optional, default 100)
+        """
+        if client is None:
+            import httpx
+
+            client = httpx.AsyncClient(http2=http2, limits=_httpx_limits(connections))
+        self.client = client
+        self.max_streams = max_streams
+        self._streams = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a transport from a Configuration, using HTTP/2 unless its transport is 'httpx'.
+
+        :param Configuration config: Client configuration.
+        :rtype: ``AsyncHttpxTransport``
+        """
+        http2 = config.transport != 'httpx'
+        connections = config.http2_connections if http2 else config.pool_maxsize
+        return cls(http2=http2, connections=connections, max_streams=config.max_concurrent_streams)
+
+    async def send(self, method, url, headers=None, params=None, json=None, hooks=None, timeout=None, body=None):
+        import asyncio
+
+        if self._streams is None:
+            # Created lazily so it belongs to the running event loop.
+            self._streams = asyncio.Semaphore(self.max_streams) if self.max_streams else False
+        url, body, headers = prepare_request(url, headers, params, json, body)
+        request = TransportRequest(method.upper(), url, headers, body)
+        if self._streams:
+            async with self._streams:
+                raw = await self.client.request(request.method, url, content=body, headers=headers, timeout=_httpx_timeout(timeout))
+        else:
+            raw = await self.client.request(request.method, url, content=body, headers=headers, timeout=_httpx_timeout(timeout))
+        return dispatch_hooks(hooks, _httpx_response(request, raw))
+
+    async def close(self):
+        await self.client.aclose()
+
+
+TRANSPORTS = {
+    'requests': RequestsTransport,
+    'urllib3': Urllib3Transport,
+    'httpx': HttpxTransport,
+    'http2': Http2Transport,
+}
+
+
+def encode_params(params):
+    """Encode query parameters the way requests does.
+
+    None values are left out and list/tuple values repeat the key.
+
+    :param dict params: Query parameters.
+    :rtype: ``string``
+    """
+    pairs = []
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set, frozenset)):
+            pairs.extend((key, item) for item in value if item is not None)
+        else:
+            pairs.append((key, value))
+    return urlencode(pairs)
+
+
+def prepare_request(url, headers, params, data, body=None):
+    """Build the final URL, body and headers for a request.
+
+    :return: url, body and headers.
+    :rtype: ``tuple``
+    """
+    query = encode_params(params)
+    if query:
+        url = '%s%s%s' % (url, '&' if '?' in url else '?', query)
+    headers = dict(headers or {})
+    if body is None and data is not None:
+        body = json.dumps(data, allow_nan=False).encode('utf-8')
+    if body is not None:
+        headers['Content-Type'] = 'application/json'
+    return url, body, headers
+
+
+def dispatch_hooks(hooks, response):
+    """Call response hooks as requests would, letting a hook replace the response.
+
+    :param dict hooks: requests style hooks, eg {'response': function}.
+    :param TransportResponse response: Response received.
+    """
+    functions = (hooks or {}).get('response')
+    if functions is None:
+        return response
+    if callable(functions):
+        functions = [functions]
+    for function in functions:
+        result = function(response)
+        if result is not None:
+            response = result
+    return response
+
+
+def _httpx_timeout(timeout):
+    import httpx
+
+    if isinstance(timeout, tuple):
+        return httpx.Timeout(timeout[1], connect=timeout[0])
+    return httpx.Timeout(timeout)
+
+
+def _httpx_client(http2, connections):
+    import httpx
+
+    return httpx.Client(http2=http2, limits=_httpx_limits(connections))
+
+
+def _httpx_limits(connections):
+    import httpx
+
+    return httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+
+def _httpx_response(request, raw):
+    return TransportResponse(request, raw.status_code, raw.headers, raw.content, raw.reason_phrase, raw.elapsed.total_seconds())
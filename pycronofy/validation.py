@@ -1,5 +1,5 @@
 import datetime
-import re
+import functools
 
 from pycronofy.exceptions import PyCronofyValidationError
 
@@ -10,7 +10,25 @@ ISO_8601_FORMATS = (
     r'(^\d\d\d\d\-\d\d-\d\dT\d\d\:\d\d\:\d\dUTC)',
     r'(^\d\d\d\d\-\d\d-\d\dT\d\d\:\d\d\:\d\d\+00:00$)',
 )
-ISO_8601_REGEX = re.compile('|'.join(ISO_8601_FORMATS))
+
+
+@functools.lru_cache(maxsize=None)
+def iso_8601_regex():
+    """Compiled ISO_8601_FORMATS, compiled on first use rather than at import.
+
+    :rtype: ``re.Pattern``
+    """
+    import re
+
+    return re.compile('|'.join(ISO_8601_FORMATS))
+
+
+def __getattr__(name):
+    # ISO_8601_REGEX used to be compiled at import time.
+    if name == 'ISO_8601_REGEX':
+        return iso_8601_regex()
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
 
 METHOD_RULES = {
     'account': {
@@ -130,7 +148,7 @@ def check_datetime(method, dictionary, fields, label=None):
     values = []
     for field in fields:
         if field in dictionary and dictionary[field] is not None:
-            if type(dictionary[field]) not in (datetime.datetime, datetime.date) and not ISO_8601_REGEX.match(dictionary[field]):
+            if type(dictionary[field]) not in (datetime.datetime, datetime.date) and not iso_8601_regex().match(dictionary[field]):
                 improperly_formatted.append(field)
                 values.append(dictionary[field])
     if improperly_formatted: